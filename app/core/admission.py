@@ -0,0 +1,215 @@
+import asyncio
+import itertools
+import logging
+import re
+import time
+from typing import Dict, List, Optional, Tuple
+
+from starlette.routing import compile_path
+
+from app.core.config import settings
+from app.core.metrics import admission_queue_depth, admission_queue_seconds, admission_rejections
+
+logger = logging.getLogger(__name__)
+
+EXEMPT = "exempt"
+
+
+class RequestClass:
+    __slots__ = ("name", "priority", "concurrency", "deadline", "active", "queued", "service_time")
+
+    def __init__(self, name: str, priority: int, concurrency: int, queue_deadline_ms: float):
+        self.name = name
+        self.priority = priority
+        self.concurrency = concurrency
+        self.deadline = queue_deadline_ms / 1000
+        self.active = 0
+        self.queued = 0
+        # Moving average of how long one request of this class holds its slot
+        self.service_time: Optional[float] = None
+
+
+class _Waiter:
+    __slots__ = ("request_class", "future", "order")
+
+    def __init__(self, request_class: RequestClass, future: asyncio.Future, order: Tuple[int, int]):
+        self.request_class = request_class
+        self.future = future
+        self.order = order
+
+
+class AdmissionController:
+    """
+    Concurrency caps per request class plus one global cap (ADMISSION_MAX_IN_FLIGHT).
+    Requests over a cap wait in one queue ordered by class priority, then arrival; a freed
+    slot goes to the most important waiter that fits. A request is rejected at once when
+    its predicted wait (queue ahead of it x average service time / class concurrency)
+    exceeds the class queue deadline, or later when the deadline actually passes.
+    """
+
+    def __init__(self, classes: Dict[str, dict], max_in_flight: int, smoothing: float = 0.2):
+        self.classes = {
+            name: RequestClass(name, int(spec["priority"]), int(spec["concurrency"]), float(spec["queueDeadlineMs"]))
+            for name, spec in classes.items()
+        }
+        self.max_in_flight = max_in_flight
+        self.smoothing = smoothing
+        self.in_flight = 0
+        self._waiters: List[_Waiter] = []
+        self._arrivals = itertools.count()
+
+    def _fits(self, request_class: RequestClass) -> bool:
+        return self.in_flight < self.max_in_flight and request_class.active < request_class.concurrency
+
+    def _grant(self, request_class: RequestClass) -> None:
+        self.in_flight += 1
+        request_class.active += 1
+
+    def predicted_wait(self, request_class: RequestClass) -> float:
+        if request_class.service_time is None:
+            return 0.0  # Nothing measured yet: queue and let the deadline decide
+        ahead = sum(1 for waiter in self._waiters if waiter.order[0] <= request_class.priority)
+        return (ahead + 1) * request_class.service_time / request_class.concurrency
+
+    async def acquire(self, request_class: RequestClass) -> Optional[str]:
+        """Takes a slot, waiting if needed; returns None when admitted, else the rejection reason."""
+        # Waiters that fit are granted on every change, so whoever is still queued cannot use this slot
+        if self._fits(request_class):
+            self._grant(request_class)
+            return None
+        if self.predicted_wait(request_class) > request_class.deadline:
+            return "predicted"
+
+        waiter = _Waiter(
+            request_class, asyncio.get_running_loop().create_future(), (request_class.priority, next(self._arrivals))
+        )
+        self._waiters.append(waiter)
+        self._waiters.sort(key=lambda w: w.order)
+        request_class.queued += 1
+        admission_queue_depth.inc(request_class.name)
+        start = time.perf_counter()
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter.future), request_class.deadline)
+        except asyncio.TimeoutError:
+            pass
+        except asyncio.CancelledError:
+            self._abandon(waiter)
+            raise
+        finally:
+            request_class.queued -= 1
+            admission_queue_depth.dec(request_class.name)
+            admission_queue_seconds.observe(time.perf_counter() - start, request_class.name)
+
+        if waiter.future.done():
+            return None  # Granted, possibly right as the deadline passed
+        self._abandon(waiter)
+        return "deadline"
+
+    def _abandon(self, waiter: _Waiter) -> None:
+        if waiter.future.done():
+            self.release(waiter.request_class, None)  # Granted just as the client went away
+        else:
+            waiter.future.cancel()
+            self._waiters.remove(waiter)
+
+    def release(self, request_class: RequestClass, service_time: Optional[float]) -> None:
+        self.in_flight -= 1
+        request_class.active -= 1
+        if service_time is not None:
+            if request_class.service_time is None:
+                request_class.service_time = service_time
+            else:
+                request_class.service_time += self.smoothing * (service_time - request_class.service_time)
+        self._wake()
+
+    def _wake(self) -> None:
+        for waiter in list(self._waiters):
+            if self.in_flight >= self.max_in_flight:
+                break
+            if self._fits(waiter.request_class):
+                self._waiters.remove(waiter)
+                self._grant(waiter.request_class)
+                waiter.future.set_result(True)
+
+    def snapshot(self) -> dict:
+        return {
+            "inFlight": self.in_flight,
+            "maxInFlight": self.max_in_flight,
+            "classes": {
+                name: {
+                    "priority": c.priority,
+                    "concurrency": c.concurrency,
+                    "queueDeadlineMs": c.deadline * 1000,
+                    "active": c.active,
+                    "queued": c.queued,
+                    "serviceTimeMs": round(c.service_time * 1000, 3) if c.service_time is not None else None,
+                }
+                for name, c in self.classes.items()
+            },
+        }
+
+
+class RouteClassifier:
+    """Maps a request to its class before routing, from "METHOD /path/{template}" rules."""
+
+    def __init__(self, rules: Dict[str, str], default: str):
+        self.default = default
+        self._rules: Dict[str, List[Tuple[re.Pattern, str]]] = {}
+        for template, class_name in rules.items():
+            method, path = template.split(" ", 1)
+            regex, _, _ = compile_path(path)
+            self._rules.setdefault(method.upper(), []).append((regex, class_name))
+
+    def classify(self, method: str, path: str) -> str:
+        for regex, class_name in self._rules.get(method, ()):
+            if regex.match(path):
+                return class_name
+        return self.default
+
+
+class AdmissionMiddleware:
+    """
+    Load shedding in front of the routers: every HTTP request takes a slot of its class
+    (ADMISSION_ROUTE_CLASSES, default class otherwise) and is answered with 503 plus
+    Retry-After when it cannot get one within the class queue deadline. Routes in the
+    "exempt" class (live streams, metrics) bypass admission.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.ADMISSION_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        class_name = route_classifier.classify(scope["method"], scope["path"])
+        request_class = admission_controller.classes.get(class_name)
+        if request_class is None:  # EXEMPT or an unknown class name
+            await self.app(scope, receive, send)
+            return
+
+        rejection = await admission_controller.acquire(request_class)
+        if rejection is not None:
+            admission_rejections.inc(class_name, rejection)
+            await send({
+                "type": "http.response.start",
+                "status": 503,
+                "headers": [(b"content-type", b"application/json"), (b"retry-after", b"1")],
+            })
+            await send({"type": "http.response.body", "body": b'{"detail":"Server is busy. Please retry shortly."}'})
+            return
+
+        start = time.perf_counter()
+        completed = False
+        try:
+            await self.app(scope, receive, send)
+            completed = True
+        finally:
+            # Failed requests say little about service time; only completed ones feed the average
+            admission_controller.release(request_class, time.perf_counter() - start if completed else None)
+
+
+# Per-process admission state (each worker sheds its own load)
+admission_controller = AdmissionController(settings.ADMISSION_CLASSES, settings.ADMISSION_MAX_IN_FLIGHT)
+route_classifier = RouteClassifier(settings.ADMISSION_ROUTE_CLASSES, settings.ADMISSION_DEFAULT_CLASS)
@@ -1,6 +1,10 @@
+from typing import Dict
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import Field
 
+from app.core.startup import startup_timer
+
 class Settings(BaseSettings):
     PROJECT_NAME: str = "ITVE Donor API"
     VERSION: str = "1.0.0"
@@ -9,6 +13,38 @@ class Settings(BaseSettings):
     MONGO_URL: str = Field(..., alias="MONGO_URL")
     DB_NAME: str = "ITVE_Database"
 
+    # Motor connection pool, per worker process: serve.py runs WEB_CONCURRENCY workers, so the
+    # API may hold up to workers x MONGO_MAX_POOL_SIZE connections. Timeouts in ms, 0 = none
+    MONGO_MAX_POOL_SIZE: int = 50
+    MONGO_MIN_POOL_SIZE: int = 5
+    MONGO_MAX_IDLE_TIME_MS: int = 300_000
+    MONGO_CONNECT_TIMEOUT_MS: int = 5_000
+    MONGO_SERVER_SELECTION_TIMEOUT_MS: int = 5_000
+    MONGO_WAIT_QUEUE_TIMEOUT_MS: int = 2_000
+    MONGO_SOCKET_TIMEOUT_MS: int = 0
+
+    # Resilient data access (app.core.resilience): time budget per operation (0 = none), bounded
+    # retries with exponential backoff for idempotent reads on transient errors, and a circuit
+    # breaker that answers 503 at once after consecutive connection failures or timeouts, letting
+    # one probe through after the reset period
+    MONGO_READ_TIMEOUT_MS: int = 5_000
+    MONGO_WRITE_TIMEOUT_MS: int = 10_000
+    MONGO_HEALTH_TIMEOUT_MS: int = 1_000
+    MONGO_READ_RETRIES: int = 2
+    MONGO_RETRY_BACKOFF_MS: int = 50
+    MONGO_BREAKER_FAILURE_THRESHOLD: int = 5
+    MONGO_BREAKER_RESET_SECONDS: float = 10.0
+
+    # Production launcher (serve.py): pre-forked uvicorn workers sharing one listening socket.
+    # WEB_CONCURRENCY = 0 starts one worker per usable core. On SIGTERM workers stop accepting and
+    # get SERVER_GRACEFUL_TIMEOUT_SECONDS to finish in-flight requests before they are killed
+    WEB_CONCURRENCY: int = 0
+    SERVER_HOST: str = "0.0.0.0"
+    SERVER_PORT: int = 8000
+    SERVER_BACKLOG: int = 2048
+    SERVER_KEEPALIVE_SECONDS: int = 5
+    SERVER_GRACEFUL_TIMEOUT_SECONDS: int = 30
+
     # Security Configuration
     # These fields automatically fetch values from the .env file using the alias
     SECRET_KEY: str = Field(alias="JWT_SECRET_KEY")
@@ -21,9 +57,128 @@ class Settings(BaseSettings):
     UPLOAD_DIR: str = "uploads"
     ALLOWED_EXTENSIONS: set = {".jpg", ".jpeg", ".png"}
 
+    # Worker threads dedicated to bcrypt password hashing
+    BCRYPT_WORKERS: int = 4
+
+    # Username / email availability filters (in-memory Bloom filters)
+    AVAILABILITY_FILTER_CAPACITY: int = 100_000
+    AVAILABILITY_FILTER_ERROR_RATE: float = 0.01
+
+    # Maximum achievements kept per donor (oldest are trimmed with $slice)
+    DONOR_ACHIEVEMENTS_MAX: int = 100
+
+    # Propagation of embedded author fields after a school profile change
+    AUTHOR_SYNC_BATCH_SIZE: int = 500
+    AUTHOR_SYNC_THROTTLE_SECONDS: float = 0.05
+    AUTHOR_SYNC_LEASE_SECONDS: int = 300
+
+    # Home timelines: fan-out-on-write below this audience size, fan-out-on-read above it
+    FANOUT_MAX_FOLLOWERS: int = 10_000
+    FANOUT_BATCH_SIZE: int = 1000
+    HOME_TIMELINE_BACKFILL_POSTS: int = 20
+    HOME_TIMELINE_RETENTION_DAYS: int = 90
+
+    # Trending feed: periodically materialized, time-decayed engagement scores
+    TRENDING_REFRESH_SECONDS: int = 300
+    TRENDING_WINDOW_HOURS: int = 72
+    TRENDING_GRAVITY: float = 1.8
+    TRENDING_LIKE_WEIGHT: float = 1.0
+    TRENDING_COMMENT_WEIGHT: float = 2.0
+    TRENDING_SHARE_WEIGHT: float = 3.0
+    TRENDING_VIEW_WEIGHT: float = 0.1
+
+    # Number of latest comments embedded in each post for feed cards
+    POST_PREVIEW_COMMENTS: int = 3
+
+    # Threaded replies
+    COMMENT_MAX_DEPTH: int = 5
+    COMMENT_DELETE_BATCH_SIZE: int = 200
+    COMMENT_DELETE_THROTTLE_SECONDS: float = 0.05
+    # Pending reply deletions are persisted; abandoned ones are resumed after their lease expires
+    COMMENT_DELETE_LEASE_SECONDS: int = 300
+    COMMENT_DELETE_SWEEP_SECONDS: int = 60
+
+    # Live updates (Server-Sent Events)
+    # "local" keeps events inside one process; "mongo" shares them across workers via a capped collection
+    EVENTS_BROKER: str = "local"
+    EVENTS_QUEUE_SIZE: int = 100
+    EVENTS_COALESCE_SECONDS: float = 0.25
+    EVENTS_HEARTBEAT_SECONDS: float = 15.0
+    EVENTS_CAPPED_COLLECTION_BYTES: int = 16 * 1024 * 1024
+
+    # Per-user token buckets on write-heavy routes, "<burst>/<seconds>": up to `burst` requests
+    # at once, refilled at burst/seconds per second. "local" keeps buckets per worker; "mongo"
+    # shares them across workers (needs MongoDB 4.2+)
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_BACKEND: str = "local"
+    RATE_LIMITS: Dict[str, str] = {
+        "create_post": "10/60",
+        "add_comment": "30/60",
+        "toggle_like": "60/60",
+        "track_view": "120/60",
+        "track_share": "30/60",
+    }
+    RATE_LIMIT_MAX_KEYS: int = 100_000
+    RATE_LIMIT_SHARED_TTL_SECONDS: int = 3600
+
+    # Admission control (load shedding) per worker. Each request class has a concurrency cap, a
+    # queue deadline and a priority (0 = served first when slots free up); requests that cannot
+    # start within the deadline get 503. Routes are classed by "METHOD /path/{template}";
+    # "exempt" bypasses admission (long-lived streams, metrics scrapes)
+    ADMISSION_ENABLED: bool = True
+    ADMISSION_MAX_IN_FLIGHT: int = 256
+    ADMISSION_CLASSES: Dict[str, Dict[str, float]] = {
+        "critical": {"priority": 0, "concurrency": 256, "queueDeadlineMs": 2000},
+        "default": {"priority": 1, "concurrency": 128, "queueDeadlineMs": 1000},
+        "expensive": {"priority": 2, "concurrency": 16, "queueDeadlineMs": 500},
+    }
+    ADMISSION_DEFAULT_CLASS: str = "default"
+    ADMISSION_ROUTE_CLASSES: Dict[str, str] = {
+        "GET /api/hopes/": "critical",
+        "GET /api/posts/": "critical",
+        "GET /api/posts/home": "critical",
+        "GET /api/schools/{schoolId}": "critical",
+        "GET /api/donors/{username}": "critical",
+        "POST /api/schools/login": "expensive",
+        "POST /api/schools/signup": "expensive",
+        "POST /api/donors/signup": "expensive",
+        "POST /api/posts/": "expensive",
+        "PUT /api/posts/{postId}": "expensive",
+        "PUT /api/schools/{schoolId}/profile": "expensive",
+        "GET /api/events/stream": "exempt",
+        "GET /metrics": "exempt",
+        "GET /health": "exempt",
+        "GET /health/live": "exempt",
+        "GET /health/ready": "exempt",
+    }
+
+    # Delta sync for offline clients (GET /api/sync). Changes younger than the settle window are
+    # held back so writes still in flight are not skipped; tokens older than the tombstone
+    # retention must resync from scratch
+    SYNC_PAGE_SIZE: int = 100
+    SYNC_MAX_PAGE_SIZE: int = 500
+    SYNC_SETTLE_SECONDS: float = 2.0
+    SYNC_TOMBSTONE_RETENTION_DAYS: int = 30
+
+    # Per-request database command instrumentation (X-DB-* headers are for debugging only)
+    QUERY_STATS_HEADERS: bool = False
+    # Collection-scan detector for tests and staging: "off", "log" or "raise"
+    QUERY_PLAN_CHECK: str = "off"
+
+    # On-demand sampling profiler (collapsed stacks for flamegraphs)
+    # PROFILER_ENABLED is the startup value of the admin toggle; PROFILER_ALLOW_HEADER lets
+    # admins profile single requests with `X-Profile: 1`
+    PROFILER_ENABLED: bool = False
+    PROFILER_SAMPLE_RATE: float = 0.01
+    PROFILER_ALLOW_HEADER: bool = False
+    PROFILER_INTERVAL_SECONDS: float = 0.005
+    PROFILER_DIR: str = "profiles"
+    PROFILER_MAX_FILES: int = 200
+
     # This configuration tells Pydantic to read variables from the .env file
     # extra="ignore" ensures that if there are extra variables in .env, it won't crash
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8", extra="ignore")
 
 # Create a global instance to be imported across the application
-settings = Settings()
\ No newline at end of file
+with startup_timer.phase("settings"):
+    settings = Settings()
\ No newline at end of file
@@ -1,5 +1,12 @@
+import asyncio
+from typing import Dict, List
+
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import IndexModel
 from app.core.config import settings
+from app.core.metrics import mongo_pool_listener
+from app.core.query_stats import query_stats_listener
+from app.core.resilience import ResilientDatabase
 import logging
 
 # Setup basic logging to track database connection status in the terminal
@@ -20,9 +27,24 @@ async def connect_to_mongo():
     try:
         logger.info("Connecting to MongoDB...")
         # Initialize the Motor client using the URL from .env
-        db_instance.client = AsyncIOMotorClient(settings.MONGO_URL)
-        # Select the specific database
-        db_instance.db = db_instance.client[settings.DB_NAME]
+        # The command listener attributes every database command to the current request;
+        # the pool listener feeds the connection gauges of /metrics.
+        # Pool sizes are per process: each serve.py worker opens its own pool after the fork
+        db_instance.client = AsyncIOMotorClient(
+            settings.MONGO_URL,
+            event_listeners=[query_stats_listener, mongo_pool_listener],
+            maxPoolSize=settings.MONGO_MAX_POOL_SIZE,
+            minPoolSize=settings.MONGO_MIN_POOL_SIZE,
+            maxIdleTimeMS=settings.MONGO_MAX_IDLE_TIME_MS or None,
+            connectTimeoutMS=settings.MONGO_CONNECT_TIMEOUT_MS or None,
+            serverSelectionTimeoutMS=settings.MONGO_SERVER_SELECTION_TIMEOUT_MS,
+            waitQueueTimeoutMS=settings.MONGO_WAIT_QUEUE_TIMEOUT_MS or None,
+            socketTimeoutMS=settings.MONGO_SOCKET_TIMEOUT_MS or None,
+        )
+        # Select the specific database; routers reach it through the retry / timeout / breaker layer
+        db_instance.db = ResilientDatabase(db_instance.client[settings.DB_NAME])
+        # The client connects lazily; a ping surfaces an unreachable server here rather than in create_indexes
+        await db_instance.client.admin.command("ping")
         logger.info("Successfully connected to MongoDB.")
     except Exception as e:
         logger.error(f"Failed to connect to MongoDB: {e}")
@@ -38,6 +60,81 @@ async def close_mongo_connection():
         db_instance.client.close()
         logger.info("MongoDB connection closed.")
 
+async def create_indexes():
+    """
+    Creates the indexes the routers rely on.
+    createIndexes is a no-op for indexes that already exist, so this is safe on every startup.
+    The indexes are sent as one command per collection, all collections concurrently.
+    """
+    db = db_instance.db
+    indexes: Dict[str, List[IndexModel]] = {}
+
+    def index(collection: str, keys: list, **options) -> None:
+        indexes.setdefault(collection, []).append(IndexModel(keys, **options))
+
+    # Per-school timeline (keyset on createdAt, _id); also serves author lookups
+    index("posts", [("schoolId", 1), ("createdAt", -1), ("_id", -1)])
+    # Viewer like lookups (toggle_like and batched feed hydration)
+    index("post_likes", [("schoolId", 1), ("postId", 1)])
+    index("post_comments", [("userId", 1)])
+    # Top-level comments of a post, newest first (keyset on createdAt, _id)
+    index("post_comments", [("postId", 1), ("parentId", 1), ("createdAt", -1), ("_id", -1)])
+    # Reply threads: direct children, whole threads and subtrees by materialized path
+    index("post_comments", [("parentId", 1), ("createdAt", 1), ("_id", 1)])
+    index("post_comments", [("rootId", 1), ("createdAt", 1), ("_id", 1)])
+    index("post_comments", [("postId", 1), ("path", 1)])
+    # Pending reply deletions picked up by the sweeper once their lease expires
+    index("comment_delete_jobs", [("leaseExpiresAt", 1)])
+    # Embedded preview comments rewritten by the author propagation job
+    index("posts", [("previewComments.userId", 1)], sparse=True)
+    # Saved posts (bookmarks)
+    index("post_saves", [("userId", 1), ("postId", 1)], unique=True)
+    index("post_saves", [("userId", 1), ("createdAt", -1), ("_id", -1)])
+    index("post_saves", [("postId", 1)])
+    # Feed orderings; the trailing version lets ETag validation run as a covered query
+    # (trending scores are materialized by app.utils.trending)
+    index("posts", [("createdAt", -1), ("_id", -1), ("version", 1)])
+    index("posts", [("trendingScore", -1), ("_id", -1), ("version", 1)])
+    # Donor profile revalidation reads only the version
+    index("donors", [("username", 1), ("version", 1)])
+    # Login, signup duplicate checks and availability lookups ($or on username / email)
+    index("schools", [("username", 1)])
+    index("schools", [("email", 1)])
+    index("donors", [("email", 1)])
+    # Unique-view dedupe in track_view
+    index("post_views", [("postId", 1), ("userId", 1)])
+    # Delta sync: changes per collection in (updatedAt, _id) order, and expiring tombstones
+    for collection in ("posts", "hopes", "schools", "donors", "sync_tombstones"):
+        index(collection, [("updatedAt", 1), ("_id", 1)])
+    index("sync_tombstones", 
+        [("updatedAt", 1)],
+        expireAfterSeconds=settings.SYNC_TOMBSTONE_RETENTION_DAYS * 24 * 3600
+    )
+    # Shared rate-limit buckets (RATE_LIMIT_BACKEND=mongo); idle buckets are full again long before they expire
+    index("rate_limits", 
+        [("updatedAt", 1)],
+        expireAfterSeconds=settings.RATE_LIMIT_SHARED_TTL_SECONDS
+    )
+    # Full-text search over normalized post and comment text (see app.utils.text_search)
+    index("posts", [("searchText", "text")], default_language="none", name="posts_search")
+    index("post_comments", [("searchText", "text")], default_language="none", name="comments_search")
+    # Follow graph
+    index("follows", [("followerId", 1), ("followeeId", 1)], unique=True)
+    index("follows", [("followeeId", 1)])
+    index("follows", [("followerId", 1), ("hub", 1)])
+    # Materialized home timelines (one entry per follower per post)
+    index("timelines", [("ownerId", 1), ("postId", 1)], unique=True)
+    index("timelines", [("ownerId", 1), ("createdAt", -1), ("postId", -1)])
+    index("timelines", [("ownerId", 1), ("authorId", 1)])
+    index("timelines", [("postId", 1)])
+    index("timelines", 
+        [("createdAt", 1)],
+        expireAfterSeconds=settings.HOME_TIMELINE_RETENTION_DAYS * 24 * 3600
+    )
+
+    await asyncio.gather(*(db[collection].create_indexes(models) for collection, models in indexes.items()))
+    logger.info("MongoDB indexes are in place.")
+
 def get_database():
     """
     Dependency injection function to provide the database instance to API routes.
@@ -0,0 +1,189 @@
+import asyncio
+import json
+import logging
+from collections import deque
+from typing import Any, Callable, Dict, Optional, Set
+
+from pymongo import CursorType
+from pymongo.errors import CollectionInvalid
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Event types whose payload holds absolute counter values that may be coalesced per post
+COUNTER_EVENT = "post.counters"
+
+
+# ==========================================
+# Brokers (how events travel between workers)
+# ==========================================
+class LocalBroker:
+    """In-process broker: events only reach subscribers of this worker. Enough for a single process and tests."""
+
+    def __init__(self):
+        self._deliver: Optional[Callable[[dict], None]] = None
+
+    async def start(self, deliver: Callable[[dict], None]) -> None:
+        self._deliver = deliver
+
+    async def publish(self, event: dict) -> None:
+        if self._deliver is not None:
+            self._deliver(event)
+
+    async def stop(self) -> None:
+        self._deliver = None
+
+
+class MongoBroker:
+    """
+    Shares events between workers through a capped collection.
+    Every worker appends published events and tails the collection to deliver
+    them to its own subscribers, so no extra infrastructure is needed.
+    """
+
+    def __init__(self, db, collection: str = "live_events"):
+        self._db = db
+        self._collection = collection
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self, deliver: Callable[[dict], None]) -> None:
+        try:
+            await self._db.create_collection(
+                self._collection, capped=True, size=settings.EVENTS_CAPPED_COLLECTION_BYTES
+            )
+        except CollectionInvalid:
+            pass  # Already exists
+        self._task = asyncio.create_task(self._tail(deliver))
+
+    async def publish(self, event: dict) -> None:
+        await self._db[self._collection].insert_one(dict(event))
+
+    async def _tail(self, deliver: Callable[[dict], None]) -> None:
+        collection = self._db[self._collection]
+        last = await collection.find_one({}, sort=[("$natural", -1)])
+        last_id = last["_id"] if last else None
+
+        while True:
+            try:
+                query = {"_id": {"$gt": last_id}} if last_id is not None else {}
+                cursor = collection.find(query, cursor_type=CursorType.TAILABLE_AWAIT).stream()
+                while cursor.alive:
+                    async for doc in cursor:
+                        last_id = doc.pop("_id")
+                        deliver(doc)
+                    await asyncio.sleep(0.1)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Live event tailing failed, retrying: {e}")
+            await asyncio.sleep(1)
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+
+# ==========================================
+# Per-connection subscription
+# ==========================================
+class Subscription:
+    """
+    Buffers events for one stream connection.
+    Discrete events go to a bounded queue; when a slow client lets it overflow the
+    oldest events are dropped and the client is told to resync. Counter updates are
+    coalesced per post so rapid likes/views collapse into one message per flush.
+    """
+
+    def __init__(self, max_queue: int):
+        self._events: deque = deque(maxlen=max_queue)
+        self._counters: Dict[str, dict] = {}
+        self._max_counters = max_queue
+        self._wakeup = asyncio.Event()
+        self.overflowed = False
+
+    def offer(self, event: dict) -> None:
+        if event["type"] == COUNTER_EVENT:
+            post_id = event["data"]["postId"]
+            if post_id not in self._counters and len(self._counters) >= self._max_counters:
+                self.overflowed = True
+                return
+            self._counters.setdefault(post_id, {}).update(event["data"])
+        else:
+            if len(self._events) == self._events.maxlen:
+                self.overflowed = True
+            self._events.append(event)
+        self._wakeup.set()
+
+    async def wait(self, timeout: float) -> bool:
+        """Waits for new events; returns False on timeout (time for a heartbeat)."""
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    def drain(self) -> list:
+        events = []
+        if self.overflowed:
+            events.append({"type": "resync", "data": {}})
+            self.overflowed = False
+        events.extend(self._events)
+        events.extend({"type": COUNTER_EVENT, "data": data} for data in self._counters.values())
+        self._events.clear()
+        self._counters.clear()
+        self._wakeup.clear()
+        return events
+
+
+# ==========================================
+# Hub
+# ==========================================
+class EventHub:
+    """Fans published events out to every open stream of this worker via the configured broker."""
+
+    def __init__(self):
+        self.broker = LocalBroker()
+        self._subscriptions: Set[Subscription] = set()
+
+    async def start(self, db) -> None:
+        if settings.EVENTS_BROKER == "mongo":
+            self.broker = MongoBroker(db)
+        else:
+            self.broker = LocalBroker()
+        await self.broker.start(self._deliver)
+
+    async def stop(self) -> None:
+        await self.broker.stop()
+
+    def _deliver(self, event: dict) -> None:
+        for subscription in self._subscriptions:
+            subscription.offer(event)
+
+    async def publish(self, event_type: str, data: Dict[str, Any]) -> None:
+        """Publishes an event; failures are logged so live updates never break a write request."""
+        try:
+            await self.broker.publish({"type": event_type, "data": data})
+        except Exception as e:
+            logger.error(f"Failed to publish live event {event_type}: {e}")
+
+    async def publish_counters(self, post_id: str, **counters: int) -> None:
+        await self.publish(COUNTER_EVENT, {"postId": post_id, **counters})
+
+    def subscribe(self) -> Subscription:
+        subscription = Subscription(settings.EVENTS_QUEUE_SIZE)
+        self._subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        self._subscriptions.discard(subscription)
+
+
+def format_sse(event: dict) -> str:
+    return f"event: {event['type']}\ndata: {json.dumps(event['data'], default=str)}\n\n"
+
+
+# Global hub shared by the routers
+event_hub = EventHub()
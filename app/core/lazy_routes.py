@@ -0,0 +1,60 @@
+import importlib
+import logging
+import time
+from typing import Dict
+
+from fastapi import FastAPI
+from starlette.routing import Mount
+
+logger = logging.getLogger(__name__)
+
+
+class LazyRouters:
+    """
+    Routers of rarely used features, imported on their first request instead of at startup.
+    Each one starts as a placeholder mount at its prefix; the first request under that
+    prefix imports the module, includes its `router` into the app, drops the placeholder
+    and routes the request again, now to the real endpoint. Building the OpenAPI schema
+    loads them all, so /docs always lists every route.
+    """
+
+    def __init__(self, app: FastAPI):
+        self.app = app
+        self._placeholders: Dict[str, Mount] = {}
+        build_openapi = app.openapi
+
+        def openapi() -> dict:
+            self.load_all()
+            return build_openapi()
+
+        app.openapi = openapi
+
+    def add(self, prefix: str, module: str) -> None:
+        """Registers `module`, whose router serves everything under `prefix`, for loading on first use."""
+
+        async def placeholder(scope, receive, send):
+            self.load(module)
+            # Undo the scope changes of the mount before routing again
+            scope["root_path"] = scope.get("app_root_path", scope["root_path"])
+            scope["path_params"] = {}
+            scope.pop("endpoint", None)
+            await self.app.router(scope, receive, send)
+
+        mount = Mount(prefix, app=placeholder)
+        self._placeholders[module] = mount
+        self.app.router.routes.append(mount)
+
+    def load(self, module: str) -> None:
+        mount = self._placeholders.get(module)
+        if mount is None:
+            return  # Loaded already
+        start = time.perf_counter()
+        # A failed import leaves the placeholder in place, so the next request retries
+        self.app.include_router(importlib.import_module(module).router)
+        self.app.router.routes.remove(mount)
+        del self._placeholders[module]
+        logger.info("Loaded %s on first use in %.0f ms", module, (time.perf_counter() - start) * 1000)
+
+    def load_all(self) -> None:
+        for module in list(self._placeholders):
+            self.load(module)
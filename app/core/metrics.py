@@ -0,0 +1,277 @@
+import threading
+import time
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Tuple
+
+from pymongo import monitoring
+
+from app.core.query_stats import route_path
+
+# Prometheus' default latency buckets (seconds)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Tuple[str, ...], values: Tuple[str, ...]) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values)) + "}"
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labels: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(labels)
+        self._lock = threading.Lock()
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[tuple, float] = {}
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, *labels: str) -> float:
+        return self._values.get(labels, 0)
+
+    def values(self) -> Dict[tuple, float]:
+        with self._lock:
+            return dict(self._values)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return self.header() + [f"{self.name}{_format_labels(self.label_names, k)} {v}" for k, v in items]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, *labels: str, amount: float = 1) -> None:
+        self.inc(*labels, amount=-amount)
+
+    def set(self, *labels: str, value: float) -> None:
+        with self._lock:
+            self._values[labels] = value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labels: Iterable[str] = (), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(buckets)
+        # labels -> [per-bucket counts (+Inf last), sum]
+        self._values: Dict[tuple, list] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(labels)
+            if entry is None:
+                entry = self._values[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            entry[0][index] += 1
+            entry[1] += value
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = [(k, list(counts), total) for k, (counts, total) in self._values.items()]
+        lines = self.header()
+        names = self.label_names + ("le",)
+        for labels, counts, total in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f"{self.name}_bucket{_format_labels(names, labels + (le,))} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.label_names, labels)} {total}")
+            lines.append(f"{self.name}_count{_format_labels(self.label_names, labels)} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        lines.extend(_cache_hit_ratios())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+# HTTP
+http_requests = registry.register(Counter(
+    "http_requests_total", "HTTP requests by route and status.", ("method", "route", "status")
+))
+http_latency = registry.register(Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route.", ("method", "route")
+))
+http_in_flight = registry.register(Gauge("http_requests_in_flight", "HTTP requests being served."))
+
+# MongoDB connection pools (fed by MongoPoolMetricsListener)
+mongo_pool_connections = registry.register(Gauge(
+    "mongo_pool_connections", "Open connections per MongoDB server.", ("address",)
+))
+mongo_pool_checked_out = registry.register(Gauge(
+    "mongo_pool_checked_out_connections", "Connections currently checked out per MongoDB server.", ("address",)
+))
+mongo_pool_checkout_failures = registry.register(Counter(
+    "mongo_pool_checkout_failures_total", "Failed connection checkouts (pool exhausted, timeouts, errors).", ("address", "reason")
+))
+
+# Resilient data access (see app.core.resilience)
+mongo_breaker_state = registry.register(Gauge(
+    "mongo_circuit_breaker_state", "MongoDB circuit breaker of this worker: 0 closed, 1 half-open, 2 open."
+))
+mongo_read_retries = registry.register(Counter(
+    "mongo_read_retries_total", "Idempotent reads retried after a transient MongoDB error, by operation.", ("operation",)
+))
+mongo_fast_failures = registry.register(Counter(
+    "mongo_fast_failures_total", "Operations refused without contacting MongoDB because the circuit breaker was open."
+))
+
+# Password hashing pool (see app.core.security.run_in_bcrypt_pool)
+bcrypt_queue_depth = registry.register(Gauge("bcrypt_queue_depth", "bcrypt jobs waiting for a worker thread."))
+bcrypt_active = registry.register(Gauge("bcrypt_active_jobs", "bcrypt jobs running."))
+bcrypt_seconds = registry.register(Histogram(
+    "bcrypt_duration_seconds", "Time from submitting a bcrypt job to its completion (queue + hashing)."
+))
+
+# Uploads
+upload_bytes = registry.register(Counter("upload_bytes_total", "Bytes of uploaded images written to disk."))
+
+# Per-user rate limits (see app.core.rate_limit)
+rate_limited_requests = registry.register(Counter(
+    "rate_limited_requests_total", "Requests rejected with 429 by the per-user rate limiter.", ("limit",)
+))
+
+# Admission control / load shedding (see app.core.admission)
+admission_queue_depth = registry.register(Gauge(
+    "admission_queue_depth", "Requests waiting for an admission slot, by request class.", ("class",)
+))
+admission_queue_seconds = registry.register(Histogram(
+    "admission_queue_seconds", "Time queued requests waited for a slot (admitted or not), by request class.", ("class",)
+))
+admission_rejections = registry.register(Counter(
+    "admission_rejections_total", "Requests shed with 503, by request class and reason (predicted or deadline).", ("class", "reason")
+))
+
+# Caches: ETag revalidation and the availability filters
+cache_requests = registry.register(Counter(
+    "cache_requests_total", "Cache lookups by cache and result (hit or miss).", ("cache", "result")
+))
+
+
+def _cache_hit_ratios() -> List[str]:
+    """Derived hit ratio per cache, rendered at scrape time from cache_requests_total."""
+    totals: Dict[str, List[float]] = {}
+    for (cache, result), value in cache_requests.values().items():
+        entry = totals.setdefault(cache, [0, 0])
+        entry[0 if result == "hit" else 1] += value
+    lines = [
+        "# HELP cache_hit_ratio Share of cache lookups that were hits since startup.",
+        "# TYPE cache_hit_ratio gauge",
+    ]
+    for cache, (hits, misses) in sorted(totals.items()):
+        lines.append(f'cache_hit_ratio{{cache="{cache}"}} {hits / (hits + misses) if hits + misses else 0}')
+    return lines
+
+
+class MongoPoolMetricsListener(monitoring.ConnectionPoolListener):
+    """Tracks open and checked-out connections of the Motor client's pools."""
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        pass
+
+    def pool_closed(self, event):
+        address = f"{event.address[0]}:{event.address[1]}"
+        mongo_pool_connections.set(address, value=0)
+        mongo_pool_checked_out.set(address, value=0)
+
+    def connection_created(self, event):
+        mongo_pool_connections.inc(f"{event.address[0]}:{event.address[1]}")
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        mongo_pool_connections.dec(f"{event.address[0]}:{event.address[1]}")
+
+    def connection_check_out_started(self, event):
+        pass
+
+    def connection_check_out_failed(self, event):
+        mongo_pool_checkout_failures.inc(f"{event.address[0]}:{event.address[1]}", str(event.reason))
+
+    def connection_checked_out(self, event):
+        mongo_pool_checked_out.inc(f"{event.address[0]}:{event.address[1]}")
+
+    def connection_checked_in(self, event):
+        mongo_pool_checked_out.dec(f"{event.address[0]}:{event.address[1]}")
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording request counts, latency and in-flight requests per route template.
+    Its per-request cost is measured by benchmarks/metrics_overhead.py.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        http_in_flight.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            http_in_flight.dec()
+            method = scope["method"]
+            route = route_path(scope)
+            http_requests.inc(method, route, str(status_code))
+            http_latency.observe(elapsed, method, route)
+
+
+# Global pool listener (registered on the Motor client)
+mongo_pool_listener = MongoPoolMetricsListener()
@@ -0,0 +1,223 @@
+import asyncio
+import logging
+import os
+import random
+import re
+import secrets
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from app.core.config import settings
+from app.core.query_stats import route_path
+
+logger = logging.getLogger(__name__)
+
+_SAFE_NAME_RE = re.compile(r"[^A-Za-z0-9_.-]+")
+
+
+def _frame_label(code) -> str:
+    """Collapsed-stack frame name: qualified function name and defining file:line."""
+    filename = code.co_filename
+    for prefix in sys.path:
+        if prefix and filename.startswith(prefix):
+            filename = filename[len(prefix):].lstrip(os.sep)
+            break
+    name = getattr(code, "co_qualname", code.co_name)
+    return f"{name} ({filename}:{code.co_firstlineno})".replace(";", ",")
+
+
+def _task_stack(task: asyncio.Task, loop_thread_id: int) -> List[str]:
+    """
+    Wall-clock stack of a task, root first. The coroutine await chain gives the async part;
+    when the innermost coroutine is executing, the event loop thread's frames above it are
+    appended, and when it is suspended the awaited object closes the stack.
+    """
+    stack: List[str] = []
+    coro = task.get_coro()
+    innermost_frame = None
+    while coro is not None:
+        frame = getattr(coro, "cr_frame", None) or getattr(coro, "gi_frame", None)
+        if frame is None:
+            break
+        stack.append(_frame_label(frame.f_code))
+        innermost_frame = frame
+        awaited = getattr(coro, "cr_await", None)
+        if awaited is None:
+            awaited = getattr(coro, "gi_yieldfrom", None)
+        if awaited is None:
+            break
+        if getattr(awaited, "cr_frame", None) is None and getattr(awaited, "gi_frame", None) is None:
+            name = type(awaited).__name__
+            stack.append(f"[await {'Future' if name == 'FutureIter' else name}]")
+            return stack
+        coro = awaited
+
+    # Not waiting on anything: either running on the loop right now or ready to run
+    running = sys._current_frames().get(loop_thread_id)
+    above: List[str] = []
+    while running is not None and running is not innermost_frame:
+        above.append(_frame_label(running.f_code))
+        running = running.f_back
+    if running is innermost_frame and innermost_frame is not None:
+        stack.extend(reversed(above))
+    else:
+        stack.append("[ready]")
+    return stack
+
+
+class _Profile:
+    __slots__ = ("task", "loop_thread_id", "stacks", "samples")
+
+    def __init__(self, task: asyncio.Task, loop_thread_id: int):
+        self.task = task
+        self.loop_thread_id = loop_thread_id
+        self.stacks: Counter = Counter()
+        self.samples = 0
+
+
+class SamplingProfiler:
+    """
+    Statistical wall-clock profiler for individual requests.
+    A daemon thread samples the stacks of the registered request tasks every
+    PROFILER_INTERVAL_SECONDS; it only runs while at least one request is being profiled.
+    """
+
+    def __init__(self):
+        self.enabled = settings.PROFILER_ENABLED
+        self.sample_rate = settings.PROFILER_SAMPLE_RATE
+        self._profiles: Dict[asyncio.Task, _Profile] = {}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def armed(self) -> bool:
+        """False means the middleware is a pure pass-through."""
+        return self.enabled or settings.PROFILER_ALLOW_HEADER
+
+    def should_profile(self, scope) -> bool:
+        if self.enabled and random.random() < self.sample_rate:
+            return True
+        if not settings.PROFILER_ALLOW_HEADER:
+            return False
+        headers = dict(scope.get("headers", []))
+        return headers.get(b"x-profile") == b"1" and secrets.compare_digest(
+            headers.get(b"x-admin-code", b""), settings.ADMIN_SECRET_CODE.encode()
+        )
+
+    def start(self, task: asyncio.Task) -> _Profile:
+        profile = _Profile(task, threading.get_ident())
+        with self._lock:
+            self._profiles[task] = profile
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+                self._thread.start()
+            self._wakeup.set()
+        return profile
+
+    def stop(self, task: asyncio.Task) -> Optional[_Profile]:
+        with self._lock:
+            return self._profiles.pop(task, None)
+
+    def _run(self) -> None:
+        while True:
+            with self._lock:
+                # Cleared before reading, under the lock: a start() after the read sets it again
+                self._wakeup.clear()
+                profiles = list(self._profiles.values())
+            if not profiles:
+                self._wakeup.wait()
+                continue
+            for profile in profiles:
+                try:
+                    stack = _task_stack(profile.task, profile.loop_thread_id)
+                except Exception:
+                    continue  # The task moved on while being walked; skip this sample
+                profile.stacks[";".join(stack)] += 1
+                profile.samples += 1
+            time.sleep(settings.PROFILER_INTERVAL_SECONDS)
+
+
+def write_profile(profile: _Profile, name: str) -> None:
+    """Writes a collapsed-stack file (input for flamegraph.pl / speedscope) and rotates old ones."""
+    os.makedirs(settings.PROFILER_DIR, exist_ok=True)
+    with open(os.path.join(settings.PROFILER_DIR, name), "w", encoding="utf-8") as f:
+        for stack, count in profile.stacks.most_common():
+            f.write(f"{stack} {count}\n")
+
+    files = sorted(
+        (entry for entry in os.scandir(settings.PROFILER_DIR) if entry.name.endswith(".folded")),
+        key=lambda entry: entry.stat().st_mtime,
+    )
+    for entry in files[:-settings.PROFILER_MAX_FILES]:
+        os.remove(entry.path)
+
+
+def list_profiles() -> List[dict]:
+    if not os.path.isdir(settings.PROFILER_DIR):
+        return []
+    entries = [entry for entry in os.scandir(settings.PROFILER_DIR) if entry.name.endswith(".folded")]
+    entries.sort(key=lambda entry: entry.stat().st_mtime, reverse=True)
+    return [
+        {
+            "name": entry.name,
+            "sizeBytes": entry.stat().st_size,
+            "createdAt": datetime.fromtimestamp(entry.stat().st_mtime, timezone.utc),
+        }
+        for entry in entries
+    ]
+
+
+def profile_path(name: str) -> Optional[str]:
+    """Path of a stored profile, or None for unknown or unsafe names."""
+    if _SAFE_NAME_RE.search(name) or not name.endswith(".folded"):
+        return None
+    path = os.path.join(settings.PROFILER_DIR, name)
+    return path if os.path.isfile(path) else None
+
+
+class ProfilerMiddleware:
+    """
+    Profiles a sample of requests (admin toggle + PROFILER_SAMPLE_RATE) or single requests
+    that send `X-Profile: 1` with a valid X-Admin-Code (when PROFILER_ALLOW_HEADER is on).
+    Profiled responses carry an X-Profile-Id header naming the stored profile.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not request_profiler.armed or not request_profiler.should_profile(scope):
+            await self.app(scope, receive, send)
+            return
+
+        started = datetime.now(timezone.utc)
+        profile_id = f"{started:%Y%m%dT%H%M%S%f}-{random.getrandbits(24):06x}"
+
+        async def send_with_id(message):
+            if message["type"] == "http.response.start":
+                message = {**message, "headers": list(message.get("headers", [])) + [(b"x-profile-id", profile_id.encode())]}
+            await send(message)
+
+        task = asyncio.current_task()
+        profile = request_profiler.start(task)
+        clock = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            request_profiler.stop(task)
+            elapsed_ms = (time.perf_counter() - clock) * 1000
+            route = _SAFE_NAME_RE.sub("_", f"{scope['method']}{route_path(scope)}").strip("_")
+            name = f"{profile_id}_{route}_{elapsed_ms:.0f}ms.folded"
+            try:
+                await asyncio.to_thread(write_profile, profile, name)
+            except OSError as e:
+                logger.error(f"Could not write profile {name}: {e}")
+
+
+# Global profiler toggled through the diagnostics router
+request_profiler = SamplingProfiler()
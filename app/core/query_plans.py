@@ -0,0 +1,191 @@
+import json
+import logging
+import threading
+from typing import Dict, List
+
+from app.core.config import settings
+from app.core.database import db_instance
+from app.core.query_stats import current_query_stats, route_template, untracked
+
+logger = logging.getLogger(__name__)
+
+# Envelope fields of a sent command that explain does not accept
+_ENVELOPE_FIELDS = {
+    "lsid", "$db", "$clusterTime", "$readPreference", "txnNumber", "startTransaction", "autocommit",
+    "readConcern", "writeConcern", "apiVersion", "apiStrict", "apiDeprecationErrors",
+}
+
+
+class CollectionScanDetected(AssertionError):
+    pass
+
+
+def _shape(value):
+    """Replaces the literal values of a filter with "?" so queries differing only in values share a shape."""
+    if isinstance(value, dict):
+        return {key: _shape(item) for key, item in value.items()}
+    if isinstance(value, list) and value and all(isinstance(item, dict) for item in value):
+        return [_shape(item) for item in value]
+    return "?"
+
+
+def _statement_parts(command_name: str, command: dict):
+    """(collection, filter, sort) of an explainable command."""
+    collection = command.get(command_name)
+    if command_name == "find":
+        return collection, command.get("filter", {}), command.get("sort")
+    if command_name in ("count", "distinct"):
+        return collection, command.get("query", {}), None
+    if command_name == "findAndModify":
+        return collection, command.get("query", {}), command.get("sort")
+    if command_name == "update":
+        return collection, (command.get("updates") or [{}])[0].get("q", {}), None
+    if command_name == "delete":
+        return collection, (command.get("deletes") or [{}])[0].get("q", {}), None
+    # aggregate: the leading $match and $sort stages are what the planner sees
+    pipeline = command.get("pipeline", [])
+    match = next((stage["$match"] for stage in pipeline if "$match" in stage), {})
+    sort = next((stage["$sort"] for stage in pipeline if "$sort" in stage), None)
+    return collection, match, sort
+
+
+def _explain_target(command_name: str, command: dict) -> dict:
+    target = {key: value for key, value in command.items() if key not in _ENVELOPE_FIELDS}
+    # Explain accepts a single write statement
+    if command_name == "update":
+        target["updates"] = target.get("updates", [])[:1]
+    elif command_name == "delete":
+        target["deletes"] = target.get("deletes", [])[:1]
+    return target
+
+
+def _plan_stages(explain: dict) -> List[str]:
+    """Stage names of the winning plans (classic and slot-based engines, find and aggregate explains)."""
+    stages: List[str] = []
+
+    def walk(node, in_plan: bool):
+        if isinstance(node, dict):
+            for key, value in node.items():
+                if key == "rejectedPlans":
+                    continue
+                if key in ("winningPlan", "queryPlan"):
+                    walk(value, True)
+                elif key == "stage" and in_plan and isinstance(value, str):
+                    stages.append(value)
+                elif key == "$sort" and not in_plan:
+                    stages.append("$sort")  # Pipeline sort that could not use an index
+                else:
+                    walk(value, in_plan)
+        elif isinstance(node, list):
+            for item in node:
+                walk(item, in_plan)
+
+    walk(explain, False)
+    return list(dict.fromkeys(stages))
+
+
+class QueryPlanChecker:
+    """
+    Explains every distinct query shape once and remembers the winning plan and the routes
+    issuing it. A shape is flagged when it scans the whole collection although it filters or
+    sorts (unfiltered listings scan by nature), or when it sorts in memory.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._shapes: Dict[str, dict] = {}
+
+    async def check(self, route: str, statements: List[tuple]) -> List[dict]:
+        """Explains the new shapes among a request's statements and returns the flagged ones."""
+        flagged = []
+        for database, command in statements:
+            command_name = next(iter(command))
+            collection, query, sort = _statement_parts(command_name, command)
+            key = json.dumps([command_name, collection, _shape(query), _shape(sort or {})], default=str)
+
+            with self._lock:
+                entry = self._shapes.get(key)
+                is_new = entry is None
+                if is_new:
+                    entry = self._shapes[key] = {
+                        "command": command_name,
+                        "collection": collection,
+                        "filter": _shape(query),
+                        "sort": _shape(sort) if sort else None,
+                        "routes": [],
+                        "stages": None,
+                        "collectionScan": False,
+                        "inMemorySort": False,
+                    }
+                if route not in entry["routes"]:
+                    entry["routes"].append(route)
+
+            if is_new:
+                await self._explain(entry, database, command_name, command, bool(query) or bool(sort))
+            if entry["collectionScan"] or entry["inMemorySort"]:
+                flagged.append(entry)
+        return flagged
+
+    async def _explain(self, entry: dict, database: str, command_name: str, command: dict, selective: bool) -> None:
+        try:
+            with untracked():
+                explain = await db_instance.client[database].command(
+                    {"explain": _explain_target(command_name, command), "verbosity": "queryPlanner"}
+                )
+        except Exception as e:
+            # In-process stand-ins may not implement explain; the shape is still reported
+            entry["error"] = str(e)
+            return
+        stages = _plan_stages(explain)
+        entry["stages"] = stages
+        entry["collectionScan"] = selective and "COLLSCAN" in stages
+        entry["inMemorySort"] = "SORT" in stages or "$sort" in stages
+
+    def report(self) -> Dict[str, List[dict]]:
+        """Query shapes grouped by the routes that issue them."""
+        with self._lock:
+            by_route: Dict[str, List[dict]] = {}
+            for entry in self._shapes.values():
+                for route in entry["routes"]:
+                    by_route.setdefault(route, []).append({k: v for k, v in entry.items() if k != "routes"})
+            return dict(sorted(by_route.items()))
+
+    def reset(self) -> None:
+        with self._lock:
+            self._shapes.clear()
+
+
+class QueryPlanMiddleware:
+    """
+    Runs the plan check after each request when QUERY_PLAN_CHECK is "log" or "raise".
+    Must sit inside QueryStatsMiddleware, which collects the request's statements.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or settings.QUERY_PLAN_CHECK == "off":
+            await self.app(scope, receive, send)
+            return
+
+        await self.app(scope, receive, send)
+
+        stats = current_query_stats()
+        if stats is None or not stats.statements:
+            return
+        route = route_template(scope)
+        flagged = await query_plan_checker.check(route, stats.statements)
+        if not flagged:
+            return
+
+        problems = "; ".join(
+            f"{entry['command']} on {entry['collection']} {entry['filter']} -> {entry['stages']}" for entry in flagged
+        )
+        if settings.QUERY_PLAN_CHECK == "raise":
+            raise CollectionScanDetected(f"{route} ran unindexed queries: {problems}")
+        logger.warning(f"{route} ran unindexed queries: {problems}")
+
+
+# Global checker shared by the middleware and the diagnostics router
+query_plan_checker = QueryPlanChecker()
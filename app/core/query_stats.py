@@ -0,0 +1,255 @@
+import asyncio
+import contextvars
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, List, Optional
+
+from pymongo import monitoring
+
+from app.core.config import settings
+
+# Commands issued by the driver itself that say nothing about a route's data access
+IGNORED_COMMANDS = {"hello", "ismaster", "isMaster", "ping", "endSessions", "killCursors", "saslStart", "saslContinue"}
+
+# Commands whose query plans the scan detector explains (see app.core.query_plans)
+EXPLAINABLE_COMMANDS = {"find", "aggregate", "count", "distinct", "update", "delete", "findAndModify"}
+
+
+class RequestQueryStats:
+    """Database work attributed to one HTTP request."""
+
+    __slots__ = ("route", "commands", "duration_ms", "documents", "by_command", "statements")
+
+    def __init__(self):
+        self.route: Optional[str] = None
+        self.commands = 0
+        self.duration_ms = 0.0
+        self.documents = 0
+        self.by_command: Dict[str, int] = {}
+        # (database, command document) pairs kept only while QUERY_PLAN_CHECK is enabled
+        self.statements: List[tuple] = []
+
+    def record(self, command_name: str, duration_micros: int, documents: int) -> None:
+        self.commands += 1
+        self.duration_ms += duration_micros / 1000
+        self.documents += documents
+        self.by_command[command_name] = self.by_command.get(command_name, 0) + 1
+
+    def as_dict(self) -> dict:
+        return {
+            "route": self.route,
+            "commands": self.commands,
+            "durationMs": round(self.duration_ms, 3),
+            "documents": self.documents,
+            "byCommand": dict(self.by_command),
+        }
+
+
+# Stats of the request being served. Motor copies the context into its executor
+# threads, so the listener below sees the value of the request that issued the command.
+_current: ContextVar[Optional[RequestQueryStats]] = ContextVar("request_query_stats", default=None)
+
+
+def current_query_stats() -> Optional[RequestQueryStats]:
+    return _current.get()
+
+
+@contextmanager
+def untracked():
+    """Runs database calls without charging them to the current request (diagnostic queries)."""
+    token = _current.set(None)
+    try:
+        yield
+    finally:
+        _current.reset(token)
+
+
+def create_untracked_task(coro) -> asyncio.Task:
+    """
+    Starts background work from a request in a fresh context. asyncio.create_task copies
+    the current one, which would charge the task's commands to the request that started it,
+    even after its response is sent.
+    """
+    return asyncio.create_task(coro, context=contextvars.Context())
+
+
+def _reply_documents(command_name: str, reply: dict) -> int:
+    """
+    Documents a command returned or wrote, read from its reply.
+    (The server's docsExamined is only reported by explain or the profiler.)
+    """
+    cursor = reply.get("cursor")
+    if cursor is not None:
+        return len(cursor.get("firstBatch", cursor.get("nextBatch", [])))
+    if command_name == "findAndModify":
+        return 1 if reply.get("value") is not None else 0
+    n = reply.get("n")
+    return n if isinstance(n, int) else 0
+
+
+class QueryStatsListener(monitoring.CommandListener):
+    """pymongo command listener that charges every command to the current request."""
+
+    def started(self, event: monitoring.CommandStartedEvent) -> None:
+        if settings.QUERY_PLAN_CHECK == "off" or event.command_name not in EXPLAINABLE_COMMANDS:
+            return
+        stats = _current.get()
+        if stats is not None:
+            stats.statements.append((event.database_name, dict(event.command)))
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent) -> None:
+        stats = _current.get()
+        if stats is None or event.command_name in IGNORED_COMMANDS:
+            return
+        stats.record(event.command_name, event.duration_micros, _reply_documents(event.command_name, event.reply))
+
+    def failed(self, event: monitoring.CommandFailedEvent) -> None:
+        stats = _current.get()
+        if stats is None or event.command_name in IGNORED_COMMANDS:
+            return
+        stats.record(event.command_name, event.duration_micros, 0)
+
+
+class RouteQueryMetrics:
+    """Per-route aggregates of the request stats, plus hooks for test captures."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._routes: Dict[str, dict] = {}
+        self._captures: List[List[RequestQueryStats]] = []
+
+    def observe(self, stats: RequestQueryStats) -> None:
+        with self._lock:
+            route = self._routes.setdefault(stats.route, {
+                "requests": 0, "commands": 0, "durationMs": 0.0, "documents": 0, "maxCommands": 0,
+            })
+            route["requests"] += 1
+            route["commands"] += stats.commands
+            route["durationMs"] += stats.duration_ms
+            route["documents"] += stats.documents
+            route["maxCommands"] = max(route["maxCommands"], stats.commands)
+            for capture in self._captures:
+                capture.append(stats)
+
+    def snapshot(self) -> Dict[str, dict]:
+        with self._lock:
+            return {
+                route: {
+                    **values,
+                    "durationMs": round(values["durationMs"], 3),
+                    "avgCommands": round(values["commands"] / values["requests"], 2),
+                }
+                for route, values in sorted(self._routes.items())
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._routes.clear()
+
+    @contextmanager
+    def capture(self):
+        """Collects the stats of every request completed inside the block (across threads)."""
+        captured: List[RequestQueryStats] = []
+        with self._lock:
+            self._captures.append(captured)
+        try:
+            yield captured
+        finally:
+            with self._lock:
+                self._captures.remove(captured)
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+@contextmanager
+def query_budget(max_commands: int, route: Optional[str] = None):
+    """
+    Test helper: fails when a request made inside the block issues more database commands
+    than allowed, e.g.
+
+        with query_budget(3, route="POST /api/posts/{postId}/like"):
+            client.post(f"/api/posts/{post_id}/like", headers=headers)
+    """
+    with route_query_metrics.capture() as captured:
+        yield captured
+
+    checked = [stats for stats in captured if route is None or stats.route == route]
+    if route is not None and not checked:
+        raise QueryBudgetExceeded(f"No request to {route} was made inside the budget block.")
+    for stats in checked:
+        if stats.commands > max_commands:
+            raise QueryBudgetExceeded(
+                f"{stats.route} issued {stats.commands} database commands (budget {max_commands}): {stats.by_command}"
+            )
+
+
+# Endpoint -> route path template, filled lazily
+_route_paths: Dict[object, str] = {}
+
+
+def route_path(scope: dict) -> str:
+    """Path template ("/api/posts/{postId}/like") of the route that served a request; unmatched paths share one label."""
+    endpoint = scope.get("endpoint")
+    if endpoint is None:
+        return "<unmatched>"
+    path = _route_paths.get(endpoint)
+    if path is None:
+        path = "<unmatched>"
+        for route in scope["app"].routes:
+            if getattr(route, "endpoint", None) is endpoint:
+                path = route.path
+                break
+            if getattr(route, "app", None) is endpoint:  # Mounted apps (static files)
+                path = route.path + "/{path}"
+                break
+        _route_paths[endpoint] = path
+    return path
+
+
+def route_template(scope: dict) -> str:
+    """Method and path template of a request, e.g. "POST /api/posts/{postId}/like"."""
+    return f"{scope.get('method', '')} {route_path(scope)}"
+
+
+class QueryStatsMiddleware:
+    """
+    ASGI middleware that opens a stats scope per request, aggregates it per route and,
+    when QUERY_STATS_HEADERS is enabled, reports it in X-DB-* response headers.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestQueryStats()
+        token = _current.set(stats)
+
+        async def send_with_headers(message):
+            if message["type"] == "http.response.start" and settings.QUERY_STATS_HEADERS:
+                headers = list(message.get("headers", []))
+                headers += [
+                    (b"x-db-commands", str(stats.commands).encode()),
+                    (b"x-db-time-ms", f"{stats.duration_ms:.3f}".encode()),
+                    (b"x-db-documents", str(stats.documents).encode()),
+                ]
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_headers)
+        finally:
+            _current.reset(token)
+            stats.route = route_template(scope)
+            route_query_metrics.observe(stats)
+
+
+# Global listener (registered on the Motor client) and per-route aggregates
+query_stats_listener = QueryStatsListener()
+route_query_metrics = RouteQueryMetrics()
@@ -0,0 +1,160 @@
+import logging
+import math
+import time
+from collections import OrderedDict
+from typing import Tuple
+
+from fastapi import Depends, HTTPException, status
+from pymongo import ReturnDocument
+
+from app.core.config import settings
+from app.core.metrics import rate_limited_requests
+from app.core.security import get_current_user_id
+
+logger = logging.getLogger(__name__)
+
+
+def parse_limit(spec: str) -> Tuple[float, float]:
+    """Parses "<burst>/<seconds>" into (refill rate in tokens per second, burst size)."""
+    try:
+        burst, seconds = (float(part) for part in spec.split("/"))
+    except ValueError:
+        raise ValueError(f"Invalid rate limit {spec!r}, expected '<burst>/<seconds>'")
+    if burst < 1 or seconds <= 0:
+        raise ValueError(f"Invalid rate limit {spec!r}, burst must be >= 1 and seconds > 0")
+    return burst / seconds, burst
+
+
+# ==========================================
+# Bucket stores (where token counts live)
+# ==========================================
+class LocalBucketStore:
+    """
+    In-process token buckets: each worker limits on its own. A bucket is
+    [tokens, last refill, time it is full again]; full buckets are equivalent to
+    missing ones, so when the store reaches max_keys they are dropped, least recently
+    refilled first. A bucket below burst is never dropped (that would hand its user a
+    fresh burst), so under pressure the store may exceed max_keys instead.
+    """
+
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        # Least recently refilled first
+        self._buckets: OrderedDict[tuple, list] = OrderedDict()
+
+    def take(self, key: tuple, rate: float, burst: float, cost: float = 1.0) -> float:
+        """Takes `cost` tokens; returns 0 when allowed, else the seconds until enough tokens refill."""
+        now = time.monotonic()
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            if len(self._buckets) >= self.max_keys:
+                self._evict_full(now)
+            self._buckets[key] = [burst - cost, now, now + cost / rate]
+            return 0.0
+        self._buckets.move_to_end(key)
+        tokens = bucket[0] + (now - bucket[1]) * rate
+        if tokens > burst:
+            tokens = burst
+        bucket[1] = now
+        if tokens >= cost:
+            tokens -= cost
+            bucket[0] = tokens
+            bucket[2] = now + (burst - tokens) / rate
+            return 0.0
+        bucket[0] = tokens
+        return (cost - tokens) / rate
+
+    def _evict_full(self, now: float) -> None:
+        # The oldest refills are the first to be full again; stop at the first bucket still refilling
+        while self._buckets:
+            key, bucket = next(iter(self._buckets.items()))
+            if bucket[2] > now:
+                break
+            del self._buckets[key]
+
+    def reset(self) -> None:
+        self._buckets.clear()
+
+
+class MongoBucketStore:
+    """
+    Token buckets shared by all workers. Refill and take happen in one atomic
+    pipeline update on the server clock, so concurrent workers never double-spend.
+    Idle buckets expire through the TTL index on `updatedAt` (see create_indexes).
+    """
+
+    def __init__(self, db, collection: str = "rate_limits"):
+        self._db = db
+        self._collection = collection
+
+    async def take(self, key: tuple, rate: float, burst: float, cost: float = 1.0) -> float:
+        elapsed_seconds = {"$divide": [{"$subtract": ["$$NOW", {"$ifNull": ["$updatedAt", "$$NOW"]}]}, 1000]}
+        bucket = await self._db[self._collection].find_one_and_update(
+            {"_id": ":".join(key)},
+            [
+                {"$set": {
+                    "tokens": {"$min": [burst, {"$add": [{"$ifNull": ["$tokens", burst]}, {"$multiply": [elapsed_seconds, rate]}]}]},
+                    "updatedAt": "$$NOW",
+                }},
+                {"$set": {"allowed": {"$gte": ["$tokens", cost]}}},
+                {"$set": {"tokens": {"$cond": ["$allowed", {"$subtract": ["$tokens", cost]}, "$tokens"]}}},
+            ],
+            projection={"_id": 0, "tokens": 1, "allowed": 1},
+            upsert=True,
+            return_document=ReturnDocument.AFTER,
+        )
+        return 0.0 if bucket["allowed"] else (cost - bucket["tokens"]) / rate
+
+
+# ==========================================
+# Limiter
+# ==========================================
+class RateLimiter:
+    """Per-user token-bucket limits for named routes, configured by RATE_LIMITS."""
+
+    def __init__(self):
+        self.limits = {name: parse_limit(spec) for name, spec in settings.RATE_LIMITS.items()}
+        self.local = LocalBucketStore(settings.RATE_LIMIT_MAX_KEYS)
+        self.shared = None
+
+    def start(self, db) -> None:
+        self.shared = MongoBucketStore(db) if settings.RATE_LIMIT_BACKEND == "mongo" else None
+
+    async def retry_after(self, name: str, user_id: str) -> float:
+        """0 when the request may proceed, else seconds until it would be allowed."""
+        limit = self.limits.get(name)
+        if limit is None or not settings.RATE_LIMIT_ENABLED:
+            return 0.0
+        rate, burst = limit
+        if self.shared is None:
+            return self.local.take((name, user_id), rate, burst)
+        try:
+            return await self.shared.take((name, user_id), rate, burst)
+        except Exception as e:
+            # A limiter outage must not take the write paths down with it
+            logger.error(f"Shared rate limit store failed, allowing request: {e}")
+            return 0.0
+
+
+# Global limiter shared by all routers
+rate_limiter = RateLimiter()
+
+
+def rate_limit(name: str):
+    """
+    Builds a route dependency enforcing the RATE_LIMITS entry `name` per authenticated
+    user; over the limit it answers 429 with a Retry-After header. Routes may share a name
+    to share a bucket. Names missing from RATE_LIMITS are not limited.
+    """
+
+    async def dependency(current_user_id: str = Depends(get_current_user_id)) -> None:
+        wait = await rate_limiter.retry_after(name, current_user_id)
+        if wait > 0:
+            rate_limited_requests.inc(name)
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many requests. Please slow down.",
+                headers={"Retry-After": str(math.ceil(wait))}
+            )
+
+    return dependency
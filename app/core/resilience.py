@@ -0,0 +1,300 @@
+import asyncio
+import logging
+import math
+import random
+import time
+from typing import Awaitable, Callable, Dict, Optional
+
+import pymongo
+from fastapi import Request
+from fastapi.responses import JSONResponse
+from pymongo.errors import ConnectionFailure, ExecutionTimeout, PyMongoError
+
+from app.core.config import settings
+from app.core.metrics import (
+    mongo_breaker_state,
+    mongo_fast_failures,
+    mongo_pool_checked_out,
+    mongo_pool_checkout_failures,
+    mongo_pool_connections,
+    mongo_read_retries,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class DatabaseUnavailable(ConnectionFailure):
+    """Raised without contacting MongoDB while the circuit breaker is open."""
+
+    def __init__(self, retry_after: int):
+        super().__init__("MongoDB is unavailable (circuit breaker open).")
+        self.retry_after = retry_after
+
+
+def is_unhealthy(error: BaseException) -> bool:
+    """Errors that say the database is unreachable or too slow, as opposed to rejecting one request."""
+    return isinstance(error, (ConnectionFailure, ExecutionTimeout)) or getattr(error, "timeout", False)
+
+
+# ==========================================
+# Circuit breaker
+# ==========================================
+class CircuitBreaker:
+    """
+    Closed: operations run normally. After `failure_threshold` consecutive unhealthy
+    errors it opens, and operations fail at once with DatabaseUnavailable. After
+    `reset_seconds` it goes half-open and lets a single probe through; the probe's
+    outcome closes it again or reopens it for another period.
+    """
+
+    CLOSED, HALF_OPEN, OPEN = "closed", "half_open", "open"
+    _GAUGE = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+    def __init__(self, failure_threshold: int, reset_seconds: float):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probing = False
+
+    def _set_state(self, state: str) -> None:
+        if state != self.state:
+            logger.warning("MongoDB circuit breaker %s -> %s", self.state, state)
+            self.state = state
+            mongo_breaker_state.set(value=self._GAUGE[state])
+
+    def retry_after(self) -> int:
+        remaining = self.reset_seconds - (time.monotonic() - self.opened_at)
+        return max(1, math.ceil(remaining))
+
+    def acquire(self) -> bool:
+        """Admits one operation or raises DatabaseUnavailable; returns True when it is the half-open probe."""
+        if self.state == self.OPEN:
+            if time.monotonic() - self.opened_at < self.reset_seconds:
+                mongo_fast_failures.inc()
+                raise DatabaseUnavailable(self.retry_after())
+            self._set_state(self.HALF_OPEN)
+        if self.state == self.HALF_OPEN:
+            if self._probing:
+                mongo_fast_failures.inc()
+                raise DatabaseUnavailable(1)
+            self._probing = True
+            return True
+        return False
+
+    def release(self, probe: bool) -> None:
+        """Frees the probe slot of an operation that ended without a verdict (e.g. cancelled)."""
+        if probe:
+            self._probing = False
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self._probing = False
+        self._set_state(self.CLOSED)
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self._probing = False
+        if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+            self._set_state(self.OPEN)
+
+    def snapshot(self) -> dict:
+        return {
+            "state": self.state,
+            "consecutiveFailures": self.failures,
+            "retryAfterSeconds": self.retry_after() if self.state == self.OPEN else None,
+        }
+
+
+mongo_breaker = CircuitBreaker(settings.MONGO_BREAKER_FAILURE_THRESHOLD, settings.MONGO_BREAKER_RESET_SECONDS)
+
+
+async def guarded(
+    operation: str,
+    run: Callable[[int], Awaitable],
+    timeout_ms: int,
+    retries: int = 0,
+    breaker: CircuitBreaker = mongo_breaker,
+):
+    """
+    Runs `run(attempt)` under the breaker with a time budget (pymongo.timeout, which the
+    server also enforces through maxTimeMS). Unhealthy errors are retried up to `retries`
+    times with jittered exponential backoff, unless the error was the budget running out
+    or the breaker opened meanwhile. Other errors are the caller's, and count as a healthy
+    answer from the server.
+    """
+    probe = breaker.acquire()
+    attempt = 0
+    try:
+        while True:
+            try:
+                with pymongo.timeout(timeout_ms / 1000 if timeout_ms else None):
+                    result = await run(attempt)
+            except PyMongoError as e:
+                if not is_unhealthy(e):
+                    breaker.record_success()
+                    raise
+                breaker.record_failure()
+                if attempt >= retries or getattr(e, "timeout", False) or breaker.state != breaker.CLOSED:
+                    raise
+                attempt += 1
+                mongo_read_retries.inc(operation)
+                backoff = settings.MONGO_RETRY_BACKOFF_MS / 1000 * 2 ** (attempt - 1)
+                await asyncio.sleep(backoff * random.uniform(0.5, 1.5))
+                continue
+            breaker.record_success()
+            return result
+    finally:
+        breaker.release(probe)
+
+
+# ==========================================
+# Database / collection / cursor wrappers
+# ==========================================
+READ_METHODS = {"find_one", "count_documents", "estimated_document_count", "distinct"}
+WRITE_METHODS = {
+    "insert_one", "insert_many", "replace_one", "update_one", "update_many", "delete_one", "delete_many",
+    "find_one_and_update", "find_one_and_replace", "find_one_and_delete", "bulk_write",
+}
+
+
+class ResilientCursor:
+    """
+    Wraps a Motor cursor: to_list() runs guarded, re-creating the cursor for retries, and
+    `async for` iterates over a guarded to_list(). Chained calls (sort, limit, ...) apply to
+    the wrapped cursor and return the wrapper. Long scans, backfills and tailable cursors
+    opt out with stream().
+    """
+
+    def __init__(self, cursor, recreate: Optional[Callable[[], object]], operation: str):
+        self._cursor = cursor
+        self._recreate = recreate
+        self._operation = operation
+
+    def __getattr__(self, name):
+        attr = getattr(self._cursor, name)
+        if not callable(attr):
+            return attr
+
+        def call(*args, **kwargs):
+            result = attr(*args, **kwargs)
+            return self if result is self._cursor else result
+
+        return call
+
+    async def __aiter__(self):
+        # Results are buffered: the time budget cannot span the caller's work between documents
+        for doc in await self.to_list(None):
+            yield doc
+
+    def stream(self):
+        """The unguarded Motor cursor (no breaker, time budget or retries), streamed batch by batch."""
+        return self._cursor
+
+    async def to_list(self, length: Optional[int] = None) -> list:
+        async def run(attempt: int):
+            if attempt:
+                self._cursor = self._recreate()
+            return await self._cursor.to_list(length)
+
+        retries = settings.MONGO_READ_RETRIES if self._recreate is not None else 0
+        return await guarded(self._operation, run, settings.MONGO_READ_TIMEOUT_MS, retries)
+
+
+class ResilientCollection:
+    """A Motor collection whose reads and writes run guarded; everything else passes through."""
+
+    def __init__(self, collection):
+        self._collection = collection
+
+    def __getattr__(self, name):
+        attr = getattr(self._collection, name)
+        if name in READ_METHODS:
+            async def read(*args, **kwargs):
+                retries = 0 if "session" in kwargs else settings.MONGO_READ_RETRIES
+                return await guarded(name, lambda attempt: attr(*args, **kwargs), settings.MONGO_READ_TIMEOUT_MS, retries)
+            return read
+        if name in WRITE_METHODS:
+            # Not retried here: pymongo already retries retryable writes once
+            async def write(*args, **kwargs):
+                return await guarded(name, lambda attempt: attr(*args, **kwargs), settings.MONGO_WRITE_TIMEOUT_MS)
+            return write
+        return attr
+
+    def find(self, *args, **kwargs) -> ResilientCursor:
+        cursor = self._collection.find(*args, **kwargs)
+        return ResilientCursor(cursor, cursor.clone, "find")
+
+    def aggregate(self, pipeline, *args, **kwargs) -> ResilientCursor:
+        cursor = self._collection.aggregate(pipeline, *args, **kwargs)
+        # Pipelines that write ($out / $merge) are not idempotent
+        writes = any("$out" in stage or "$merge" in stage for stage in pipeline)
+        recreate = None if writes or "session" in kwargs else (lambda: self._collection.aggregate(pipeline, *args, **kwargs))
+        return ResilientCursor(cursor, recreate, "aggregate")
+
+
+class ResilientDatabase:
+    """
+    The handle stored in db_instance.db: `db[name]` returns guarded collections, other
+    attributes (command, create_collection, client, ...) are the Motor database's own.
+    """
+
+    def __init__(self, database):
+        self._database = database
+        self._collections: Dict[str, ResilientCollection] = {}
+
+    def __getitem__(self, name: str) -> ResilientCollection:
+        collection = self._collections.get(name)
+        if collection is None:
+            collection = self._collections[name] = ResilientCollection(self._database[name])
+        return collection
+
+    def get_collection(self, name: str, **options) -> ResilientCollection:
+        if options:
+            return ResilientCollection(self._database.get_collection(name, **options))
+        return self[name]
+
+    def __getattr__(self, name):
+        return getattr(self._database, name)
+
+    async def ping(self) -> float:
+        """Round trip in seconds, within MONGO_HEALTH_TIMEOUT_MS; a success closes a half-open breaker."""
+        start = time.perf_counter()
+        await guarded("ping", lambda attempt: self._database.command("ping"), settings.MONGO_HEALTH_TIMEOUT_MS)
+        return time.perf_counter() - start
+
+
+# ==========================================
+# Reporting
+# ==========================================
+def pool_state() -> dict:
+    """Connections per server of this worker's pool, from the pool listener gauges."""
+    checked_out = mongo_pool_checked_out.values()
+    failures: Dict[str, float] = {}
+    for (address, _reason), count in mongo_pool_checkout_failures.values().items():
+        failures[address] = failures.get(address, 0) + count
+    return {
+        "maxPoolSize": settings.MONGO_MAX_POOL_SIZE,
+        "minPoolSize": settings.MONGO_MIN_POOL_SIZE,
+        "servers": {
+            address: {
+                "open": int(count),
+                "checkedOut": int(checked_out.get((address,), 0)),
+                "checkoutFailures": int(failures.get(address, 0)),
+            }
+            for (address,), count in mongo_pool_connections.values().items()
+        },
+    }
+
+
+async def database_unavailable_handler(request: Request, exc: Exception) -> JSONResponse:
+    """Connection failures, timeouts and an open breaker are a temporary outage: 503, not 500."""
+    retry_after = exc.retry_after if isinstance(exc, DatabaseUnavailable) else 1
+    logger.warning(f"Database unavailable for {request.method} {request.url.path}: {exc}")
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Database temporarily unavailable. Please retry shortly."},
+        headers={"Retry-After": str(retry_after)},
+    )
@@ -1,9 +1,14 @@
+import asyncio
+import secrets
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, Optional, TypeVar
 import jwt
 from passlib.context import CryptContext
 from app.core.config import settings
-from fastapi import Security, HTTPException, status
+from app.core.metrics import bcrypt_active, bcrypt_queue_depth, bcrypt_seconds
+from fastapi import Depends, Header, Security, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 
 # Initialize the password hashing context using the bcrypt algorithm
@@ -22,6 +27,33 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
     return pwd_context.verify(plain_password, hashed_password)
 
+T = TypeVar("T")
+
+# bcrypt is deliberately slow; running it on a small dedicated pool keeps it off the event
+# loop and away from the default executor that Motor uses for database calls
+_bcrypt_executor = ThreadPoolExecutor(max_workers=settings.BCRYPT_WORKERS, thread_name_prefix="bcrypt")
+
+async def run_in_bcrypt_pool(fn: Callable[..., T], *args: Any) -> T:
+    """
+    Runs hash_password / verify_password on the bcrypt pool, tracking queue depth,
+    running jobs and total latency for the /metrics endpoint.
+    """
+    submitted = time.perf_counter()
+    bcrypt_queue_depth.inc()
+
+    def job():
+        bcrypt_queue_depth.dec()
+        bcrypt_active.inc()
+        try:
+            return fn(*args)
+        finally:
+            bcrypt_active.dec()
+
+    try:
+        return await asyncio.get_running_loop().run_in_executor(_bcrypt_executor, job)
+    finally:
+        bcrypt_seconds.observe(time.perf_counter() - submitted)
+
 def create_access_token(subject: Dict[str, Any], expires_delta: Optional[timedelta] = None) -> str:
     """
     Creates a short-lived JSON Web Token (JWT) for user authentication.
@@ -75,10 +107,10 @@ def decode_token(token: str) -> Optional[Dict[str, Any]]:
 # ==========================================
 security_bearer = HTTPBearer()
 
-def get_current_user_id(credentials: HTTPAuthorizationCredentials = Security(security_bearer)) -> str:
+def get_token_payload(credentials: HTTPAuthorizationCredentials = Security(security_bearer)) -> Dict[str, Any]:
     """
     Extracts and verifies the JWT token from the Authorization header.
-    Returns the user ID (subject) if valid, otherwise raises a 401 Unauthorized error.
+    Returns its payload if valid and it names a subject, otherwise raises a 401 Unauthorized error.
     """
     token = credentials.credentials
     payload = decode_token(token)
@@ -89,11 +121,41 @@ def get_current_user_id(credentials: HTTPAuthorizationCredentials = Security(sec
             detail="Invalid or expired authentication token. Please log in again."
         )
         
-    user_id = payload.get("sub")
-    if not user_id:
+    if not payload.get("sub"):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Token payload invalid. Missing subject."
         )
         
-    return user_id
\ No newline at end of file
+    return payload
+
+def get_current_user_id(payload: Dict[str, Any] = Depends(get_token_payload)) -> str:
+    """
+    Returns the user ID (subject) of the verified token.
+    """
+    return payload["sub"]
+
+def get_current_user(payload: Dict[str, Any] = Depends(get_token_payload)) -> Dict[str, str]:
+    """
+    Same checks as get_current_user_id, but also returns the account role
+    ("school" or "donor") for routes that act on either kind of account.
+    """
+    role = payload.get("role")
+    if role not in ("school", "donor"):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token payload invalid. Missing role."
+        )
+
+    return {"id": payload["sub"], "role": role}
+
+def require_admin_code(x_admin_code: Optional[str] = Header(None, alias="X-Admin-Code")) -> None:
+    """
+    Guards operational endpoints (diagnostics, profiling) with the shared admin secret
+    sent in the X-Admin-Code header.
+    """
+    if not x_admin_code or not secrets.compare_digest(x_admin_code, settings.ADMIN_SECRET_CODE):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="A valid admin code is required."
+        )
@@ -0,0 +1,53 @@
+import logging
+import time
+from contextlib import contextmanager
+from typing import Dict
+
+logger = logging.getLogger(__name__)
+
+
+class StartupTimer:
+    """
+    Wall time of each startup phase (imports, settings, MongoDB connect, index checks,
+    cache warm-up, ...), logged as one line when the app is ready to serve and available
+    at GET /api/diagnostics/startup. Imported by app.core.config, so it must not import
+    anything from the app itself.
+    """
+
+    def __init__(self):
+        self.phases: Dict[str, float] = {}
+        self.ready_seconds = None
+
+    @contextmanager
+    def phase(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def record(self, name: str, seconds: float) -> None:
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    def seconds(self, name: str) -> float:
+        return self.phases.get(name, 0.0)
+
+    def ready(self) -> None:
+        """Marks the end of the blocking startup and logs the report."""
+        self.ready_seconds = sum(self.phases.values())
+        logger.info(
+            "Startup finished in %.0f ms (%s)",
+            self.ready_seconds * 1000,
+            ", ".join(f"{name} {seconds * 1000:.0f} ms" for name, seconds in self.phases.items()),
+        )
+
+    def snapshot(self) -> dict:
+        return {
+            "phasesMs": {name: round(seconds * 1000, 1) for name, seconds in self.phases.items()},
+            # Phases recorded after this point (background warm-ups) did not delay startup
+            "readyMs": round(self.ready_seconds * 1000, 1) if self.ready_seconds is not None else None,
+        }
+
+
+# Global timer, filled in by config (settings), main (imports, lifespan) and the background warm-ups
+startup_timer = StartupTimer()
@@ -0,0 +1,6 @@
+from pydantic import BaseModel, Field
+from typing import Optional
+
+class ProfilerToggle(BaseModel):
+    enabled: bool
+    sampleRate: Optional[float] = Field(None, ge=0.0, le=1.0, description="Fraction of requests to profile")
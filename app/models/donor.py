@@ -11,6 +11,7 @@ from pydantic import BaseModel, ConfigDict, EmailStr, Field, field_validator
 class Achievement(BaseModel):
     model_config = ConfigDict(extra="forbid", str_strip_whitespace=True)
 
+    id: Optional[str] = Field(default=None, max_length=32)
     title: str = Field(..., min_length=1, max_length=120)
     description: str = Field(default="", max_length=500)
     icon_url: str = Field(default="", max_length=500)
@@ -77,6 +78,41 @@ class DonorProfileResponse(BaseModel):
     profile_image_url: Optional[str] = ""
 
 
+# Stored fields behind each DonorProfileResponse field (see app.utils.projection)
+DONOR_PROFILE_SOURCES = {
+    "id": ("_id",),
+    "username": ("username",),
+    "name": ("name",),
+    "about": ("about",),
+    "followers_count": ("followers_count",),
+    "following_count": ("following_count",),
+    "beneficiaries_count": ("beneficiaries_count",),
+    "total_amount_donated": ("total_amount_donated",),
+    "donor_class": ("donor_class",),
+    "donor_rank": ("donor_rank",),
+    "achievements": ("achievements",),
+    "profile_image_url": ("profile_image_url",),
+}
+
+
+def serialize_donor_profile(user: dict) -> dict:
+    """Maps a stored donor document to the DonorProfileResponse fields."""
+    return {
+        "id": str(user["_id"]),
+        "username": user.get("username", ""),
+        "name": user.get("name", ""),
+        "about": user.get("about", ""),
+        "followers_count": user.get("followers_count", 0),
+        "following_count": user.get("following_count", 0),
+        "beneficiaries_count": user.get("beneficiaries_count", 0),
+        "total_amount_donated": user.get("total_amount_donated", 0.0),
+        "donor_class": user.get("donor_class", ""),
+        "donor_rank": user.get("donor_rank", 0),
+        "achievements": user.get("achievements", []),
+        "profile_image_url": user.get("profile_image_url", ""),
+    }
+
+
 class DonorUpdateProfile(BaseModel):
     model_config = ConfigDict(extra="forbid", str_strip_whitespace=True)
 
@@ -91,6 +127,33 @@ class AchievementPatch(BaseModel):
     achievements: list[Achievement] = Field(default_factory=list)
 
 
+class AchievementCreate(BaseModel):
+    model_config = ConfigDict(extra="forbid", str_strip_whitespace=True)
+
+    title: str = Field(..., min_length=1, max_length=120)
+    description: str = Field(default="", max_length=500)
+    icon_url: str = Field(default="", max_length=500)
+    date_earned: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+
+class AchievementUpdate(BaseModel):
+    model_config = ConfigDict(extra="forbid", str_strip_whitespace=True)
+
+    title: Optional[str] = Field(None, min_length=1, max_length=120)
+    description: Optional[str] = Field(None, max_length=500)
+    icon_url: Optional[str] = Field(None, max_length=500)
+    date_earned: Optional[datetime] = None
+
+
+class AchievementPageResponse(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    achievements: list[Achievement] = Field(default_factory=list)
+    total: int = Field(default=0, ge=0)
+    page: int = Field(default=1, ge=1)
+    limit: int = Field(default=10, ge=1)
+
+
 class DeactivateAccountRequest(BaseModel):
     model_config = ConfigDict(extra="forbid", str_strip_whitespace=True)
 
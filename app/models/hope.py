@@ -27,3 +27,32 @@ class HopeResponse(BaseModel):
     grade_requirement: Optional[str] = None
     students: List[str] = Field(default_factory=list)
     created_at: datetime
+
+def serialize_hope(hope: dict) -> dict:
+    """Maps a stored hope document to the HopeResponse fields."""
+    return {
+        "id": str(hope["_id"]),
+        "name": hope.get("name", ""),
+        "details": hope.get("details", ""),
+        "type_of_donation": hope.get("type_of_donation", ""),
+        "support_field": hope.get("fields", ""),
+        "amount": hope.get("amount", 0.0),
+        "grade_requirement": hope.get("grade_requirement"),
+        "students": hope.get("students", []),
+        "created_at": hope.get("created_at"),
+    }
+
+# Stored fields behind each HopeResponse key (see app.utils.projection); created_at has
+# no default in the model, so it is always read
+HOPE_SOURCES = {
+    "id": ("_id",),
+    "name": ("name",),
+    "details": ("details",),
+    "type_of_donation": ("type_of_donation",),
+    "fields": ("fields",),
+    "amount": ("amount",),
+    "grade_requirement": ("grade_requirement",),
+    "students": ("students",),
+    "created_at": ("created_at",),
+}
+HOPE_REQUIRED = ("created_at",)
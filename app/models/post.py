@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 
 # ==========================================
@@ -21,9 +21,102 @@ def format_time_custom(dt: datetime) -> str:
     """Formats time as HH:MM am/pm."""
     return dt.strftime("%I:%M %p").lower()
 
+def serialize_comment(comment: dict) -> dict:
+    """Maps a stored comment (or an embedded preview comment) to the API shape."""
+    return {
+        "commentId": str(comment["_id"]),
+        "userId": comment["userId"],
+        "username": comment.get("username", ""),
+        "userProfilePic": comment.get("userProfilePic", ""),
+        "text": comment["text"],
+        "parentId": comment.get("parentId"),
+        "depth": comment.get("depth", 0),
+        "repliesCount": comment.get("repliesCount", 0),
+        "createdAtDate": format_date_custom(comment["createdAt"]),
+        "createdAtTime": format_time_custom(comment["createdAt"])
+    }
+
+def serialize_post(post: dict, is_liked: bool = False, is_saved: bool = False) -> dict:
+    """Maps a stored post document to the PostResponse shape used by all feeds."""
+    return {
+        "postId": str(post["_id"]),
+        "schoolId": post["schoolId"],
+        "authorName": post.get("authorName", ""),
+        "authorUsername": post.get("authorUsername", ""),
+        "authorProfilePic": post.get("authorProfilePic", ""),
+        "isVerified": post.get("isVerified", False),
+        "content": post.get("content", ""),
+        "imageUrl": post.get("imageUrl", ""),
+        "likesCount": post.get("likesCount", 0),
+        "commentsCount": post.get("commentsCount", 0),
+        "sharesCount": post.get("sharesCount", 0),
+        "viewsCount": post.get("viewsCount", 0),
+        "formattedViews": format_number(post.get("viewsCount", 0)),
+        "formattedLikes": format_number(post.get("likesCount", 0)),
+        "isLikedByMe": is_liked,
+        "isSavedByMe": is_saved,
+        "isEdited": post.get("isEdited", False),
+        "previewComments": [serialize_comment(c) for c in post.get("previewComments", [])],
+        "createdAtDate": format_date_custom(post["createdAt"]),
+        "createdAtTime": format_time_custom(post["createdAt"])
+    }
+
+# Stored fields each response field is built from; routes project only what the
+# requested fields need (see app.utils.projection). The serializers always read the
+# *_REQUIRED fields, so those stay in every projection.
+COMMENT_SOURCES = {
+    "commentId": ("_id",),
+    "userId": ("userId",),
+    "username": ("username",),
+    "userProfilePic": ("userProfilePic",),
+    "text": ("text",),
+    "parentId": ("parentId",),
+    "depth": ("depth",),
+    "repliesCount": ("repliesCount",),
+    "createdAtDate": ("createdAt",),
+    "createdAtTime": ("createdAt",),
+}
+COMMENT_REQUIRED = ("_id", "userId", "text", "createdAt")
+
+POST_SOURCES = {
+    "postId": ("_id",),
+    "schoolId": ("schoolId",),
+    "authorName": ("authorName",),
+    "authorUsername": ("authorUsername",),
+    "authorProfilePic": ("authorProfilePic",),
+    "isVerified": ("isVerified",),
+    "content": ("content",),
+    "imageUrl": ("imageUrl",),
+    "likesCount": ("likesCount",),
+    "commentsCount": ("commentsCount",),
+    "sharesCount": ("sharesCount",),
+    "viewsCount": ("viewsCount",),
+    "formattedViews": ("viewsCount",),
+    "formattedLikes": ("likesCount",),
+    "isLikedByMe": (),
+    "isSavedByMe": (),
+    "isEdited": ("isEdited",),
+    "previewComments": ("previewComments",),
+    "createdAtDate": ("createdAt",),
+    "createdAtTime": ("createdAt",),
+}
+POST_REQUIRED = ("_id", "schoolId", "createdAt")
+
 # ==========================================
 # 1. POST RESPONSE MODEL (Scalable Architecture)
 # ==========================================
+class CommentResponse(BaseModel):
+    commentId: str
+    userId: str
+    username: str = ""
+    userProfilePic: str = ""
+    text: str
+    parentId: Optional[str] = None
+    depth: int = 0
+    repliesCount: int = 0
+    createdAtDate: str
+    createdAtTime: str
+
 class PostResponse(BaseModel):
     postId: str
     schoolId: str
@@ -53,6 +146,9 @@ class PostResponse(BaseModel):
     isSavedByMe: bool = False
     isEdited: bool = False
     
+    # Latest few comments embedded in the post so feed cards need no extra request
+    previewComments: List[CommentResponse] = Field(default_factory=list)
+    
     # Timestamps
     createdAtDate: str
     createdAtTime: str
@@ -20,6 +20,7 @@ class SchoolStats(BaseModel):
     followers: int = Field(default=0, ge=0)
     students: int = Field(default=0, ge=0)
     followings: int = Field(default=0, ge=0)
+    posts: int = Field(default=0, ge=0)
 
 class SchoolDetails(BaseModel):
     rank: int = Field(default=0, ge=0)
@@ -175,6 +176,69 @@ class SchoolProfileResponse(BaseModel):
     labs: list[str] = Field(default_factory=list)
     location: str
 
+# Stored fields behind each SchoolProfileResponse field (see app.utils.projection);
+# credentials and signup-only fields are never read for the profile
+SCHOOL_PROFILE_SOURCES = {
+    "schoolId": ("_id",),
+    "username": ("username",),
+    "instituteName": ("instituteName",),
+    "name": ("name",),
+    "email": ("email",),
+    "phone": ("phone",),
+    "cnic": ("cnic",),
+    "gender": ("gender",),
+    "bio": ("bio",),
+    "profilePicture": ("profilePicture",),
+    "badge": ("badge",),
+    "stats": ("stats",),
+    "details": ("details",),
+    "facilities": ("facilities",),
+    "labs": ("labs",),
+    "location": ("locationName",),
+}
+
+def serialize_school_profile(school: dict) -> dict:
+    """Maps a stored school document to the SchoolProfileResponse fields (missing fields take defaults)."""
+    return dict(
+        schoolId=str(school["_id"]),
+        username=school.get("username", ""),
+        instituteName=school.get("instituteName", ""),
+        name=school.get("name", ""),
+        email=school.get("email", ""),
+        phone=school.get("phone", ""),
+        cnic=school.get("cnic", ""),
+        gender=school.get("gender", ""),
+        bio=school.get("bio", ""),
+        profilePicture=school.get("profilePicture", ""),
+        badge=school.get("badge", False),
+        stats=school.get("stats", {}),
+        details=school.get("details", {}),
+        facilities=school.get("facilities", []),
+        labs=school.get("labs", []),
+        location=school.get("locationName", "") # Map locationName to location for frontend
+    )
+
+# Public school profile for bulk reads (delta sync): the profile without contact details and CNIC
+class SchoolPublicProfileResponse(BaseModel):
+    schoolId: str
+    username: str
+    instituteName: str
+    name: str
+    gender: str
+    bio: str = ""
+    profilePicture: str = ""
+    badge: bool = False
+    stats: SchoolStats
+    details: SchoolDetails
+    facilities: list[str] = Field(default_factory=list)
+    labs: list[str] = Field(default_factory=list)
+    location: str
+
+SCHOOL_PRIVATE_FIELDS = ("email", "phone", "cnic")
+SCHOOL_PUBLIC_PROFILE_SOURCES = {
+    field: sources for field, sources in SCHOOL_PROFILE_SOURCES.items() if field not in SCHOOL_PRIVATE_FIELDS
+}
+
 # 4. EDIT PROFILE API MODEL (Form Data Validation)
 class SchoolProfileUpdate(BaseModel):
     name: str
@@ -0,0 +1,56 @@
+from typing import Literal, Optional
+from fastapi import APIRouter, HTTPException, status
+
+from app.core.database import db_instance
+from app.core.metrics import cache_requests
+from app.utils.availability import availability_index, ACCOUNT_COLLECTIONS
+
+router = APIRouter(prefix="/api/availability", tags=["Availability"])
+
+# 1. GET /api/availability (Live "username / email taken?" check)
+@router.get("/", status_code=status.HTTP_200_OK)
+async def check_availability(
+    accountType: Literal["donor", "school"],
+    username: Optional[str] = None,
+    email: Optional[str] = None,
+):
+    """
+    Checks whether a username and/or email is still free for signup.
+    Values the in-memory filter rules out are answered without touching the database;
+    only filter-positive values are confirmed with an indexed lookup.
+    """
+    if not username and not email:
+        raise HTTPException(status_code=400, detail="Provide a username or an email to check.")
+
+    db = db_instance.db
+    if db is None:
+        raise HTTPException(status_code=500, detail="Database connection failed.")
+
+    results = {}
+    for field, value in (("username", username), ("email", email)):
+        if not value:
+            continue
+        value = value.strip().lower()
+
+        if not availability_index.might_be_taken(accountType, field, value):
+            cache_requests.inc("availability_filter", "hit")
+            results[field] = {"value": value, "available": True, "checkedBy": "filter"}
+            continue
+        cache_requests.inc("availability_filter", "miss")
+
+        existing = await db[ACCOUNT_COLLECTIONS[accountType]].find_one({field: value}, {"_id": 1})
+        results[field] = {"value": value, "available": existing is None, "checkedBy": "database"}
+
+    return {
+        "success": True,
+        "data": results
+    }
+
+# 2. GET /api/availability/stats (Filter memory footprint)
+@router.get("/stats", status_code=status.HTTP_200_OK)
+async def get_availability_stats():
+    """Reports the size, fill level and memory footprint of the availability filters."""
+    return {
+        "success": True,
+        "data": availability_index.stats()
+    }
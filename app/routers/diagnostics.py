@@ -0,0 +1,105 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import FileResponse
+
+from app.core.admission import admission_controller
+from app.core.profiler import list_profiles, profile_path, request_profiler
+from app.core.query_plans import query_plan_checker
+from app.core.query_stats import route_query_metrics
+from app.core.security import require_admin_code
+from app.core.startup import startup_timer
+from app.models.diagnostics import ProfilerToggle
+
+router = APIRouter(prefix="/api/diagnostics", tags=["Diagnostics"], dependencies=[Depends(require_admin_code)])
+
+# 1. GET /api/diagnostics/query-stats (Database work per route)
+@router.get("/query-stats", status_code=status.HTTP_200_OK)
+async def get_query_stats():
+    """
+    Aggregated database commands, time and documents per route since startup (or the last reset),
+    collected by the pymongo command listener.
+    """
+    return {
+        "success": True,
+        "data": route_query_metrics.snapshot()
+    }
+
+# 2. DELETE /api/diagnostics/query-stats (Reset the aggregates)
+@router.delete("/query-stats", status_code=status.HTTP_200_OK)
+async def reset_query_stats():
+    route_query_metrics.reset()
+    return {"success": True, "message": "Query stats reset."}
+
+# 3. GET /api/diagnostics/query-plans (Query shapes and winning plans per route)
+@router.get("/query-plans", status_code=status.HTTP_200_OK)
+async def get_query_plans():
+    """
+    Report of the collection-scan detector (QUERY_PLAN_CHECK=log|raise): every distinct query
+    shape per route with its winning plan stages and collection-scan / in-memory-sort flags.
+    """
+    return {
+        "success": True,
+        "data": query_plan_checker.report()
+    }
+
+# 4. DELETE /api/diagnostics/query-plans (Forget explained shapes)
+@router.delete("/query-plans", status_code=status.HTTP_200_OK)
+async def reset_query_plans():
+    query_plan_checker.reset()
+    return {"success": True, "message": "Query plan report reset."}
+
+# 5. GET /api/diagnostics/profiler (Profiler state)
+@router.get("/profiler", status_code=status.HTTP_200_OK)
+async def get_profiler():
+    return {
+        "success": True,
+        "data": {"enabled": request_profiler.enabled, "sampleRate": request_profiler.sample_rate}
+    }
+
+# 6. PUT /api/diagnostics/profiler (Turn request sampling on or off)
+@router.put("/profiler", status_code=status.HTTP_200_OK)
+async def toggle_profiler(toggle: ProfilerToggle):
+    """
+    Starts or stops profiling a random fraction of requests in this worker.
+    Each profiled request is written as a collapsed-stack file (see GET /profiles).
+    """
+    request_profiler.enabled = toggle.enabled
+    if toggle.sampleRate is not None:
+        request_profiler.sample_rate = toggle.sampleRate
+    return {
+        "success": True,
+        "message": "Profiler enabled." if toggle.enabled else "Profiler disabled.",
+        "data": {"enabled": request_profiler.enabled, "sampleRate": request_profiler.sample_rate}
+    }
+
+# 7. GET /api/diagnostics/profiles (Stored profiles, newest first)
+@router.get("/profiles", status_code=status.HTTP_200_OK)
+async def get_profiles():
+    return {
+        "success": True,
+        "data": list_profiles()
+    }
+
+# 8. GET /api/diagnostics/profiles/{name} (Download a profile)
+@router.get("/profiles/{name}")
+async def download_profile(name: str):
+    """Collapsed stacks ("frame;frame;frame count"), ready for flamegraph.pl or speedscope."""
+    path = profile_path(name)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Profile not found.")
+    return FileResponse(path, media_type="text/plain", filename=name)
+
+# 9. GET /api/diagnostics/admission (Slots, queues and service times per request class)
+@router.get("/admission", status_code=status.HTTP_200_OK)
+async def get_admission_state():
+    return {
+        "success": True,
+        "data": admission_controller.snapshot()
+    }
+
+# 10. GET /api/diagnostics/startup (Duration of each startup phase)
+@router.get("/startup", status_code=status.HTTP_200_OK)
+async def get_startup_report():
+    return {
+        "success": True,
+        "data": startup_timer.snapshot()
+    }
@@ -1,16 +1,29 @@
+import uuid
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from app.models.donor import (
     DonorSignup,
     DonorProfileResponse,
     DonorUpdateProfile,
     AchievementPatch,
+    AchievementCreate,
+    AchievementUpdate,
+    AchievementPageResponse,
     DeactivateAccountRequest,
     DeleteAccountRequest,
+    DONOR_PROFILE_SOURCES,
+    serialize_donor_profile,
 )
 from app.core.database import db_instance
-from app.core.security import hash_password, create_access_token, decode_token
+from app.core.config import settings
+from app.core.security import hash_password, run_in_bcrypt_pool, create_access_token, decode_token
+from app.utils.achievements import assign_achievement_ids
+from app.utils.availability import availability_index
+from app.utils.fast_response import json_list_response, json_object_response
+from app.utils.projection import FieldSelection, sparse_fields
+from app.utils.etag import bump_version, make_etag, not_modified, set_etag
+from app.utils.sync import write_tombstone
 from datetime import datetime, timezone
 from pymongo.errors import DuplicateKeyError
 
@@ -44,12 +57,12 @@ async def signup_donor(donor: DonorSignup):
 
     existing_user = await db["donors"].find_one({
         "$or": [{"email": donor.email}, {"username": donor.username}]
-    })
+    }, {"_id": 1})
     
     if existing_user:
         raise HTTPException(status_code=400, detail="User with this email or username already exists.")
 
-    hashed_pw = hash_password(donor.password)
+    hashed_pw = await run_in_bcrypt_pool(hash_password, donor.password)
     donor_dict = donor.model_dump()
     donor_dict["password"] = hashed_pw
     
@@ -67,14 +80,18 @@ async def signup_donor(donor: DonorSignup):
         "deactivation_reason": None,
         "deleted_at": None,
         "deletion_reason": None,
+        "version": 1,
         "created_at": datetime.now(timezone.utc)
     })
+    donor_dict["updatedAt"] = donor_dict["created_at"]
 
     try:
         result = await db["donors"].insert_one(donor_dict)
     except DuplicateKeyError:
         raise HTTPException(status_code=400, detail="User with this email or username already exists.")
 
+    availability_index.register("donor", username=donor.username, email=donor.email)
+
     token = create_access_token(subject={"sub": donor.username, "role": "donor"})
 
     return {
@@ -85,30 +102,41 @@ async def signup_donor(donor: DonorSignup):
 
 # 2. GET /api/donors/{username}
 @router.get("/{username}", response_model=DonorProfileResponse)
-async def get_donor_profile(username: str):
+async def get_donor_profile(
+    username: str,
+    request: Request,
+    response: Response,
+    selection: FieldSelection = Depends(sparse_fields(DONOR_PROFILE_SOURCES)),
+):
     db = db_instance.db
     if db is None:
         raise HTTPException(status_code=500, detail="Database connection failed")
 
-    user = await db["donors"].find_one({"username": username})
-    
+    # Revalidation only needs the version, covered by the (username, version) index
+    version_doc = await db["donors"].find_one({"username": username}, {"_id": 0, "version": 1})
+    if not version_doc:
+        raise HTTPException(status_code=404, detail="Donor not found")
+
+    etag = make_etag("donor", username, version_doc.get("version", 0), selection.etag_part())
+    cached = not_modified(request, etag)
+    if cached is not None:
+        return cached
+
+    # Only profile fields are projected: credentials and account state stay in the database
+    user = await db["donors"].find_one({"username": username}, selection.projection())
+
     if not user:
         raise HTTPException(status_code=404, detail="Donor not found")
-        
-    return {
-        "id": str(user["_id"]),
-        "username": user.get("username", ""),
-        "name": user.get("name", ""),
-        "about": user.get("about", ""),
-        "followers_count": user.get("followers_count", 0),
-        "following_count": user.get("following_count", 0),
-        "beneficiaries_count": user.get("beneficiaries_count", 0),
-        "total_amount_donated": user.get("total_amount_donated", 0),
-        "donor_class": user.get("donor_class", ""),
-        "donor_rank": user.get("donor_rank", 0),
-        "achievements": user.get("achievements", []),
-        "profile_image_url": user.get("profile_image_url", ""),
-    }
+
+    profile = serialize_donor_profile(user)
+
+    if selection.is_sparse:
+        sparse_response = json_object_response(DonorProfileResponse, profile, fields=selection.fields)
+        set_etag(sparse_response, etag)
+        return sparse_response
+
+    set_etag(response, etag)
+    return profile
 
 # 3. PATCH /api/donors/profile
 @router.patch("/profile")
@@ -128,7 +156,7 @@ async def update_donor_profile(
         
     result = await db["donors"].update_one(
         {"username": current_username},
-        {"$set": update_data}
+        bump_version({"$set": update_data})
     )
     
     if result.matched_count == 0:
@@ -146,11 +174,11 @@ async def update_donor_achievements(
     if db is None:
         raise HTTPException(status_code=500, detail="Database connection failed")
 
-    achievements_list = [ach.model_dump() for ach in achievements_data.achievements]
+    achievements_list = assign_achievement_ids(ach.model_dump() for ach in achievements_data.achievements)
     
     result = await db["donors"].update_one(
         {"username": current_username},
-        {"$set": {"achievements": achievements_list}}
+        bump_version({"$set": {"achievements": achievements_list[-settings.DONOR_ACHIEVEMENTS_MAX:]}})
     )
     
     if result.matched_count == 0:
@@ -160,34 +188,21 @@ async def update_donor_achievements(
 
 # 5. GET /api/donors (Get all donors list)
 @router.get("/", response_model=List[DonorProfileResponse])
-async def get_all_donors():
-    """Fetch a list of all donors in the system"""
+async def get_all_donors(selection: FieldSelection = Depends(sparse_fields(DONOR_PROFILE_SOURCES))):
+    """Fetch a list of all donors in the system (`?fields=` for a sparse fieldset)"""
     db = db_instance.db
     if db is None:
         raise HTTPException(status_code=500, detail="Database connection failed")
 
-    donors_list = []
-    cursor = db["donors"].find({})
-
-    async for user in cursor:
-        donors_list.append(
-            DonorProfileResponse(
-                id=str(user["_id"]),
-                username=user.get("username", ""),
-                name=user.get("name", ""),
-                about=user.get("about", ""),
-                followers_count=user.get("followers_count", 0),
-                following_count=user.get("following_count", 0),
-                beneficiaries_count=user.get("beneficiaries_count", 0),
-                total_amount_donated=user.get("total_amount_donated", 0.0),
-                donor_class=user.get("donor_class", ""),
-                donor_rank=user.get("donor_rank", 0),
-                achievements=user.get("achievements", []),
-                profile_image_url=user.get("profile_image_url", ""),
-            )
-        )
-
-    return donors_list
+    cursor = db["donors"].find({}, selection.projection())
+
+    # Rows are validated once and encoded in pydantic-core (see app.utils.fast_response)
+    donors_list = [
+        serialize_donor_profile(user)
+        async for user in cursor
+    ]
+
+    return json_list_response(DonorProfileResponse, donors_list, fields=selection.fields)
 
 
 # 6. POST /api/donors/account/deactivate
@@ -200,7 +215,7 @@ async def deactivate_donor_account(
     if db is None:
         raise HTTPException(status_code=500, detail="Database connection failed")
 
-    user = await db["donors"].find_one({"username": current_username})
+    user = await db["donors"].find_one({"username": current_username}, {"is_active": 1, "is_deleted": 1})
     if not user or user.get("is_deleted", False):
         raise HTTPException(status_code=404, detail="Donor not found")
 
@@ -209,13 +224,13 @@ async def deactivate_donor_account(
 
     result = await db["donors"].update_one(
         {"username": current_username},
-        {
+        bump_version({
             "$set": {
                 "is_active": False,
                 "deactivated_at": datetime.now(timezone.utc),
                 "deactivation_reason": payload.reason if payload else None,
             }
-        },
+        }),
     )
 
     if result.matched_count == 0:
@@ -233,7 +248,7 @@ async def activate_donor_account(
     if db is None:
         raise HTTPException(status_code=500, detail="Database connection failed")
 
-    user = await db["donors"].find_one({"username": current_username})
+    user = await db["donors"].find_one({"username": current_username}, {"is_active": 1, "is_deleted": 1})
     if not user or user.get("is_deleted", False):
         raise HTTPException(status_code=404, detail="Donor not found")
 
@@ -242,13 +257,13 @@ async def activate_donor_account(
 
     result = await db["donors"].update_one(
         {"username": current_username},
-        {
+        bump_version({
             "$set": {
                 "is_active": True,
                 "deactivated_at": None,
                 "deactivation_reason": None,
             }
-        },
+        }),
     )
 
     if result.matched_count == 0:
@@ -267,7 +282,7 @@ async def delete_donor_account(
     if db is None:
         raise HTTPException(status_code=500, detail="Database connection failed")
 
-    user = await db["donors"].find_one({"username": current_username})
+    user = await db["donors"].find_one({"username": current_username}, {"is_active": 1, "is_deleted": 1})
     if not user:
         raise HTTPException(status_code=404, detail="Donor not found")
 
@@ -276,17 +291,146 @@ async def delete_donor_account(
 
     result = await db["donors"].update_one(
         {"username": current_username},
-        {
+        bump_version({
             "$set": {
                 "is_deleted": True,
                 "is_active": False,
                 "deleted_at": datetime.now(timezone.utc),
                 "deletion_reason": payload.reason if payload else None,
             }
-        },
+        }),
     )
 
     if result.matched_count == 0:
         raise HTTPException(status_code=404, detail="Donor not found")
 
+    # Offline clients drop the profile on their next sync
+    await write_tombstone(db, "donors", user["_id"])
+
     return {"message": "Account deleted successfully"}
+
+
+
+# 9. POST /api/donors/achievements (Add a single achievement)
+@router.post("/achievements", status_code=status.HTTP_201_CREATED)
+async def add_donor_achievement(
+    achievement: AchievementCreate,
+    current_username: str = Depends(get_current_donor_username),
+):
+    """Appends one achievement with $push, trimming the oldest beyond the configured cap."""
+    db = db_instance.db
+    if db is None:
+        raise HTTPException(status_code=500, detail="Database connection failed")
+
+    achievement_doc = {"id": uuid.uuid4().hex, **achievement.model_dump()}
+
+    result = await db["donors"].update_one(
+        {"username": current_username},
+        bump_version({
+            "$push": {
+                "achievements": {
+                    "$each": [achievement_doc],
+                    "$slice": -settings.DONOR_ACHIEVEMENTS_MAX,
+                }
+            }
+        }),
+    )
+
+    if result.matched_count == 0:
+        raise HTTPException(status_code=404, detail="Donor not found")
+
+    return {"message": "Achievement added successfully", "achievement": achievement_doc}
+
+
+# 10. PATCH /api/donors/achievements/{achievement_id} (Update one achievement in place)
+@router.patch("/achievements/{achievement_id}")
+async def update_donor_achievement(
+    achievement_id: str,
+    achievement_data: AchievementUpdate,
+    current_username: str = Depends(get_current_donor_username),
+):
+    """Updates only the provided fields of one achievement using the positional operator."""
+    db = db_instance.db
+    if db is None:
+        raise HTTPException(status_code=500, detail="Database connection failed")
+
+    update_data = {
+        f"achievements.$.{k}": v
+        for k, v in achievement_data.model_dump().items()
+        if v is not None
+    }
+
+    if not update_data:
+        raise HTTPException(status_code=400, detail="No data provided to update")
+
+    result = await db["donors"].update_one(
+        {"username": current_username, "achievements.id": achievement_id},
+        bump_version({"$set": update_data}),
+    )
+
+    if result.matched_count == 0:
+        raise HTTPException(status_code=404, detail="Achievement not found")
+
+    return {"message": "Achievement updated successfully"}
+
+
+# 11. DELETE /api/donors/achievements/{achievement_id} (Remove one achievement)
+@router.delete("/achievements/{achievement_id}")
+async def delete_donor_achievement(
+    achievement_id: str,
+    current_username: str = Depends(get_current_donor_username),
+):
+    """Removes one achievement with $pull."""
+    db = db_instance.db
+    if db is None:
+        raise HTTPException(status_code=500, detail="Database connection failed")
+
+    result = await db["donors"].update_one(
+        {"username": current_username},
+        bump_version({"$pull": {"achievements": {"id": achievement_id}}}),
+    )
+
+    if result.matched_count == 0:
+        raise HTTPException(status_code=404, detail="Donor not found")
+    if result.modified_count == 0:
+        raise HTTPException(status_code=404, detail="Achievement not found")
+
+    return {"message": "Achievement deleted successfully"}
+
+
+# 12. GET /api/donors/{username}/achievements (Paginated achievements)
+@router.get("/{username}/achievements", response_model=AchievementPageResponse)
+async def get_donor_achievements(
+    username: str,
+    page: int = Query(1, ge=1),
+    limit: int = Query(10, ge=1, le=100),
+):
+    """Returns one page of a donor's achievements without loading the rest of the profile."""
+    db = db_instance.db
+    if db is None:
+        raise HTTPException(status_code=500, detail="Database connection failed")
+
+    skip = (page - 1) * limit
+
+    # Slice the array server-side so only the requested page crosses the wire
+    pipeline = [
+        {"$match": {"username": username}},
+        {
+            "$project": {
+                "_id": 0,
+                "total": {"$size": {"$ifNull": ["$achievements", []]}},
+                "achievements": {"$slice": [{"$ifNull": ["$achievements", []]}, skip, limit]},
+            }
+        },
+    ]
+    results = await db["donors"].aggregate(pipeline).to_list(length=1)
+
+    if not results:
+        raise HTTPException(status_code=404, detail="Donor not found")
+
+    return {
+        "achievements": results[0]["achievements"],
+        "total": results[0]["total"],
+        "page": page,
+        "limit": limit,
+    }
@@ -0,0 +1,43 @@
+import asyncio
+from fastapi import APIRouter, Depends, Request
+from fastapi.responses import StreamingResponse
+
+from app.core.config import settings
+from app.core.events import event_hub, format_sse
+from app.core.security import get_current_user_id
+
+router = APIRouter(prefix="/api/events", tags=["Live Updates"])
+
+# 1. GET /api/events/stream (Server-Sent Events)
+@router.get("/stream")
+async def stream_events(
+    request: Request,
+    current_user_id: str = Depends(get_current_user_id)
+):
+    """
+    Streams new posts (`post.created`) and counter changes (`post.counters`) as
+    Server-Sent Events. Counter changes are coalesced per post for a short window;
+    a `resync` event tells a client that fell behind to re-fetch its feed.
+    """
+    subscription = event_hub.subscribe()
+
+    async def event_stream():
+        try:
+            yield "retry: 3000\n\n"
+            while not await request.is_disconnected():
+                if not await subscription.wait(settings.EVENTS_HEARTBEAT_SECONDS):
+                    yield ": heartbeat\n\n"
+                    continue
+
+                # Let rapid counter changes pile up so they are sent as one update
+                await asyncio.sleep(settings.EVENTS_COALESCE_SECONDS)
+                for event in subscription.drain():
+                    yield format_sse(event)
+        finally:
+            event_hub.unsubscribe(subscription)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
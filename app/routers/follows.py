@@ -0,0 +1,132 @@
+from typing import Dict, Literal
+from fastapi import APIRouter, HTTPException, status, Depends
+from bson import ObjectId
+from bson.errors import InvalidId
+from datetime import datetime, timezone
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+from app.core.config import settings
+from app.core.database import db_instance
+from app.core.security import get_current_user
+from app.utils.timeline import backfill_timeline
+from app.utils.etag import bump_version
+
+router = APIRouter(prefix="/api/follows", tags=["Follows"])
+
+AccountType = Literal["school", "donor"]
+
+# Account type -> (collection, followers counter, following counter)
+ACCOUNT_COUNTERS = {
+    "school": ("schools", "stats.followers", "stats.followings"),
+    "donor": ("donors", "followers_count", "following_count"),
+}
+
+
+def account_filter(account_type: str, account_id: str) -> dict:
+    """Schools are addressed by their ObjectId, donors by their username."""
+    if account_type == "school":
+        try:
+            return {"_id": ObjectId(account_id)}
+        except InvalidId:
+            raise HTTPException(status_code=400, detail="Invalid School ID format.")
+    return {"username": account_id}
+
+
+# 1. POST /api/follows/{targetType}/{targetId} (Follow an account)
+@router.post("/{targetType}/{targetId}", status_code=status.HTTP_200_OK)
+async def follow_account(
+    targetType: AccountType,
+    targetId: str,
+    current_user: Dict[str, str] = Depends(get_current_user)
+):
+    """
+    Follows a school or donor and keeps both accounts' counters in sync with $inc.
+    Following a school also seeds the follower's home timeline with its recent posts.
+    """
+    if targetType == current_user["role"] and targetId == current_user["id"]:
+        raise HTTPException(status_code=400, detail="You cannot follow yourself.")
+
+    db = db_instance.db
+    if db is None:
+        raise HTTPException(status_code=500, detail="Database connection failed.")
+
+    target_collection, followers_field, _ = ACCOUNT_COUNTERS[targetType]
+    target = await db[target_collection].find_one(account_filter(targetType, targetId), {"fanoutOnRead": 1})
+    if not target:
+        raise HTTPException(status_code=404, detail="Account not found.")
+
+    # 1. Create the edge; the unique index makes repeated follows a no-op
+    try:
+        await db["follows"].insert_one({
+            "followerId": current_user["id"],
+            "followerType": current_user["role"],
+            "followeeId": targetId,
+            "followeeType": targetType,
+            "hub": target.get("fanoutOnRead", False),
+            "createdAt": datetime.now(timezone.utc)
+        })
+    except DuplicateKeyError:
+        return {"success": True, "message": "Already following."}
+
+    # 2. Maintain both counters
+    updated_target = await db[target_collection].find_one_and_update(
+        {"_id": target["_id"]},
+        bump_version({"$inc": {followers_field: 1}}),
+        projection={"stats.followers": 1, "followers_count": 1, "fanoutOnRead": 1},
+        return_document=ReturnDocument.AFTER
+    )
+    follower_collection, _, following_field = ACCOUNT_COUNTERS[current_user["role"]]
+    await db[follower_collection].update_one(
+        account_filter(current_user["role"], current_user["id"]),
+        bump_version({"$inc": {following_field: 1}})
+    )
+
+    if targetType == "school":
+        # 3. Switch very popular schools to fan-out-on-read: new posts are no longer copied
+        # into every follower's timeline but merged in when the home feed is read
+        followers = updated_target.get("stats", {}).get("followers", 0)
+        if followers > settings.FANOUT_MAX_FOLLOWERS and not updated_target.get("fanoutOnRead"):
+            await db["schools"].update_one({"_id": target["_id"]}, {"$set": {"fanoutOnRead": True}})
+            await db["follows"].update_many({"followeeId": targetId}, {"$set": {"hub": True}})
+        elif not updated_target.get("fanoutOnRead"):
+            await backfill_timeline(db, current_user["id"], targetId)
+
+    return {"success": True, "message": "Followed successfully."}
+
+
+# 2. DELETE /api/follows/{targetType}/{targetId} (Unfollow an account)
+@router.delete("/{targetType}/{targetId}", status_code=status.HTTP_200_OK)
+async def unfollow_account(
+    targetType: AccountType,
+    targetId: str,
+    current_user: Dict[str, str] = Depends(get_current_user)
+):
+    """Removes the follow edge, decrements both counters and clears the author's timeline entries."""
+    db = db_instance.db
+    if db is None:
+        raise HTTPException(status_code=500, detail="Database connection failed.")
+
+    result = await db["follows"].delete_one({
+        "followerId": current_user["id"],
+        "followeeId": targetId,
+        "followeeType": targetType
+    })
+    if result.deleted_count == 0:
+        return {"success": True, "message": "Not following."}
+
+    target_collection, followers_field, _ = ACCOUNT_COUNTERS[targetType]
+    await db[target_collection].update_one(
+        {**account_filter(targetType, targetId), followers_field: {"$gt": 0}},
+        bump_version({"$inc": {followers_field: -1}})
+    )
+    follower_collection, _, following_field = ACCOUNT_COUNTERS[current_user["role"]]
+    await db[follower_collection].update_one(
+        {**account_filter(current_user["role"], current_user["id"]), following_field: {"$gt": 0}},
+        bump_version({"$inc": {following_field: -1}})
+    )
+
+    if targetType == "school":
+        await db["timelines"].delete_many({"ownerId": current_user["id"], "authorId": targetId})
+
+    return {"success": True, "message": "Unfollowed successfully."}
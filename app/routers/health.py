@@ -0,0 +1,64 @@
+from fastapi import APIRouter, status
+from fastapi.responses import JSONResponse
+from pymongo.errors import PyMongoError
+
+from app.core.database import db_instance
+from app.core.resilience import mongo_breaker, pool_state
+from app.core.startup import startup_timer
+
+router = APIRouter(prefix="/health", tags=["Health"])
+
+# 1. GET /health/live (Liveness: the worker answers, no dependencies checked)
+@router.get("/live", status_code=status.HTTP_200_OK)
+async def liveness():
+    return {"success": True, "message": "Alive."}
+
+# 2. GET /health/ready (Readiness: startup finished and the database is not known to be down)
+@router.get("/ready", status_code=status.HTTP_200_OK)
+async def readiness():
+    """
+    Cheap enough for frequent probes: no database round trip. Not ready (503) before
+    the startup finishes or while the circuit breaker is open.
+    """
+    checks = {
+        "startupComplete": startup_timer.ready_seconds is not None,
+        "databaseConfigured": db_instance.db is not None,
+        "circuitClosed": mongo_breaker.state != mongo_breaker.OPEN,
+    }
+    ready = all(checks.values())
+    return JSONResponse(
+        status_code=status.HTTP_200_OK if ready else status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={
+            "success": ready,
+            "message": "Ready." if ready else "Not ready.",
+            "data": {"checks": checks, "circuitBreaker": mongo_breaker.snapshot(), "pool": pool_state()}
+        }
+    )
+
+# 3. GET /health (Deep health: pings MongoDB and reports breaker and pool state)
+@router.get("", status_code=status.HTTP_200_OK)
+async def deep_health():
+    """
+    Pings MongoDB within MONGO_HEALTH_TIMEOUT_MS through the circuit breaker, so while it
+    is open this answers 503 at once, and a successful ping may close it again.
+    """
+    database = {"reachable": False, "pingMs": None, "error": None}
+    db = db_instance.db
+    if db is None:
+        database["error"] = "Not connected."
+    else:
+        try:
+            database["pingMs"] = round(await db.ping() * 1000, 2)
+            database["reachable"] = True
+        except PyMongoError as e:
+            database["error"] = str(e)
+
+    healthy = database["reachable"]
+    return JSONResponse(
+        status_code=status.HTTP_200_OK if healthy else status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={
+            "success": healthy,
+            "message": "Healthy." if healthy else "Database unavailable.",
+            "data": {"database": database, "circuitBreaker": mongo_breaker.snapshot(), "pool": pool_state()}
+        }
+    )
@@ -1,8 +1,11 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from typing import List
 from datetime import datetime, timezone
-from app.models.hope import HopeCreate, HopeResponse
+from app.models.hope import HopeCreate, HopeResponse, HOPE_REQUIRED, HOPE_SOURCES, serialize_hope
 from app.core.database import db_instance
+from app.utils.fast_response import json_list_response
+from app.utils.projection import FieldSelection, sparse_fields
+from app.utils.etag import bump_collection_version, get_collection_version, make_etag, not_modified, set_etag
 
 router = APIRouter()
 
@@ -16,46 +19,34 @@ async def create_hope(hope: HopeCreate):
     # Convert data to a dictionary for MongoDB insertion
     hope_dict = hope.model_dump(by_alias=True)
     hope_dict["created_at"] = datetime.now(timezone.utc)
+    hope_dict["updatedAt"] = hope_dict["created_at"]
 
-    # Insert into the database
-    result = await db["hopes"].insert_one(hope_dict)
+    # Insert into the database (insert_one adds the generated _id to hope_dict)
+    await db["hopes"].insert_one(hope_dict)
+    await bump_collection_version(db, "hopes")
 
     # Return the response
-    return HopeResponse(
-        id=str(result.inserted_id),
-        name=hope_dict.get("name", ""),
-        details=hope_dict.get("details", ""),
-        type_of_donation=hope_dict.get("type_of_donation", ""),
-        support_field=hope_dict.get("fields", ""),
-        amount=hope_dict.get("amount", 0.0),
-        grade_requirement=hope_dict.get("grade_requirement"),
-        students=hope_dict.get("students", []),
-        created_at=hope_dict["created_at"],
-    )
+    return HopeResponse(**serialize_hope(hope_dict))
 
 # 2. GET API: Fetch the list of all "Hopes"
 @router.get("/", response_model=List[HopeResponse])
-async def get_all_hopes():
+async def get_all_hopes(request: Request, selection: FieldSelection = Depends(sparse_fields(HOPE_SOURCES, HOPE_REQUIRED))):
     db = db_instance.db
     if db is None:
         raise HTTPException(status_code=500, detail="Database connection failed")
 
-    hopes_list = []
-    cursor = db["hopes"].find({})
-    
-    async for hope in cursor:
-        hopes_list.append(
-            HopeResponse(
-                id=str(hope["_id"]),
-                name=hope.get("name", ""),
-                details=hope.get("details", ""),
-                type_of_donation=hope.get("type_of_donation", ""),
-                support_field=hope.get("fields", ""),
-                amount=hope.get("amount", 0.0),
-                grade_requirement=hope.get("grade_requirement"),
-                students=hope.get("students", []),
-                created_at=hope.get("created_at")
-            )
-        )
-        
-    return hopes_list
+    # The whole list changes only when a hope is created, tracked by one version counter
+    etag = make_etag("hopes", await get_collection_version(db, "hopes"), selection.etag_part())
+    cached = not_modified(request, etag)
+    if cached is not None:
+        return cached
+
+    # Rows are validated once and encoded in pydantic-core (see app.utils.fast_response)
+    hopes_list = [
+        serialize_hope(hope)
+        async for hope in db["hopes"].find({}, selection.projection())
+    ]
+
+    fast_response = json_list_response(HopeResponse, hopes_list, fields=selection.fields)
+    set_etag(fast_response, etag)
+    return fast_response
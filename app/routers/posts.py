@@ -1,17 +1,34 @@
-from fastapi import APIRouter, HTTPException, status, Form, File, UploadFile, Depends
+from fastapi import APIRouter, HTTPException, status, Form, File, UploadFile, Depends, Query, Request, Response
 from bson import ObjectId
 from datetime import datetime, timezone
-from typing import Optional             
+from typing import Literal, Optional
 
 from app.core.database import db_instance
 from app.core.security import get_current_user_id
+from app.core.rate_limit import rate_limit
 from app.utils.file_handlers import save_profile_image
-from app.models.post import PostResponse, format_number, format_date_custom, format_time_custom , CommentCreate
+from app.models.post import PostResponse, format_number, format_date_custom, format_time_custom , CommentCreate, serialize_post, serialize_comment
+from app.models.post import COMMENT_REQUIRED, COMMENT_SOURCES, POST_REQUIRED, POST_SOURCES
+from app.utils.feed import serialize_feed_page
+from app.utils.pagination import encode_cursor, keyset_filter
+from app.utils.timeline import schedule_fan_out
+from app.utils.text_search import search_text
+from app.utils.etag import bump_version, make_etag, not_modified, set_etag
+from app.utils.projection import FieldSelection, sparse_fields
+from app.utils.sync import write_tombstone
+from app.utils.comment_threads import child_path, subtree_filter, record_subtree_delete, schedule_subtree_delete
+from app.core.events import event_hub
+from app.core.config import settings
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
 
 router = APIRouter(prefix="/api/posts", tags=["Posts"])
 
+post_fields = sparse_fields(POST_SOURCES, POST_REQUIRED)
+comment_fields = sparse_fields(COMMENT_SOURCES, COMMENT_REQUIRED)
+
 # 1. POST /api/posts (Create a new post)
-@router.post("/", status_code=status.HTTP_201_CREATED)
+@router.post("/", status_code=status.HTTP_201_CREATED, dependencies=[Depends(rate_limit("create_post"))])
 async def create_post(
     content: str = Form(""),
     image: UploadFile = File(None),
@@ -32,7 +49,10 @@ async def create_post(
         raise HTTPException(status_code=500, detail="Database connection failed.")
 
     # 1. Fetch the author's (school's) details to embed in the post
-    author = await db["schools"].find_one({"_id": ObjectId(current_user_id)})
+    author = await db["schools"].find_one(
+        {"_id": ObjectId(current_user_id)},
+        {"name": 1, "username": 1, "profilePicture": 1, "badge": 1, "fanoutOnRead": 1}
+    )
     if not author:
         raise HTTPException(status_code=404, detail="Author profile not found.")
 
@@ -51,57 +71,61 @@ async def create_post(
         "authorProfilePic": author.get("profilePicture", ""),
         "isVerified": author.get("badge", False),  # Using 'badge' from your Phase 1 model
         "content": content,
+        "searchText": search_text(content),
         "imageUrl": image_url,
         "likesCount": 0,
         "commentsCount": 0,
         "sharesCount": 0,
         "viewsCount": 0,
         "isEdited": False,
+        "version": 1,
+        "commentsVersion": 1,
         "createdAt": now,
         "updatedAt": now
     }
 
     # 4. Insert into the database
-    result = await db["posts"].insert_one(post_document)
-    post_id = str(result.inserted_id)
+    await db["posts"].insert_one(post_document)
+
+    # Maintain the per-school post counter used by the school timeline. Schools that predate the
+    # counter are left alone: an $inc would create it at 1, and the timeline backfills it by count
+    await db["schools"].update_one(
+        {"_id": author["_id"], "stats.posts": {"$exists": True}},
+        bump_version({"$inc": {"stats.posts": 1}})
+    )
+
+    # Push the post into followers' home timelines in the background
+    schedule_fan_out(post_document, author)
 
-    # 5. Return the formatted response matching our PostResponse schema
+    # 5. Announce the post to live feed subscribers
+    post_data = serialize_post(post_document)
+    await event_hub.publish("post.created", post_data)
+
+    # 6. Return the formatted response matching our PostResponse schema
     return {
         "success": True,
         "message": "Post created successfully.",
-        "data": {
-            "postId": post_id,
-            "schoolId": current_user_id,
-            "authorName": post_document["authorName"],
-            "authorUsername": post_document["authorUsername"],
-            "authorProfilePic": post_document["authorProfilePic"],
-            "isVerified": post_document["isVerified"],
-            "content": post_document["content"],
-            "imageUrl": post_document["imageUrl"],
-            "likesCount": 0,
-            "commentsCount": 0,
-            "sharesCount": 0,
-            "viewsCount": 0,
-            "formattedViews": "0",
-            "formattedLikes": "0",
-            "isLikedByMe": False,
-            "isSavedByMe": False,
-            "isEdited": False,
-            "createdAtDate": format_date_custom(now),
-            "createdAtTime": format_time_custom(now)
-        }
+        "data": post_data
     }
 
 # 2. GET /api/posts (Get Feed with Pagination)
 @router.get("/", status_code=status.HTTP_200_OK)
 async def get_all_posts(
+    request: Request,
+    response: Response,
     page: int = 1,
     limit: int = 10,
+    sort: Literal["latest", "trending"] = "latest",
+    selection: FieldSelection = Depends(post_fields),
     current_user_id: str = Depends(get_current_user_id)
 ):
     """
     Fetches the posts feed with pagination.
-    Latest posts appear first.
+    Latest posts appear first, or with sort=trending the highest
+    periodically materialized trending scores appear first.
+    Supports conditional requests: the ETag is derived from the ids and versions of
+    the page's posts, which an index-covered query reads without loading the documents.
+    `?fields=` narrows both the projection and the returned post objects.
     """
     db = db_instance.db
     if db is None:
@@ -110,41 +134,33 @@ async def get_all_posts(
     # Calculate skip for MongoDB pagination
     skip = (page - 1) * limit
     
-    # Fetch posts sorted by newest first (-1)
-    cursor = db["posts"].find().sort("createdAt", -1).skip(skip).limit(limit)
+    # Fetch posts sorted by newest first (-1), or by the precomputed trending score index
+    if sort == "trending":
+        order = [("trendingScore", -1), ("_id", -1)]
+    else:
+        order = [("createdAt", -1), ("_id", -1)]
+
+    # Total for frontend pagination logic, read from collection metadata: a full count
+    # would scan the collection on every revalidation, and the feed has no filter to apply
+    total_posts = await db["posts"].estimated_document_count()
+
+    # 1. Cheap validation pass: (id, version) pairs of the page
+    page_versions = await db["posts"].find({}, {"_id": 1, "version": 1}).sort(order).skip(skip).limit(limit).to_list(length=limit)
+    etag = make_etag(
+        "feed", current_user_id, sort, page, limit, total_posts, selection.etag_part(),
+        *(f"{p['_id']}:{p.get('version', 0)}" for p in page_versions)
+    )
+    cached = not_modified(request, etag)
+    if cached is not None:
+        return cached
+
+    # 2. Full page
+    cursor = db["posts"].find({}, selection.projection()).sort(order).skip(skip).limit(limit)
     posts = await cursor.to_list(length=limit)
-    
-    # Get total count for frontend pagination logic
-    total_posts = await db["posts"].count_documents({})
+    set_etag(response, etag)
 
-    # Format the data exactly as the frontend expects
-    formatted_posts = []
-    for post in posts:
-        post_id = str(post["_id"])
-        
-        # NOTE: For now, isLikedByMe and isSavedByMe are False. 
-        # We will update these in the "Engagement" step when we query the likes collection.
-        formatted_posts.append({
-            "postId": post_id,
-            "schoolId": post["schoolId"],
-            "authorName": post.get("authorName", ""),
-            "authorUsername": post.get("authorUsername", ""),
-            "authorProfilePic": post.get("authorProfilePic", ""),
-            "isVerified": post.get("isVerified", False),
-            "content": post.get("content", ""),
-            "imageUrl": post.get("imageUrl", ""),
-            "likesCount": post.get("likesCount", 0),
-            "commentsCount": post.get("commentsCount", 0),
-            "sharesCount": post.get("sharesCount", 0),
-            "viewsCount": post.get("viewsCount", 0),
-            "formattedViews": format_number(post.get("viewsCount", 0)),
-            "formattedLikes": format_number(post.get("likesCount", 0)),
-            "isLikedByMe": False, 
-            "isSavedByMe": False,
-            "isEdited": post.get("isEdited", False),
-            "createdAtDate": format_date_custom(post["createdAt"]),
-            "createdAtTime": format_time_custom(post["createdAt"])
-        })
+    # Format the data exactly as the frontend expects, hydrating viewer likes and saves in one query each
+    formatted_posts = await serialize_feed_page(db, current_user_id, posts, selection)
 
     return {
         "success": True,
@@ -158,6 +174,68 @@ async def get_all_posts(
         }
     }
 
+# 2b. GET /api/posts/home (Personalized Home Timeline)
+@router.get("/home", status_code=status.HTTP_200_OK)
+async def get_home_timeline(
+    cursor: Optional[str] = None,
+    limit: int = Query(10, ge=1, le=50),
+    selection: FieldSelection = Depends(post_fields),
+    current_user_id: str = Depends(get_current_user_id)
+):
+    """
+    Fetches the viewer's home timeline: posts from followed schools, newest first.
+    Entries are materialized at post time, so a page is one indexed range query;
+    posts from very popular schools (fan-out-on-read) are merged in here instead.
+    """
+    db = db_instance.db
+    if db is None:
+        raise HTTPException(status_code=500, detail="Database connection failed.")
+
+    # 1. Range query on the materialized timeline (ownerId, createdAt, postId)
+    entries = await db["timelines"].find(
+        {"ownerId": current_user_id, **keyset_filter(cursor, id_field="postId")},
+        {"_id": 0, "postId": 1, "createdAt": 1}
+    ).sort([("createdAt", -1), ("postId", -1)]).limit(limit + 1).to_list(length=limit + 1)
+    positions = [(entry["createdAt"], entry["postId"]) for entry in entries]
+
+    # 2. Merge in posts from followed hub accounts that are not fanned out on write
+    hub_ids = [
+        follow["followeeId"]
+        async for follow in db["follows"].find(
+            {"followerId": current_user_id, "hub": True}, {"_id": 0, "followeeId": 1}
+        )
+    ]
+    if hub_ids:
+        hub_posts = await db["posts"].find(
+            {"schoolId": {"$in": hub_ids}, **keyset_filter(cursor)},
+            {"_id": 1, "createdAt": 1}
+        ).sort([("createdAt", -1), ("_id", -1)]).limit(limit + 1).to_list(length=limit + 1)
+        positions.extend((post["createdAt"], post["_id"]) for post in hub_posts)
+        # Posts written before the author became a hub may also be materialized
+        positions = sorted(set(positions), reverse=True)
+
+    has_more = len(positions) > limit
+    positions = positions[:limit]
+
+    # 3. Hydrate post bodies and viewer likes/saves with one $in query each
+    post_ids = [post_id for _, post_id in positions]
+    posts_by_id = {
+        post["_id"]: post
+        async for post in db["posts"].find({"_id": {"$in": post_ids}}, selection.projection())
+    }
+    posts = [posts_by_id[post_id] for post_id in post_ids if post_id in posts_by_id]
+
+    return {
+        "success": True,
+        "message": "Home timeline fetched successfully.",
+        "data": await serialize_feed_page(db, current_user_id, posts, selection),
+        "pagination": {
+            "limit": limit,
+            "hasMore": has_more,
+            "nextCursor": encode_cursor(*positions[-1]) if has_more else None
+        }
+    }
+
 # 3. PUT /api/posts/{postId} (Edit Post)
 @router.put("/{postId}", status_code=status.HTTP_200_OK)
 async def edit_post(
@@ -176,8 +254,8 @@ async def edit_post(
     except Exception:
         raise HTTPException(status_code=400, detail="Invalid Post ID.")
 
-    # 1. Find the post
-    post = await db["posts"].find_one({"_id": obj_id})
+    # 1. Find the post (only the owner is needed for the permission check)
+    post = await db["posts"].find_one({"_id": obj_id}, {"schoolId": 1})
     if not post:
         raise HTTPException(status_code=404, detail="Post not found.")
 
@@ -190,13 +268,14 @@ async def edit_post(
     
     if content is not None:
         update_fields["content"] = content
+        update_fields["searchText"] = search_text(content)
         
     if image:
         image_url = await save_profile_image(image)
         update_fields["imageUrl"] = image_url
 
     # 4. Save to DB
-    await db["posts"].update_one({"_id": obj_id}, {"$set": update_fields})
+    await db["posts"].update_one({"_id": obj_id}, bump_version({"$set": update_fields}))
 
     return {
         "success": True,
@@ -218,8 +297,8 @@ async def delete_post(
     except Exception:
         raise HTTPException(status_code=400, detail="Invalid Post ID.")
 
-    # 1. Find the post
-    post = await db["posts"].find_one({"_id": obj_id})
+    # 1. Find the post (only the owner is needed for the permission check)
+    post = await db["posts"].find_one({"_id": obj_id}, {"schoolId": 1})
     if not post:
         raise HTTPException(status_code=404, detail="Post not found.")
 
@@ -228,10 +307,18 @@ async def delete_post(
         raise HTTPException(status_code=403, detail="Forbidden. You can only delete your own posts.")
 
     # 3. Delete from DB
-    await db["posts"].delete_one({"_id": obj_id})
-    
-    # NOTE: In an enterprise app, we would also delete the associated likes/comments here.
-    # We will handle that cleanup logic later if needed.
+    result = await db["posts"].delete_one({"_id": obj_id})
+    if result.deleted_count:
+        await db["schools"].update_one(
+            {"_id": ObjectId(current_user_id), "stats.posts": {"$gt": 0}},
+            bump_version({"$inc": {"stats.posts": -1}})
+        )
+        await db["timelines"].delete_many({"postId": obj_id})
+        await db["post_saves"].delete_many({"postId": postId})
+        # Comments go too, or comment search would keep returning hits on a deleted post
+        await db["post_comments"].delete_many({"postId": postId})
+        await db["post_views"].delete_many({"postId": postId})
+        await write_tombstone(db, "posts", obj_id)
 
     return {
         "success": True,
@@ -239,7 +326,7 @@ async def delete_post(
     }
 
 # 5. POST /api/posts/{postId}/like (Toggle Like)
-@router.post("/{postId}/like", status_code=status.HTTP_200_OK)
+@router.post("/{postId}/like", status_code=status.HTTP_200_OK, dependencies=[Depends(rate_limit("toggle_like"))])
 async def toggle_like(
     postId: str,
     current_user_id: str = Depends(get_current_user_id)
@@ -255,7 +342,7 @@ async def toggle_like(
         raise HTTPException(status_code=400, detail="Invalid Post ID.")
 
     # 1. Check if the post exists
-    post = await db["posts"].find_one({"_id": obj_id})
+    post = await db["posts"].find_one({"_id": obj_id}, {"likesCount": 1})
     if not post:
         raise HTTPException(status_code=404, detail="Post not found.")
 
@@ -270,7 +357,8 @@ async def toggle_like(
         await db["post_likes"].delete_one({"_id": existing_like["_id"]})
         # Decrement the counter in the posts collection (ensure it doesn't go below 0)
         new_likes_count = max(0, post.get("likesCount", 0) - 1)
-        await db["posts"].update_one({"_id": obj_id}, {"$set": {"likesCount": new_likes_count}})
+        await db["posts"].update_one({"_id": obj_id}, bump_version({"$set": {"likesCount": new_likes_count}}))
+        await event_hub.publish_counters(postId, likesCount=new_likes_count)
         
         return {
             "success": True,
@@ -291,7 +379,8 @@ async def toggle_like(
         await db["post_likes"].insert_one(like_doc)
         # Increment the counter
         new_likes_count = post.get("likesCount", 0) + 1
-        await db["posts"].update_one({"_id": obj_id}, {"$set": {"likesCount": new_likes_count}})
+        await db["posts"].update_one({"_id": obj_id}, bump_version({"$set": {"likesCount": new_likes_count}}))
+        await event_hub.publish_counters(postId, likesCount=new_likes_count)
         
         return {
             "success": True,
@@ -306,7 +395,7 @@ async def toggle_like(
 
 # 6. POST /api/posts/{postId}/comments (Add Comment)
 
-@router.post("/{postId}/comments", status_code=status.HTTP_201_CREATED)
+@router.post("/{postId}/comments", status_code=status.HTTP_201_CREATED, dependencies=[Depends(rate_limit("add_comment"))])
 async def add_comment(
     postId: str,
     comment: CommentCreate,
@@ -319,11 +408,11 @@ async def add_comment(
     except Exception:
         raise HTTPException(status_code=400, detail="Invalid Post ID.")
 
-    post = await db["posts"].find_one({"_id": obj_id})
+    post = await db["posts"].find_one({"_id": obj_id}, {"_id": 1})
     if not post:
         raise HTTPException(status_code=404, detail="Post not found.")
 
-    user = await db["schools"].find_one({"_id": ObjectId(current_user_id)})
+    user = await db["schools"].find_one({"_id": ObjectId(current_user_id)}, {"username": 1, "profilePicture": 1})
     now = datetime.now(timezone.utc)
     
     comment_doc = {
@@ -332,13 +421,36 @@ async def add_comment(
         "username": user.get("username", "Unknown"),
         "userProfilePic": user.get("profilePicture", ""),
         "text": comment.text,
+        "searchText": search_text(comment.text),
+        "parentId": None,
+        "rootId": None,
+        "path": "",
+        "depth": 0,
+        "repliesCount": 0,
         "createdAt": now
     }
     
     await db["post_comments"].insert_one(comment_doc)
 
-    new_comments_count = post.get("commentsCount", 0) + 1
-    await db["posts"].update_one({"_id": obj_id}, {"$set": {"commentsCount": new_comments_count}})
+    # Bump the counter atomically and keep the newest comments embedded for feed cards
+    preview = {k: comment_doc[k] for k in ("_id", "userId", "username", "userProfilePic", "text", "createdAt")}
+    updated_post = await db["posts"].find_one_and_update(
+        {"_id": obj_id},
+        bump_version({
+            "$inc": {"commentsCount": 1},
+            "$push": {
+                "previewComments": {
+                    "$each": [preview],
+                    "$position": 0,
+                    "$slice": settings.POST_PREVIEW_COMMENTS
+                }
+            }
+        }, "version", "commentsVersion"),
+        projection={"commentsCount": 1},
+        return_document=ReturnDocument.AFTER
+    )
+    new_comments_count = updated_post.get("commentsCount", 1) if updated_post else 1
+    await event_hub.publish_counters(postId, commentsCount=new_comments_count)
 
     return {
         "success": True,
@@ -358,44 +470,70 @@ async def add_comment(
 @router.get("/{postId}/comments", status_code=status.HTTP_200_OK)
 async def get_comments(
     postId: str,
+    request: Request,
+    response: Response,
     page: int = 1,
     limit: int = 10,
+    cursor: Optional[str] = None,
+    selection: FieldSelection = Depends(comment_fields),
     current_user_id: str = Depends(get_current_user_id)
 ):
-    """Fetches comments for a post with pagination."""
+    """
+    Fetches top-level comments for a post, newest first.
+    Page-number mode by default; passing `cursor` (empty for the first page) switches to
+    keyset pagination on (postId, createdAt, _id), which stays fast on deep pages.
+    Conditional requests are validated against the post's commentsVersion.
+    """
     db = db_instance.db
-    skip = (page - 1) * limit
-    
-    cursor = db["post_comments"].find({"postId": postId}).sort("createdAt", -1).skip(skip).limit(limit)
-    comments = await cursor.to_list(length=limit)
-    total_comments = await db["post_comments"].count_documents({"postId": postId})
-
-    formatted_comments = []
-    for c in comments:
-        formatted_comments.append({
-            "commentId": str(c["_id"]),
-            "userId": c["userId"],
-            "username": c.get("username", ""),
-            "userProfilePic": c.get("userProfilePic", ""),
-            "text": c["text"],
-            "createdAtDate": format_date_custom(c["createdAt"]),
-            "createdAtTime": format_time_custom(c["createdAt"])
-        })
+    try:
+        obj_id = ObjectId(postId)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid Post ID.")
+
+    # The total is served from the denormalized counters instead of count_documents
+    # (commentsCount includes replies, which this top-level listing leaves out)
+    post = await db["posts"].find_one({"_id": obj_id}, {"commentsCount": 1, "repliesCount": 1, "commentsVersion": 1})
+    if not post:
+        raise HTTPException(status_code=404, detail="Post not found.")
+
+    etag = make_etag("comments", postId, post.get("commentsVersion", 0), page, limit, cursor, selection.etag_part())
+    cached = not_modified(request, etag)
+    if cached is not None:
+        return cached
+    set_etag(response, etag)
+
+    total_comments = max(0, post.get("commentsCount", 0) - post.get("repliesCount", 0))
+
+    query = {"postId": postId, "parentId": None}
+    if cursor is not None:
+        query.update(keyset_filter(cursor))
+        skip = 0
+    else:
+        skip = (page - 1) * limit
+
+    comments = await db["post_comments"].find(query, selection.projection()).sort(
+        [("createdAt", -1), ("_id", -1)]
+    ).skip(skip).limit(limit + 1).to_list(length=limit + 1)
+
+    has_more = len(comments) > limit
+    comments = comments[:limit]
 
     return {
         "success": True,
-        "data": formatted_comments,
+        "data": selection.apply_all(serialize_comment(c) for c in comments),
         "pagination": {
             "totalComments": total_comments,
             "currentPage": page,
-            "totalPages": (total_comments + limit - 1) // limit
+            "totalPages": (total_comments + limit - 1) // limit,
+            "hasMore": has_more,
+            "nextCursor": encode_cursor(comments[-1]["createdAt"], comments[-1]["_id"]) if has_more else None
         }
     }
 
 
 # 8. POST /api/posts/{postId}/view (Track Unique View)
 
-@router.post("/{postId}/view", status_code=status.HTTP_200_OK)
+@router.post("/{postId}/view", status_code=status.HTTP_200_OK, dependencies=[Depends(rate_limit("track_view"))])
 async def track_view(
     postId: str,
     current_user_id: str = Depends(get_current_user_id)
@@ -415,10 +553,11 @@ async def track_view(
             "userId": current_user_id,
             "createdAt": datetime.now(timezone.utc)
         })
-        await db["posts"].update_one({"_id": obj_id}, {"$inc": {"viewsCount": 1}})
+        await db["posts"].update_one({"_id": obj_id}, bump_version({"$inc": {"viewsCount": 1}}))
         
-        updated_post = await db["posts"].find_one({"_id": obj_id})
+        updated_post = await db["posts"].find_one({"_id": obj_id}, {"viewsCount": 1})
         views = updated_post.get("viewsCount", 1)
+        await event_hub.publish_counters(postId, viewsCount=views)
         
         return {
             "success": True,
@@ -431,7 +570,7 @@ async def track_view(
 
 # 9. POST /api/posts/{postId}/share (Track Share)
 
-@router.post("/{postId}/share", status_code=status.HTTP_200_OK)
+@router.post("/{postId}/share", status_code=status.HTTP_200_OK, dependencies=[Depends(rate_limit("track_share"))])
 async def track_share(
     postId: str,
     current_user_id: str = Depends(get_current_user_id)
@@ -443,12 +582,334 @@ async def track_share(
     except Exception:
         raise HTTPException(status_code=400, detail="Invalid Post ID.")
 
-    await db["posts"].update_one({"_id": obj_id}, {"$inc": {"sharesCount": 1}})
-    updated_post = await db["posts"].find_one({"_id": obj_id})
+    await db["posts"].update_one({"_id": obj_id}, bump_version({"$inc": {"sharesCount": 1}}))
+    updated_post = await db["posts"].find_one({"_id": obj_id}, {"sharesCount": 1})
     shares = updated_post.get("sharesCount", 1)
+    await event_hub.publish_counters(postId, sharesCount=shares)
 
     return {
         "success": True,
         "message": "Share tracked.",
         "data": {"sharesCount": shares}
-    }
\ No newline at end of file
+    }
+
+
+# 10. POST /api/posts/{postId}/comments/{commentId}/replies (Reply to a Comment)
+
+@router.post("/{postId}/comments/{commentId}/replies", status_code=status.HTTP_201_CREATED, dependencies=[Depends(rate_limit("add_comment"))])
+async def add_reply(
+    postId: str,
+    commentId: str,
+    comment: CommentCreate,
+    current_user_id: str = Depends(get_current_user_id)
+):
+    """
+    Replies to a comment. The reply stores its materialized path, depth and thread root
+    so threads and subtrees can be read with indexed range scans.
+    """
+    db = db_instance.db
+    try:
+        obj_id = ObjectId(postId)
+        parent_id = ObjectId(commentId)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid Post or Comment ID.")
+
+    parent = await db["post_comments"].find_one(
+        {"_id": parent_id, "postId": postId},
+        {"postId": 1, "path": 1, "depth": 1, "rootId": 1}
+    )
+    if not parent:
+        raise HTTPException(status_code=404, detail="Comment not found.")
+
+    depth = parent.get("depth", 0) + 1
+    if depth > settings.COMMENT_MAX_DEPTH:
+        raise HTTPException(status_code=400, detail="Maximum reply depth reached.")
+
+    user = await db["schools"].find_one({"_id": ObjectId(current_user_id)}, {"username": 1, "profilePicture": 1})
+    if not user:
+        raise HTTPException(status_code=404, detail="User profile not found.")
+    now = datetime.now(timezone.utc)
+
+    reply_doc = {
+        "postId": postId,
+        "userId": current_user_id,
+        "username": user.get("username", "Unknown"),
+        "userProfilePic": user.get("profilePicture", ""),
+        "text": comment.text,
+        "searchText": search_text(comment.text),
+        "parentId": commentId,
+        "rootId": parent.get("rootId") or commentId,
+        "path": child_path(parent),
+        "depth": depth,
+        "repliesCount": 0,
+        "createdAt": now
+    }
+    await db["post_comments"].insert_one(reply_doc)
+
+    # Maintain the per-node and per-post counters
+    await db["post_comments"].update_one({"_id": parent_id}, {"$inc": {"repliesCount": 1}})
+    updated_post = await db["posts"].find_one_and_update(
+        {"_id": obj_id},
+        bump_version({"$inc": {"commentsCount": 1, "repliesCount": 1}}, "version", "commentsVersion"),
+        projection={"commentsCount": 1},
+        return_document=ReturnDocument.AFTER
+    )
+    new_comments_count = updated_post.get("commentsCount", 1) if updated_post else 1
+    await event_hub.publish_counters(postId, commentsCount=new_comments_count)
+
+    return {
+        "success": True,
+        "message": "Reply added successfully.",
+        "data": {**serialize_comment(reply_doc), "commentsCount": new_comments_count}
+    }
+
+
+# 11. GET /api/posts/{postId}/comments/{commentId}/replies (Direct Replies)
+
+@router.get("/{postId}/comments/{commentId}/replies", status_code=status.HTTP_200_OK)
+async def get_replies(
+    postId: str,
+    commentId: str,
+    cursor: Optional[str] = None,
+    limit: int = Query(10, ge=1, le=50),
+    selection: FieldSelection = Depends(comment_fields),
+    current_user_id: str = Depends(get_current_user_id)
+):
+    """Pages through the direct replies of a comment, oldest first."""
+    db = db_instance.db
+    if db is None:
+        raise HTTPException(status_code=500, detail="Database connection failed.")
+
+    # postId keeps replies of another post's comment out of this post's URL
+    replies = await db["post_comments"].find(
+        {"parentId": commentId, "postId": postId, **keyset_filter(cursor, descending=False)},
+        selection.projection()
+    ).sort([("createdAt", 1), ("_id", 1)]).limit(limit + 1).to_list(length=limit + 1)
+
+    has_more = len(replies) > limit
+    replies = replies[:limit]
+
+    return {
+        "success": True,
+        "data": selection.apply_all(serialize_comment(c) for c in replies),
+        "pagination": {
+            "limit": limit,
+            "hasMore": has_more,
+            "nextCursor": encode_cursor(replies[-1]["createdAt"], replies[-1]["_id"]) if has_more else None
+        }
+    }
+
+
+# 12. GET /api/posts/{postId}/comments/{commentId}/thread (Whole Reply Thread)
+
+@router.get("/{postId}/comments/{commentId}/thread", status_code=status.HTTP_200_OK)
+async def get_thread(
+    postId: str,
+    commentId: str,
+    cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    selection: FieldSelection = Depends(comment_fields),
+    current_user_id: str = Depends(get_current_user_id)
+):
+    """
+    Pages through every reply below a comment, oldest first. Each item carries
+    parentId and depth so the client can rebuild the tree. Threads of a top-level
+    comment are read through the rootId index, deeper subtrees by path prefix.
+    """
+    db = db_instance.db
+    try:
+        comment_id = ObjectId(commentId)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid Comment ID.")
+
+    comment = await db["post_comments"].find_one(
+        {"_id": comment_id, "postId": postId},
+        {"postId": 1, "path": 1, "parentId": 1}
+    )
+    if not comment:
+        raise HTTPException(status_code=404, detail="Comment not found.")
+
+    query = {"rootId": commentId} if comment.get("parentId") is None else subtree_filter(comment)
+    query.update(keyset_filter(cursor, descending=False))
+
+    replies = await db["post_comments"].find(query, selection.projection()).sort(
+        [("createdAt", 1), ("_id", 1)]
+    ).limit(limit + 1).to_list(length=limit + 1)
+
+    has_more = len(replies) > limit
+    replies = replies[:limit]
+
+    return {
+        "success": True,
+        "data": selection.apply_all(serialize_comment(c) for c in replies),
+        "pagination": {
+            "limit": limit,
+            "hasMore": has_more,
+            "nextCursor": encode_cursor(replies[-1]["createdAt"], replies[-1]["_id"]) if has_more else None
+        }
+    }
+
+
+# 13. DELETE /api/posts/{postId}/comments/{commentId} (Delete a Comment and its Replies)
+
+@router.delete("/{postId}/comments/{commentId}", status_code=status.HTTP_200_OK)
+async def delete_comment(
+    postId: str,
+    commentId: str,
+    current_user_id: str = Depends(get_current_user_id)
+):
+    """
+    Deletes a comment. Allowed for the comment's author and the post's owner.
+    The comment disappears immediately; its replies are removed by a bounded background job.
+    """
+    db = db_instance.db
+    try:
+        obj_id = ObjectId(postId)
+        comment_id = ObjectId(commentId)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid Post or Comment ID.")
+
+    comment = await db["post_comments"].find_one(
+        {"_id": comment_id, "postId": postId},
+        {"postId": 1, "userId": 1, "parentId": 1, "path": 1, "repliesCount": 1}
+    )
+    if not comment:
+        raise HTTPException(status_code=404, detail="Comment not found.")
+
+    if comment["userId"] != current_user_id:
+        post = await db["posts"].find_one({"_id": obj_id}, {"schoolId": 1})
+        if not post or post["schoolId"] != current_user_id:
+            raise HTTPException(status_code=403, detail="Forbidden. You can only delete your own comments.")
+
+    has_replies = comment.get("repliesCount", 0) > 0
+    if has_replies:
+        # Recorded first, so the replies are still removed if this worker stops mid-way
+        await record_subtree_delete(db, comment)
+
+    result = await db["post_comments"].delete_one({"_id": comment_id})
+    if result.deleted_count == 0:
+        return {"success": True, "message": "Comment already deleted."}
+
+    is_reply = comment.get("parentId") is not None
+    if is_reply:
+        await db["post_comments"].update_one(
+            {"_id": ObjectId(comment["parentId"]), "repliesCount": {"$gt": 0}},
+            {"$inc": {"repliesCount": -1}}
+        )
+    post_update = {"$inc": {"commentsCount": -1, "repliesCount": -1 if is_reply else 0}}
+    if not is_reply:
+        post_update["$pull"] = {"previewComments": {"_id": comment_id}}
+    await db["posts"].update_one({"_id": obj_id}, bump_version(post_update, "version", "commentsVersion"))
+
+    if has_replies:
+        schedule_subtree_delete(comment)
+
+    return {
+        "success": True,
+        "message": "Comment deleted successfully."
+    }
+
+
+
+# 14. POST /api/posts/{postId}/save (Save / Bookmark a Post)
+
+@router.post("/{postId}/save", status_code=status.HTTP_200_OK)
+async def save_post(
+    postId: str,
+    current_user_id: str = Depends(get_current_user_id)
+):
+    """Bookmarks a post for the current user. Saving twice is a no-op."""
+    db = db_instance.db
+    try:
+        obj_id = ObjectId(postId)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid Post ID.")
+
+    post = await db["posts"].find_one({"_id": obj_id}, {"_id": 1})
+    if not post:
+        raise HTTPException(status_code=404, detail="Post not found.")
+
+    try:
+        await db["post_saves"].insert_one({
+            "userId": current_user_id,
+            "postId": postId,
+            "createdAt": datetime.now(timezone.utc)
+        })
+    except DuplicateKeyError:
+        pass  # Already saved (unique userId/postId index)
+    else:
+        # isSavedByMe is part of the viewer's feed body, so saving changes the post's ETag and
+        # stamps updatedAt for delta sync
+        await db["posts"].update_one({"_id": obj_id}, bump_version({}))
+
+    return {
+        "success": True,
+        "message": "Post saved.",
+        "data": {"isSavedByMe": True}
+    }
+
+
+# 15. DELETE /api/posts/{postId}/save (Remove Bookmark)
+
+@router.delete("/{postId}/save", status_code=status.HTTP_200_OK)
+async def unsave_post(
+    postId: str,
+    current_user_id: str = Depends(get_current_user_id)
+):
+    """Removes a post from the current user's saved posts."""
+    db = db_instance.db
+    result = await db["post_saves"].delete_one({"userId": current_user_id, "postId": postId})
+    if result.deleted_count and ObjectId.is_valid(postId):
+        await db["posts"].update_one({"_id": ObjectId(postId)}, bump_version({}))
+
+    return {
+        "success": True,
+        "message": "Post removed from saved.",
+        "data": {"isSavedByMe": False}
+    }
+
+
+# 16. GET /api/posts/saved (My Saved Posts)
+
+@router.get("/saved", status_code=status.HTTP_200_OK)
+async def get_saved_posts(
+    cursor: Optional[str] = None,
+    limit: int = Query(10, ge=1, le=50),
+    selection: FieldSelection = Depends(post_fields),
+    current_user_id: str = Depends(get_current_user_id)
+):
+    """
+    Lists the current user's saved posts, most recently saved first.
+    Post bodies for the page are hydrated with a single $in query.
+    """
+    db = db_instance.db
+    if db is None:
+        raise HTTPException(status_code=500, detail="Database connection failed.")
+
+    # 1. Range scan on (userId, createdAt, _id)
+    saves = await db["post_saves"].find(
+        {"userId": current_user_id, **keyset_filter(cursor)},
+        {"postId": 1, "createdAt": 1}
+    ).sort([("createdAt", -1), ("_id", -1)]).limit(limit + 1).to_list(length=limit + 1)
+
+    has_more = len(saves) > limit
+    saves = saves[:limit]
+
+    # 2. Hydrate post bodies in one query, keeping the saved order
+    post_ids = [ObjectId(save["postId"]) for save in saves]
+    posts_by_id = {
+        post["_id"]: post
+        async for post in db["posts"].find({"_id": {"$in": post_ids}}, selection.projection())
+    }
+    posts = [posts_by_id[post_id] for post_id in post_ids if post_id in posts_by_id]
+
+    return {
+        "success": True,
+        "message": "Saved posts fetched successfully.",
+        "data": await serialize_feed_page(db, current_user_id, posts, selection),
+        "pagination": {
+            "limit": limit,
+            "hasMore": has_more,
+            "nextCursor": encode_cursor(saves[-1]["createdAt"], saves[-1]["_id"]) if has_more else None
+        }
+    }
@@ -1,4 +1,5 @@
-from fastapi import APIRouter, HTTPException, status, Form, File, UploadFile, Depends
+from fastapi import APIRouter, HTTPException, status, Form, File, UploadFile, Depends, Query, Request, Response
+from typing import Optional
 from pydantic import ValidationError
 from bson import ObjectId
 from bson.errors import InvalidId
@@ -9,19 +10,30 @@ from app.models.school import (
     SchoolSignup, 
     SchoolProfileResponse, 
     SchoolProfileUpdate, 
-    SchoolLogin
+    SchoolLogin,
+    SCHOOL_PROFILE_SOURCES,
+    serialize_school_profile
 )
+from app.models.post import POST_REQUIRED, POST_SOURCES
 
 # Core & Utility Imports
 from app.core.database import db_instance
 from app.core.security import (
     hash_password, 
     verify_password, 
+    run_in_bcrypt_pool,
     create_access_token, 
     get_current_user_id
 )
 from fastapi.encoders import jsonable_encoder
 from app.utils.file_handlers import save_profile_image
+from app.utils.availability import availability_index
+from app.utils.author_sync import schedule_author_sync, get_author_sync_status
+from app.utils.feed import serialize_feed_page
+from app.utils.pagination import encode_cursor, keyset_filter
+from app.utils.etag import bump_version, make_etag, not_modified, set_etag
+from app.utils.fast_response import json_object_response
+from app.utils.projection import FieldSelection, sparse_fields
 
 router = APIRouter(prefix="/api/schools", tags=["Schools"])
 
@@ -36,7 +48,7 @@ async def signup_school(school: SchoolSignup):
     # 1. Check for Duplicate Email or Username
     existing_school = await db["schools"].find_one({
         "$or": [{"email": school.email}, {"username": school.username}]
-    })
+    }, {"_id": 1})
     if existing_school:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT, 
@@ -47,7 +59,7 @@ async def signup_school(school: SchoolSignup):
     school_dict = school.model_dump(exclude={"confirmPassword"})
 
     # 3. Hash the Password
-    school_dict["password"] = hash_password(school_dict["password"])
+    school_dict["password"] = await run_in_bcrypt_pool(hash_password, school_dict["password"])
 
     # 4. Inject Default Backend Values (Hidden Fields)
     school_dict.update({
@@ -57,7 +69,8 @@ async def signup_school(school: SchoolSignup):
         "stats": {
             "followers": 0,
             "students": 0,
-            "followings": 0
+            "followings": 0,
+            "posts": 0
         },
         "details": {
             "rank": 0,
@@ -67,11 +80,14 @@ async def signup_school(school: SchoolSignup):
         },
         "facilities": [],
         "labs": [],
+        "version": 1,
         "created_at": datetime.now(timezone.utc)
     })
+    school_dict["updatedAt"] = school_dict["created_at"]
 
     # 5. Save to Database
     result = await db["schools"].insert_one(school_dict)
+    availability_index.register("school", username=school.username, email=school.email)
 
     # 6. Return Success Response
     return {
@@ -82,7 +98,16 @@ async def signup_school(school: SchoolSignup):
 # 2. GET /api/schools/{schoolId}
 
 @router.get("/{schoolId}", response_model=SchoolProfileResponse)
-async def get_school_profile(schoolId: str):
+async def get_school_profile(
+    schoolId: str,
+    request: Request,
+    response: Response,
+    selection: FieldSelection = Depends(sparse_fields(SCHOOL_PROFILE_SOURCES))
+):
+    """
+    Public school profile. Only the profile fields are projected (never the password
+    hash); `?fields=` narrows the projection and the response further.
+    """
     db = db_instance.db
     if db is None:
         raise HTTPException(status_code=500, detail="Database connection failed")
@@ -93,31 +118,32 @@ async def get_school_profile(schoolId: str):
     except InvalidId:
         raise HTTPException(status_code=400, detail="Invalid School ID format")
 
+    # Revalidate against the document version before loading the full profile
+    version_doc = await db["schools"].find_one({"_id": obj_id}, {"_id": 0, "version": 1})
+    if not version_doc:
+        raise HTTPException(status_code=404, detail="School not found")
+
+    etag = make_etag("school", schoolId, version_doc.get("version", 0), selection.etag_part())
+    cached = not_modified(request, etag)
+    if cached is not None:
+        return cached
+
     # Fetch from Database
-    school_data = await db["schools"].find_one({"_id": obj_id})
-    
+    school_data = await db["schools"].find_one({"_id": obj_id}, selection.projection())
+
     if not school_data:
         raise HTTPException(status_code=404, detail="School not found")
 
-    # Map MongoDB document to Pydantic response model
-    return SchoolProfileResponse(
-        schoolId=str(school_data["_id"]),
-        username=school_data.get("username", ""),
-        instituteName=school_data.get("instituteName", ""),
-        name=school_data.get("name", ""),
-        email=school_data.get("email", ""),
-        phone=school_data.get("phone", ""),
-        cnic=school_data.get("cnic", ""),
-        gender=school_data.get("gender", ""),
-        bio=school_data.get("bio", ""),
-        profilePicture=school_data.get("profilePicture", ""),
-        badge=school_data.get("badge", False),
-        stats=school_data.get("stats", {}),
-        details=school_data.get("details", {}),
-        facilities=school_data.get("facilities", []),
-        labs=school_data.get("labs", []),
-        location=school_data.get("locationName", "") # Map locationName to location for frontend
-    )
+    # Map MongoDB document to the response model (fields left out of the projection take their defaults)
+    profile = serialize_school_profile(school_data)
+
+    if selection.is_sparse:
+        sparse_response = json_object_response(SchoolProfileResponse, profile, fields=selection.fields)
+        set_etag(sparse_response, etag)
+        return sparse_response
+
+    set_etag(response, etag)
+    return SchoolProfileResponse(**profile)
 
 # 3. PUT /api/schools/{schoolId}/profile
 @router.put("/{schoolId}/profile", status_code=status.HTTP_200_OK)
@@ -173,7 +199,7 @@ async def update_school_profile(
     existing_user = await db["schools"].find_one({
         "_id": {"$ne": obj_id},
         "username": validated_data.username
-    })
+    }, {"_id": 1})
     
     if existing_user:
         raise HTTPException(status_code=409, detail="Username is already taken.")
@@ -190,13 +216,19 @@ async def update_school_profile(
     # 5. Execute an atomic update in the database
     result = await db["schools"].find_one_and_update(
         {"_id": obj_id},
-        {"$set": update_dict},
+        bump_version({"$set": update_dict}),
         return_document=True
     )
 
     if not result:
         raise HTTPException(status_code=404, detail="School not found.")
 
+    # Keep the availability filter in sync with renamed usernames
+    availability_index.register("school", username=result.get("username"))
+
+    # Rewrite the author copies embedded in posts and comments in the background
+    schedule_author_sync(schoolId)
+
     # 6. Return standard success response
     return {
         "success": True,
@@ -228,10 +260,10 @@ async def login_school(credentials: SchoolLogin):
             {"email": identifier_lower},
             {"username": identifier_lower}
         ]
-    })
+    }, {"password": 1, "username": 1, "instituteName": 1})
 
     # 2. Verify if school exists and password matches
-    if not school_data or not verify_password(credentials.password, school_data["password"]):
+    if not school_data or not await run_in_bcrypt_pool(verify_password, credentials.password, school_data["password"]):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid email/username or password."
@@ -255,4 +287,93 @@ async def login_school(credentials: SchoolLogin):
             "username": school_data.get("username"),
             "instituteName": school_data.get("instituteName")
         }
-    }
\ No newline at end of file
+    }
+
+# 5. GET /api/schools/{schoolId}/profile/sync-status
+
+@router.get("/{schoolId}/profile/sync-status", status_code=status.HTTP_200_OK)
+async def get_profile_sync_status(
+    schoolId: str,
+    current_user_id: str = Depends(get_current_user_id)
+):
+    """
+    Reports the progress of the background job that propagates profile changes
+    into the author fields embedded in the school's posts and comments.
+    """
+    if current_user_id != schoolId:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Forbidden. You can only view your own sync status."
+        )
+
+    db = db_instance.db
+    if db is None:
+        raise HTTPException(status_code=500, detail="Database connection failed.")
+
+    return {
+        "success": True,
+        "data": await get_author_sync_status(db, schoolId)
+    }
+
+
+# 6. GET /api/schools/{schoolId}/posts (School Timeline)
+
+@router.get("/{schoolId}/posts", status_code=status.HTTP_200_OK)
+async def get_school_posts(
+    schoolId: str,
+    cursor: Optional[str] = None,
+    limit: int = Query(10, ge=1, le=50),
+    selection: FieldSelection = Depends(sparse_fields(POST_SOURCES, POST_REQUIRED)),
+    current_user_id: str = Depends(get_current_user_id)
+):
+    """
+    Fetches one school's posts, newest first, using keyset pagination on the
+    (schoolId, createdAt, _id) index. Pass the returned nextCursor to load the next page.
+    `?fields=` narrows both the projection and the returned post objects.
+    """
+    db = db_instance.db
+    if db is None:
+        raise HTTPException(status_code=500, detail="Database connection failed.")
+
+    try:
+        obj_id = ObjectId(schoolId)
+    except InvalidId:
+        raise HTTPException(status_code=400, detail="Invalid School ID format.")
+
+    school_data = await db["schools"].find_one({"_id": obj_id}, {"stats.posts": 1})
+    if not school_data:
+        raise HTTPException(status_code=404, detail="School not found.")
+
+    # 1. Range scan on the compound index, fetching one extra row to detect another page
+    query = {"schoolId": schoolId, **keyset_filter(cursor)}
+    posts = await db["posts"].find(query, selection.projection()).sort(
+        [("createdAt", -1), ("_id", -1)]
+    ).limit(limit + 1).to_list(length=limit + 1)
+
+    has_more = len(posts) > limit
+    posts = posts[:limit]
+
+    # 2. Post count comes from the maintained counter; schools created before the
+    # counter existed are backfilled once
+    total_posts = school_data.get("stats", {}).get("posts")
+    if total_posts is None:
+        total_posts = await db["posts"].count_documents({"schoolId": schoolId})
+        await db["schools"].update_one(
+            {"_id": obj_id, "stats.posts": {"$exists": False}},
+            bump_version({"$set": {"stats.posts": total_posts}})
+        )
+
+    # 3. Hydrate viewer likes and saves for the whole page in one query each
+    formatted_posts = await serialize_feed_page(db, current_user_id, posts, selection)
+
+    return {
+        "success": True,
+        "message": "School posts fetched successfully.",
+        "data": formatted_posts,
+        "pagination": {
+            "totalPosts": total_posts,
+            "limit": limit,
+            "hasMore": has_more,
+            "nextCursor": encode_cursor(posts[-1]["createdAt"], posts[-1]["_id"]) if has_more else None
+        }
+    }
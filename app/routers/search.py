@@ -0,0 +1,76 @@
+from typing import Literal, Optional
+from fastapi import APIRouter, HTTPException, status, Depends, Query
+
+from app.core.database import db_instance
+from app.core.security import get_current_user_id
+from app.models.post import COMMENT_REQUIRED, COMMENT_SOURCES, POST_REQUIRED, POST_SOURCES, serialize_comment
+from app.utils.feed import serialize_feed_page
+from app.utils.projection import FIELDS_DESCRIPTION, select_fields
+from app.utils.text_search import tokenize
+
+router = APIRouter(prefix="/api/search", tags=["Search"])
+
+# 1. GET /api/search (Full-text search over posts or comments)
+@router.get("/", status_code=status.HTTP_200_OK)
+async def search(
+    q: str = Query(..., min_length=1, max_length=200),
+    scope: Literal["posts", "comments"] = "posts",
+    page: int = Query(1, ge=1),
+    limit: int = Query(10, ge=1, le=50),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    current_user_id: str = Depends(get_current_user_id)
+):
+    """
+    Searches post content or comment text. The query is normalized with the same
+    English / Roman Urdu tokenizer used when documents are written, matched against
+    the text index, and ranked by relevance (newest first on ties).
+    `fields` names post or comment fields depending on the scope; score (and postId
+    for comments) is always returned.
+    """
+    db = db_instance.db
+    if db is None:
+        raise HTTPException(status_code=500, detail="Database connection failed.")
+
+    if scope == "posts":
+        selection = select_fields(fields, POST_SOURCES, POST_REQUIRED)
+    else:
+        selection = select_fields(fields, COMMENT_SOURCES, COMMENT_REQUIRED + ("postId",))
+
+    tokens = tokenize(q)
+    if not tokens:
+        return {
+            "success": True,
+            "data": [],
+            "pagination": {"currentPage": page, "limit": limit, "hasMore": False}
+        }
+
+    collection = "posts" if scope == "posts" else "post_comments"
+    skip = (page - 1) * limit
+
+    # Fetch one extra row to know whether another page exists without counting matches
+    cursor = db[collection].find(
+        {"$text": {"$search": " ".join(tokens)}},
+        {**selection.projection(), "score": {"$meta": "textScore"}}
+    ).sort([("score", {"$meta": "textScore"}), ("createdAt", -1)]).skip(skip).limit(limit + 1)
+    results = await cursor.to_list(length=limit + 1)
+
+    has_more = len(results) > limit
+    results = results[:limit]
+
+    if scope == "posts":
+        formatted_posts = await serialize_feed_page(db, current_user_id, results, selection)
+        data = [
+            {**formatted, "score": post["score"]}
+            for formatted, post in zip(formatted_posts, results)
+        ]
+    else:
+        data = [
+            {**selection.apply(serialize_comment(c)), "postId": c["postId"], "score": c["score"]}
+            for c in results
+        ]
+
+    return {
+        "success": True,
+        "data": data,
+        "pagination": {"currentPage": page, "limit": limit, "hasMore": has_more}
+    }
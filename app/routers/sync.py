@@ -0,0 +1,119 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+
+from app.core.config import settings
+from app.core.database import db_instance
+from app.core.security import get_current_user
+from app.models.donor import DonorProfileResponse, DONOR_PROFILE_SOURCES, serialize_donor_profile
+from app.models.hope import HopeResponse, HOPE_REQUIRED, HOPE_SOURCES, serialize_hope
+from app.models.post import POST_REQUIRED, POST_SOURCES
+from app.models.school import SchoolPublicProfileResponse, SCHOOL_PUBLIC_PROFILE_SOURCES, serialize_school_profile
+from app.utils.feed import serialize_feed_page
+from app.utils.projection import FieldSelection
+from app.utils.sync import (
+    END_OF_MILLISECOND,
+    TOMBSTONES_COLLECTION,
+    Position,
+    decode_sync_token,
+    encode_sync_token,
+    read_changes,
+    tombstone_horizon,
+)
+
+router = APIRouter(prefix="/api/sync", tags=["Sync"])
+
+# Projection of each synced collection: the fields of its API representation
+PROJECTIONS = {
+    "posts": FieldSelection(POST_SOURCES, POST_REQUIRED).projection(),
+    "hopes": FieldSelection(HOPE_SOURCES, HOPE_REQUIRED).projection(),
+    # Every school is synced, so only the public profile: never contact details or CNIC
+    "schools": FieldSelection(SCHOOL_PUBLIC_PROFILE_SOURCES).projection(),
+    "donors": {**FieldSelection(DONOR_PROFILE_SOURCES).projection(), "is_deleted": 1},
+}
+
+
+# 1. GET /api/sync (Delta Sync for Offline Clients)
+@router.get("/", status_code=status.HTTP_200_OK)
+async def sync_changes(
+    since: Optional[str] = Query(None, description="nextToken of the previous sync; omit for a full snapshot"),
+    limit: int = Query(settings.SYNC_PAGE_SIZE, ge=1, le=settings.SYNC_MAX_PAGE_SIZE),
+    current_user: Dict[str, str] = Depends(get_current_user)
+):
+    """
+    Returns the posts, hopes, school and donor profiles created or updated since `since`,
+    plus the ids of deleted ones, in the same shapes as the regular endpoints (school
+    profiles without email, phone and CNIC).
+    Each collection is read in (updatedAt, _id) order, at most `limit` documents per
+    collection per call. Store `nextToken` and call again while `hasMore` is true;
+    a token can be resumed at any time. Without `since` the full data set is returned
+    (paged the same way). A token older than the tombstone retention gets 410, and the
+    client must resync from scratch.
+    """
+    db = db_instance.db
+    if db is None:
+        raise HTTPException(status_code=500, detail="Database connection failed.")
+
+    positions: Dict[str, Position] = decode_sync_token(since)
+    until = datetime.now(timezone.utc) - timedelta(seconds=settings.SYNC_SETTLE_SECONDS)
+
+    # 1. Deletions: a full snapshot needs none, and an old token may have missed expired tombstones
+    tombstone_position = positions.get("tombstones")
+    if since and (tombstone_position is None or tombstone_position[0] < tombstone_horizon(settings.SYNC_TOMBSTONE_RETENTION_DAYS)):
+        raise HTTPException(status_code=status.HTTP_410_GONE, detail="Sync token expired. Resync without `since`.")
+    if tombstone_position is None:
+        tombstone_position = (until, END_OF_MILLISECOND)
+
+    # 2. One keyset page per stream, read concurrently
+    streams = {
+        **{collection: (collection, positions.get(collection), projection) for collection, projection in PROJECTIONS.items()},
+        "tombstones": (TOMBSTONES_COLLECTION, tombstone_position, {"collection": 1, "docId": 1}),
+    }
+    results = await asyncio.gather(*(
+        read_changes(db, collection, position, until, limit, projection)
+        for collection, position, projection in streams.values()
+    ))
+
+    has_more = False
+    pages = {}
+    for key, docs in zip(streams, results):
+        if len(docs) > limit:
+            has_more = True
+            docs = docs[:limit]
+            positions[key] = (docs[-1]["updatedAt"], docs[-1]["_id"])
+        else:
+            # Stream exhausted: everything up to the settle horizon has been delivered
+            positions[key] = (until, END_OF_MILLISECOND)
+        pages[key] = docs
+
+    # 3. Serialize with the same mappers as the regular endpoints
+    deleted = {}
+    for tombstone in pages["tombstones"]:
+        deleted.setdefault(tombstone["collection"], []).append(tombstone["docId"])
+
+    return {
+        "success": True,
+        "message": "Changes fetched successfully.",
+        "data": {
+            "posts": await serialize_feed_page(db, current_user["id"], pages["posts"]),
+            "hopes": [
+                HopeResponse(**serialize_hope(hope)).model_dump(mode="json", by_alias=True)
+                for hope in pages["hopes"]
+            ],
+            "schools": [
+                SchoolPublicProfileResponse(**serialize_school_profile(school)).model_dump(mode="json")
+                for school in pages["schools"]
+            ],
+            "donors": [
+                DonorProfileResponse(**serialize_donor_profile(donor)).model_dump(mode="json")
+                for donor in pages["donors"] if not donor.get("is_deleted", False)
+            ],
+            "deleted": deleted
+        },
+        "sync": {
+            "nextToken": encode_sync_token(positions),
+            "hasMore": has_more
+        }
+    }
@@ -0,0 +1,55 @@
+import asyncio
+import logging
+import uuid
+from typing import Optional
+
+from app.utils.etag import bump_version
+
+logger = logging.getLogger(__name__)
+
+_backfill_task: Optional[asyncio.Task] = None
+
+
+def assign_achievement_ids(achievements: list) -> list:
+    """Gives every achievement without one the stable id the per-item routes address it by."""
+    return [{**ach, "id": ach.get("id") or uuid.uuid4().hex} for ach in achievements]
+
+
+async def backfill_achievement_ids(db, batch_size: int = 200) -> None:
+    """
+    Assigns ids to achievements stored before they had one, in small batches, so they can
+    be updated and removed one by one. Each donor is rewritten only if their list is still
+    the one that was read; a concurrent edit assigns ids itself.
+    """
+    last_id = None
+    try:
+        while True:
+            query = {"achievements": {"$elemMatch": {"id": None}}}
+            if last_id is not None:
+                query["_id"] = {"$gt": last_id}
+            donors = await db["donors"].find(query, {"achievements": 1}).sort("_id", 1).limit(batch_size).to_list(length=batch_size)
+            if not donors:
+                return
+            for donor in donors:
+                await db["donors"].update_one(
+                    {"_id": donor["_id"], "achievements": donor["achievements"]},
+                    bump_version({"$set": {"achievements": assign_achievement_ids(donor["achievements"])}}),
+                )
+            last_id = donors[-1]["_id"]
+            await asyncio.sleep(0)
+    except Exception as e:
+        logger.error(f"Achievement id backfill failed: {e}")
+
+
+def start_achievement_backfill(db) -> None:
+    global _backfill_task
+    if _backfill_task is None or _backfill_task.done():
+        _backfill_task = asyncio.create_task(backfill_achievement_ids(db))
+
+
+async def stop_achievement_backfill() -> None:
+    global _backfill_task
+    if _backfill_task is not None:
+        _backfill_task.cancel()
+        await asyncio.gather(_backfill_task, return_exceptions=True)
+        _backfill_task = None
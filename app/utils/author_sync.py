@@ -0,0 +1,215 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Set
+
+from bson import ObjectId
+from pymongo.errors import DuplicateKeyError
+
+from app.core.config import settings
+from app.core.database import db_instance
+from app.core.query_stats import create_untracked_task
+from app.utils.etag import bump_version
+
+logger = logging.getLogger(__name__)
+
+JOBS_COLLECTION = "author_sync_jobs"
+
+# school_id -> running propagation task (in-process dedupe guard)
+_running_jobs: Dict[str, asyncio.Task] = {}
+# Schools updated again while their job was running in this process
+_pending_reruns: Set[str] = set()
+
+
+def embedded_post_fields(school: dict) -> dict:
+    """Author fields copied into every post (must match create_post)."""
+    return {
+        "authorName": school.get("name", "Unknown"),
+        "authorUsername": school.get("username", "unknown"),
+        "authorProfilePic": school.get("profilePicture", ""),
+        "isVerified": school.get("badge", False),
+    }
+
+
+def embedded_comment_fields(school: dict) -> dict:
+    """Author fields copied into every comment (must match add_comment)."""
+    return {
+        "username": school.get("username", "Unknown"),
+        "userProfilePic": school.get("profilePicture", ""),
+    }
+
+
+def schedule_author_sync(school_id: str) -> None:
+    """
+    Starts a background job that rewrites the school's embedded author fields.
+    If a job for this school is already running in this process, the request is
+    recorded as a rerun so the latest profile is propagated once it finishes.
+    """
+    task = _running_jobs.get(school_id)
+    if task is not None and not task.done():
+        _pending_reruns.add(school_id)
+        return
+    _running_jobs[school_id] = create_untracked_task(_run_job(school_id))
+
+
+async def cancel_author_sync_jobs() -> None:
+    """Cancels in-flight jobs on shutdown; their leases expire and the next update resumes them."""
+    tasks = [task for task in _running_jobs.values() if not task.done()]
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    _running_jobs.clear()
+    _pending_reruns.clear()
+
+
+async def _acquire_lease(db, school_id: str) -> bool:
+    """
+    Claims the job document for this school. Fails when another worker holds a live
+    lease, in which case that worker is asked to rerun with the latest profile.
+    """
+    while True:
+        now = datetime.now(timezone.utc)
+        try:
+            await db[JOBS_COLLECTION].update_one(
+                {
+                    "_id": school_id,
+                    "$or": [{"status": {"$ne": "running"}}, {"leaseExpiresAt": {"$lt": now}}],
+                },
+                {
+                    "$set": {
+                        "status": "running",
+                        "rerunRequested": False,
+                        "postsUpdated": 0,
+                        "commentsUpdated": 0,
+                        "previewPostsUpdated": 0,
+                        "startedAt": now,
+                        "finishedAt": None,
+                        "error": None,
+                        "leaseExpiresAt": now + timedelta(seconds=settings.AUTHOR_SYNC_LEASE_SECONDS),
+                    }
+                },
+                upsert=True,
+            )
+            return True
+        except DuplicateKeyError:
+            result = await db[JOBS_COLLECTION].update_one(
+                {"_id": school_id, "status": "running"}, {"$set": {"rerunRequested": True}}
+            )
+            if result.matched_count:
+                return False
+            # The other job finished in between; try to claim the lease again
+
+
+async def _rewrite_in_batches(
+    db, collection: str, stale_filter: dict, update: dict, progress_field: str, school_id: str, **options
+) -> None:
+    """Applies `update` to stale documents in throttled update_many batches, recording progress after each."""
+    while True:
+        cursor = db[collection].find(stale_filter, {"_id": 1, "postId": 1}).limit(settings.AUTHOR_SYNC_BATCH_SIZE)
+        docs = [doc async for doc in cursor]
+        if not docs:
+            return
+
+        ids = [doc["_id"] for doc in docs]
+        result = await db[collection].update_many({"_id": {"$in": ids}}, bump_version(update), **options)
+        if collection == "post_comments":
+            # Cached comment pages are keyed on their post's commentsVersion
+            post_ids = list({ObjectId(doc["postId"]) for doc in docs if ObjectId.is_valid(doc.get("postId"))})
+            await db["posts"].update_many({"_id": {"$in": post_ids}}, {"$inc": {"commentsVersion": 1}})
+
+        await db[JOBS_COLLECTION].update_one(
+            {"_id": school_id},
+            {
+                "$inc": {progress_field: result.modified_count},
+                "$set": {
+                    "leaseExpiresAt": datetime.now(timezone.utc)
+                    + timedelta(seconds=settings.AUTHOR_SYNC_LEASE_SECONDS)
+                },
+            },
+        )
+        await asyncio.sleep(settings.AUTHOR_SYNC_THROTTLE_SECONDS)
+
+
+async def _propagate(db, school_id: str) -> None:
+    school = await db["schools"].find_one(
+        {"_id": ObjectId(school_id)},
+        {"name": 1, "username": 1, "profilePicture": 1, "badge": 1},
+    )
+    if not school:
+        return
+
+    # Only documents that still hold an outdated copy are selected, so reruns are cheap
+    post_fields = embedded_post_fields(school)
+    await _rewrite_in_batches(
+        db,
+        "posts",
+        {"schoolId": school_id, "$or": [{k: {"$ne": v}} for k, v in post_fields.items()]},
+        {"$set": post_fields},
+        "postsUpdated",
+        school_id,
+    )
+
+    comment_fields = embedded_comment_fields(school)
+    await _rewrite_in_batches(
+        db,
+        "post_comments",
+        {"userId": school_id, "$or": [{k: {"$ne": v}} for k, v in comment_fields.items()]},
+        {"$set": comment_fields},
+        "commentsUpdated",
+        school_id,
+    )
+
+    # Preview comments embedded in posts carry the same copies
+    await _rewrite_in_batches(
+        db,
+        "posts",
+        {
+            "previewComments": {
+                "$elemMatch": {"userId": school_id, "$or": [{k: {"$ne": v}} for k, v in comment_fields.items()]}
+            }
+        },
+        {"$set": {f"previewComments.$[c].{k}": v for k, v in comment_fields.items()}},
+        "previewPostsUpdated",
+        school_id,
+        array_filters=[{"c.userId": school_id}],
+    )
+
+
+async def _run_job(school_id: str) -> None:
+    db = db_instance.db
+    try:
+        if not await _acquire_lease(db, school_id):
+            return
+
+        while True:
+            await _propagate(db, school_id)
+
+            # Finish only if nobody asked for a rerun while we were working
+            result = await db[JOBS_COLLECTION].update_one(
+                {"_id": school_id, "rerunRequested": False},
+                {"$set": {"status": "completed", "finishedAt": datetime.now(timezone.utc)}},
+            )
+            if result.modified_count:
+                break
+            await db[JOBS_COLLECTION].update_one(
+                {"_id": school_id}, {"$set": {"rerunRequested": False}}
+            )
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        logger.error(f"Author sync for school {school_id} failed: {e}")
+        await db[JOBS_COLLECTION].update_one(
+            {"_id": school_id},
+            {"$set": {"status": "failed", "error": str(e), "finishedAt": datetime.now(timezone.utc)}},
+        )
+    finally:
+        if _running_jobs.get(school_id) is asyncio.current_task():
+            _running_jobs.pop(school_id, None)
+            if school_id in _pending_reruns:
+                _pending_reruns.discard(school_id)
+                schedule_author_sync(school_id)
+
+
+async def get_author_sync_status(db, school_id: str) -> dict:
+    job = await db[JOBS_COLLECTION].find_one({"_id": school_id}, {"_id": 0, "leaseExpiresAt": 0})
+    return job or {"status": "idle"}
@@ -0,0 +1,132 @@
+import asyncio
+import logging
+import time
+from typing import Dict, Optional, Tuple
+
+from app.core.config import settings
+from app.core.startup import startup_timer
+from app.utils.bloom_filter import BloomFilter
+
+logger = logging.getLogger(__name__)
+
+# Account type -> MongoDB collection holding those accounts
+ACCOUNT_COLLECTIONS = {"donor": "donors", "school": "schools"}
+CHECKED_FIELDS = ("username", "email")
+
+
+class AvailabilityIndex:
+    """
+    In-memory Bloom filters of taken usernames and emails, one per account type and field.
+    Only values the filter reports as "maybe taken" need a database lookup.
+
+    The filters are per-process: they are warmed from MongoDB at startup and updated by the
+    signup and rename routes handled by this worker, so they are an advisory pre-check and
+    never replace the database duplicate checks performed on signup.
+    """
+
+    def __init__(self):
+        self._filters: Dict[Tuple[str, str], BloomFilter] = {}
+        self._pending: Optional[list] = None
+        self.is_warm = False
+
+    async def warm_up(self, db) -> None:
+        """Builds fresh filters from every stored account and swaps them in."""
+        self._pending = []
+        try:
+            filters = {}
+            for account_type, collection in ACCOUNT_COLLECTIONS.items():
+                existing = await db[collection].estimated_document_count()
+                capacity = max(settings.AVAILABILITY_FILTER_CAPACITY, existing * 2)
+                for field in CHECKED_FIELDS:
+                    filters[(account_type, field)] = BloomFilter(capacity, settings.AVAILABILITY_FILTER_ERROR_RATE)
+
+                cursor = db[collection].find({}, {"_id": 0, "username": 1, "email": 1}).stream()
+                async for doc in cursor:
+                    for field in CHECKED_FIELDS:
+                        if doc.get(field):
+                            filters[(account_type, field)].add(doc[field].lower())
+
+            # Replay values registered by signups that raced with the warm-up scan
+            for account_type, field, value in self._pending:
+                filters[(account_type, field)].add(value)
+
+            self._filters = filters
+            self.is_warm = True
+            logger.info("Availability filters warmed (%d bytes).", self.memory_bytes)
+        except Exception as e:
+            # A cold filter only means every check falls through to the database
+            logger.error(f"Failed to warm availability filters: {e}")
+        finally:
+            self._pending = None
+
+    def register(self, account_type: str, username: Optional[str] = None, email: Optional[str] = None) -> None:
+        """Marks a username and/or email as taken after a signup or rename."""
+        for field, value in (("username", username), ("email", email)):
+            if not value:
+                continue
+            value = value.lower()
+            if self._pending is not None:
+                self._pending.append((account_type, field, value))
+            bloom = self._filters.get((account_type, field))
+            if bloom is not None:
+                bloom.add(value)
+
+    def might_be_taken(self, account_type: str, field: str, value: str) -> bool:
+        """Returns False only when the value is definitely not taken."""
+        if not self.is_warm:
+            return True
+        return value.lower() in self._filters[(account_type, field)]
+
+    @property
+    def memory_bytes(self) -> int:
+        return sum(bloom.memory_bytes for bloom in self._filters.values())
+
+    def stats(self) -> dict:
+        return {
+            "isWarm": self.is_warm,
+            "memoryBytes": self.memory_bytes,
+            "filters": [
+                {
+                    "accountType": account_type,
+                    "field": field,
+                    "items": bloom.count,
+                    "capacity": bloom.capacity,
+                    "bits": bloom.num_bits,
+                    "hashes": bloom.num_hashes,
+                    "memoryBytes": bloom.memory_bytes,
+                    "estimatedFalsePositiveRate": round(bloom.estimated_false_positive_rate, 6),
+                }
+                for (account_type, field), bloom in self._filters.items()
+            ],
+        }
+
+
+# Global availability index shared by the routers
+availability_index = AvailabilityIndex()
+
+
+_warm_up_task: Optional[asyncio.Task] = None
+
+
+async def _timed_warm_up(db) -> None:
+    start = time.perf_counter()
+    await availability_index.warm_up(db)
+    startup_timer.record("availability warm-up (background)", time.perf_counter() - start)
+
+
+def start_availability_warm_up(db) -> None:
+    """
+    Warms the filters in the background: a full account scan should not delay startup,
+    and until the filters are warm every check simply falls through to the database.
+    """
+    global _warm_up_task
+    if _warm_up_task is None or _warm_up_task.done():
+        _warm_up_task = asyncio.create_task(_timed_warm_up(db))
+
+
+async def stop_availability_warm_up() -> None:
+    global _warm_up_task
+    if _warm_up_task is not None:
+        _warm_up_task.cancel()
+        await asyncio.gather(_warm_up_task, return_exceptions=True)
+        _warm_up_task = None
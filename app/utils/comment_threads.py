@@ -0,0 +1,162 @@
+import asyncio
+import logging
+import re
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional
+
+from bson import ObjectId
+
+from app.core.config import settings
+from app.core.database import db_instance
+from app.core.query_stats import create_untracked_task
+from app.utils.etag import bump_version
+
+logger = logging.getLogger(__name__)
+
+JOBS_COLLECTION = "comment_delete_jobs"
+
+# Deleted comment id -> in-flight subtree deletion in this process
+_delete_tasks: Dict[ObjectId, asyncio.Task] = {}
+_sweeper_task: Optional[asyncio.Task] = None
+
+
+def child_path(parent: dict) -> str:
+    """Materialized path of a reply: the parent's path followed by the parent's id."""
+    return f"{parent.get('path', '')}{parent['_id']}/"
+
+
+def subtree_filter(comment: dict) -> dict:
+    """Selects every descendant of a comment with an anchored prefix match on the indexed path."""
+    return {
+        "postId": comment["postId"],
+        "path": {"$regex": "^" + re.escape(child_path(comment))},
+    }
+
+
+async def delete_subtree(db, comment: dict) -> None:
+    """Deletes a comment's descendants in bounded, throttled batches and fixes the post counters."""
+    post_id = ObjectId(comment["postId"])
+    query = subtree_filter(comment)
+
+    while True:
+        batch = await db["post_comments"].find(query, {"_id": 1}).limit(
+            settings.COMMENT_DELETE_BATCH_SIZE
+        ).to_list(length=settings.COMMENT_DELETE_BATCH_SIZE)
+        if not batch:
+            return
+
+        result = await db["post_comments"].delete_many({"_id": {"$in": [doc["_id"] for doc in batch]}})
+        if result.deleted_count:
+            # Every descendant is a reply
+            await db["posts"].update_one(
+                {"_id": post_id},
+                bump_version(
+                    {"$inc": {"commentsCount": -result.deleted_count, "repliesCount": -result.deleted_count}},
+                    "version",
+                    "commentsVersion",
+                ),
+            )
+        # Keep the job's lease while batches are still being deleted
+        await db[JOBS_COLLECTION].update_one({"_id": comment["_id"]}, {"$set": {"leaseExpiresAt": _lease_expiry()}})
+        await asyncio.sleep(settings.COMMENT_DELETE_THROTTLE_SECONDS)
+
+
+def _lease_expiry() -> datetime:
+    return datetime.now(timezone.utc) + timedelta(seconds=settings.COMMENT_DELETE_LEASE_SECONDS)
+
+
+async def record_subtree_delete(db, comment: dict) -> None:
+    """
+    Persists the pending deletion of a comment's replies before the comment itself is
+    deleted, leased to this worker. Until the job document is removed, the sweeper of
+    any worker resumes it once the lease expires (after a crash or shutdown).
+    """
+    await db[JOBS_COLLECTION].update_one(
+        {"_id": comment["_id"]},
+        {
+            "$set": {"leaseExpiresAt": _lease_expiry()},
+            "$setOnInsert": {
+                "postId": comment["postId"],
+                "path": comment.get("path", ""),
+                "createdAt": datetime.now(timezone.utc),
+                "attempts": 0,
+                "error": None,
+            },
+        },
+        upsert=True,
+    )
+
+
+async def _run_job(job: dict) -> None:
+    db = db_instance.db
+    try:
+        await delete_subtree(db, job)
+        await db[JOBS_COLLECTION].delete_one({"_id": job["_id"]})
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        logger.error(f"Deleting replies of comment {job['_id']} failed: {e}")
+        # Released at once, so the next sweep retries it
+        await db[JOBS_COLLECTION].update_one(
+            {"_id": job["_id"]},
+            {"$set": {"error": str(e), "leaseExpiresAt": datetime.now(timezone.utc)}, "$inc": {"attempts": 1}},
+        )
+    finally:
+        if _delete_tasks.get(job["_id"]) is asyncio.current_task():
+            _delete_tasks.pop(job["_id"], None)
+
+
+def schedule_subtree_delete(comment: dict) -> None:
+    """Deletes the replies of a comment recorded with record_subtree_delete in the background."""
+    task = _delete_tasks.get(comment["_id"])
+    if task is not None and not task.done():
+        return
+    job = {"_id": comment["_id"], "postId": comment["postId"], "path": comment.get("path", "")}
+    _delete_tasks[comment["_id"]] = create_untracked_task(_run_job(job))
+
+
+async def resume_subtree_deletes(db) -> int:
+    """Claims the jobs whose lease has expired and runs them in this worker."""
+    resumed = 0
+    cursor = db[JOBS_COLLECTION].find({"leaseExpiresAt": {"$lt": datetime.now(timezone.utc)}}, {"postId": 1, "path": 1})
+    for job in await cursor.to_list(None):
+        # Another worker may have claimed the same job since the find
+        claimed = await db[JOBS_COLLECTION].update_one(
+            {"_id": job["_id"], "leaseExpiresAt": {"$lt": datetime.now(timezone.utc)}},
+            {"$set": {"leaseExpiresAt": _lease_expiry()}},
+        )
+        if claimed.modified_count:
+            schedule_subtree_delete(job)
+            resumed += 1
+    return resumed
+
+
+async def _sweep_loop() -> None:
+    while True:
+        try:
+            resumed = await resume_subtree_deletes(db_instance.db)
+            if resumed:
+                logger.info("Resumed %d interrupted reply deletions.", resumed)
+        except Exception as e:
+            logger.error(f"Reply deletion sweep failed: {e}")
+        await asyncio.sleep(settings.COMMENT_DELETE_SWEEP_SECONDS)
+
+
+def start_subtree_delete_sweeper() -> None:
+    """Resumes interrupted deletions at startup, then keeps picking up abandoned jobs."""
+    global _sweeper_task
+    if _sweeper_task is None or _sweeper_task.done():
+        _sweeper_task = asyncio.create_task(_sweep_loop())
+
+
+async def cancel_subtree_deletes() -> None:
+    """Stops the sweeper and in-flight deletions; their leases expire and a sweep resumes them."""
+    global _sweeper_task
+    tasks = [task for task in _delete_tasks.values() if not task.done()]
+    if _sweeper_task is not None:
+        tasks.append(_sweeper_task)
+        _sweeper_task = None
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    _delete_tasks.clear()
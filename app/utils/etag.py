@@ -0,0 +1,59 @@
+import hashlib
+from datetime import datetime, timezone
+from typing import Any, Optional
+
+from fastapi import Request, Response
+
+from app.core.metrics import cache_requests
+
+
+def make_etag(*parts: Any) -> str:
+    """Builds a weak ETag from the version information that determines a response body."""
+    digest = hashlib.blake2b(repr(parts).encode("utf-8"), digest_size=12).hexdigest()
+    return f'W/"{digest}"'
+
+
+def not_modified(request: Request, etag: str) -> Optional[Response]:
+    """
+    Returns a ready 304 response when the client's If-None-Match already matches,
+    so the route can skip loading and serializing the body.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return None
+    candidates = {tag.strip() for tag in if_none_match.split(",")}
+    # Weak comparison: W/"x" and "x" are equivalent for GET revalidation
+    if "*" in candidates or etag in candidates or etag.removeprefix("W/") in candidates:
+        cache_requests.inc("etag", "hit")
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": "no-cache"})
+    cache_requests.inc("etag", "miss")
+    return None
+
+
+def set_etag(response: Response, etag: str) -> None:
+    response.headers["ETag"] = etag
+    # Clients may store the body but must revalidate before reusing it
+    response.headers["Cache-Control"] = "no-cache"
+
+
+async def get_collection_version(db, name: str) -> int:
+    """Version counter for collection-level listings, bumped by bump_collection_version."""
+    doc = await db["collection_versions"].find_one({"_id": name}, {"version": 1})
+    return doc["version"] if doc else 0
+
+
+async def bump_collection_version(db, name: str) -> None:
+    await db["collection_versions"].update_one({"_id": name}, {"$inc": {"version": 1}}, upsert=True)
+
+
+def bump_version(update: dict, *fields: str) -> dict:
+    """
+    Adds the version increments that drive ETags (default: `version`) to a MongoDB update
+    document, and stamps `updatedAt`, which drives delta sync (app.routers.sync).
+    """
+    increments = {field: 1 for field in fields or ("version",)}
+    return {
+        **update,
+        "$inc": {**update.get("$inc", {}), **increments},
+        "$set": {**update.get("$set", {}), "updatedAt": datetime.now(timezone.utc)},
+    }
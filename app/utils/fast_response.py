@@ -0,0 +1,52 @@
+from functools import lru_cache
+from typing import AbstractSet, Any, Dict, Iterable, List, Optional, Set, Type
+
+from fastapi import Response
+from pydantic import BaseModel, TypeAdapter
+
+
+@lru_cache(maxsize=None)
+def _list_adapter(model: Type[BaseModel]) -> TypeAdapter:
+    return TypeAdapter(List[model])
+
+
+def _include(model: Type[BaseModel], fields: Optional[AbstractSet[str]]) -> Optional[Set[str]]:
+    """Maps requested response keys (aliases where the model has them) to model field names."""
+    if fields is None:
+        return None
+    names = {info.alias or name: name for name, info in model.model_fields.items()}
+    return {names[field] for field in fields}
+
+
+def json_list_response(
+    model: Type[BaseModel],
+    rows: Iterable[Dict[str, Any]],
+    headers: Optional[Dict[str, str]] = None,
+    fields: Optional[AbstractSet[str]] = None,
+) -> Response:
+    """
+    Fast path for list endpoints built from database rows.
+    The rows (plain dicts with the model's field names) are validated once and encoded to
+    JSON inside pydantic-core. Returning a Response directly also skips FastAPI's second pass
+    (response_model re-validation, jsonable_encoder and json.dumps); the output is identical.
+    Keep `response_model` on the route for the OpenAPI schema.
+    `fields` (response keys of a sparse fieldset) limits which keys are encoded.
+    """
+    adapter = _list_adapter(model)
+    include = _include(model, fields)
+    content = adapter.dump_json(
+        adapter.validate_python(list(rows)), by_alias=True,
+        include={"__all__": include} if include is not None else None
+    )
+    return Response(content=content, media_type="application/json", headers=headers)
+
+
+def json_object_response(
+    model: Type[BaseModel],
+    row: Dict[str, Any],
+    headers: Optional[Dict[str, str]] = None,
+    fields: Optional[AbstractSet[str]] = None,
+) -> Response:
+    """Single-object counterpart of json_list_response, used for sparse fieldsets."""
+    content = model.model_validate(row).model_dump_json(by_alias=True, include=_include(model, fields))
+    return Response(content=content, media_type="application/json", headers=headers)
@@ -0,0 +1,46 @@
+import asyncio
+from typing import List, Optional, Set
+
+from app.models.post import serialize_post
+from app.utils.projection import FieldSelection
+
+
+async def fetch_liked_post_ids(db, viewer_id: str, post_ids: List[str]) -> Set[str]:
+    """Returns which of the given posts the viewer has liked, using one $in query."""
+    if not post_ids:
+        return set()
+    cursor = db["post_likes"].find(
+        {"schoolId": viewer_id, "postId": {"$in": post_ids}},
+        {"_id": 0, "postId": 1},
+    )
+    return {like["postId"] async for like in cursor}
+
+
+async def fetch_saved_post_ids(db, viewer_id: str, post_ids: List[str]) -> Set[str]:
+    """Returns which of the given posts the viewer has saved, using one $in query."""
+    if not post_ids:
+        return set()
+    cursor = db["post_saves"].find(
+        {"userId": viewer_id, "postId": {"$in": post_ids}},
+        {"_id": 0, "postId": 1},
+    )
+    return {save["postId"] async for save in cursor}
+
+
+async def serialize_feed_page(db, viewer_id: str, posts: List[dict], selection: Optional[FieldSelection] = None) -> List[dict]:
+    """
+    Serializes a page of posts, filling isLikedByMe / isSavedByMe with one batched lookup each.
+    With a sparse fieldset, lookups for flags that were not requested are skipped.
+    """
+    post_ids = [str(post["_id"]) for post in posts]
+    wants_liked = selection is None or selection.wants("isLikedByMe")
+    wants_saved = selection is None or selection.wants("isSavedByMe")
+    liked_ids, saved_ids = await asyncio.gather(
+        fetch_liked_post_ids(db, viewer_id, post_ids if wants_liked else []),
+        fetch_saved_post_ids(db, viewer_id, post_ids if wants_saved else []),
+    )
+    page = [
+        serialize_post(post, is_liked=post_id in liked_ids, is_saved=post_id in saved_ids)
+        for post_id, post in zip(post_ids, posts)
+    ]
+    return selection.apply_all(page) if selection is not None else page
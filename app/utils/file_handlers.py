@@ -2,9 +2,10 @@ import os
 import uuid
 from fastapi import UploadFile, HTTPException
 
-# Define the directory for storing profile images
+from app.core.metrics import upload_bytes
+
+# Define the directory for storing profile images (created on the first upload, not at import)
 UPLOAD_DIR = "uploads/profiles"
-os.makedirs(UPLOAD_DIR, exist_ok=True)
 
 ALLOWED_EXTENSIONS = {"image/jpeg", "image/png", "image/webp", "image/jpg"}
 MAX_FILE_SIZE = 5 * 1024 * 1024  # 5 MB
@@ -34,9 +35,11 @@ async def save_profile_image(file: UploadFile) -> str:
     file_path = os.path.join(UPLOAD_DIR, unique_filename)
 
     # 4. Save the file to the local directory
+    os.makedirs(UPLOAD_DIR, exist_ok=True)
     with open(file_path, "wb") as buffer:
         content = await file.read()
         buffer.write(content)
+    upload_bytes.inc(amount=len(content))
 
     # Ensure forward slashes for URLs
     normalized_path = file_path.replace("\\", "/")
@@ -0,0 +1,43 @@
+import base64
+from datetime import datetime, timezone
+from typing import Optional, Tuple
+
+from bson import ObjectId
+from bson.errors import InvalidId
+from fastapi import HTTPException
+
+
+def encode_cursor(created_at: datetime, doc_id: ObjectId) -> str:
+    """Encodes a (createdAt, _id) keyset position as an opaque URL-safe token."""
+    if created_at.tzinfo is None:
+        created_at = created_at.replace(tzinfo=timezone.utc)
+    millis = int(created_at.timestamp() * 1000)
+    raw = f"{millis}:{doc_id}".encode("ascii")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, ObjectId]:
+    """Decodes a token produced by encode_cursor, raising 400 on tampered input."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        millis, doc_id = base64.urlsafe_b64decode(padded).decode("ascii").split(":")
+        return datetime.fromtimestamp(int(millis) / 1000, tz=timezone.utc), ObjectId(doc_id)
+    except (ValueError, InvalidId, UnicodeDecodeError):
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor.")
+
+
+def keyset_filter(cursor: Optional[str], descending: bool = True, id_field: str = "_id") -> dict:
+    """
+    Builds the filter selecting documents after the cursor position in
+    (createdAt, id_field) order. Returns an empty filter for the first page.
+    """
+    if not cursor:
+        return {}
+    created_at, doc_id = decode_cursor(cursor)
+    op = "$lt" if descending else "$gt"
+    return {
+        "$or": [
+            {"createdAt": {op: created_at}},
+            {"createdAt": created_at, id_field: {op: doc_id}},
+        ]
+    }
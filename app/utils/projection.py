@@ -0,0 +1,70 @@
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from fastapi import HTTPException, Query
+
+FIELDS_DESCRIPTION = "Comma-separated response fields to return (sparse fieldset); omit for all fields."
+
+
+class FieldSelection:
+    """
+    Sparse fieldset of one response shape.
+    `sources` maps each response field to the stored fields it is built from; `required`
+    lists stored fields the serializer always reads. With no `?fields=` the selection
+    covers the whole response and the projection is the route's full declared projection.
+    """
+
+    def __init__(self, sources: Dict[str, Tuple[str, ...]], required: Tuple[str, ...] = (), fields: Optional[Set[str]] = None):
+        self.sources = sources
+        self.required = required
+        self.fields = fields
+
+    @property
+    def is_sparse(self) -> bool:
+        return self.fields is not None
+
+    def wants(self, field: str) -> bool:
+        return self.fields is None or field in self.fields
+
+    def projection(self) -> Dict[str, int]:
+        """Inclusion projection for MongoDB covering the selected response fields (plus _id)."""
+        selected = self.sources if self.fields is None else {f: self.sources[f] for f in self.fields}
+        stored = {"_id"}
+        stored.update(self.required)
+        for source_fields in selected.values():
+            stored.update(source_fields)
+        return {field: 1 for field in sorted(stored)}
+
+    def apply(self, item: dict) -> dict:
+        """Drops the response fields that were not requested."""
+        if self.fields is None:
+            return item
+        return {key: value for key, value in item.items() if key in self.fields}
+
+    def apply_all(self, items: Iterable[dict]) -> List[dict]:
+        return [self.apply(item) for item in items]
+
+    def etag_part(self) -> str:
+        return ",".join(sorted(self.fields)) if self.fields is not None else "*"
+
+
+def select_fields(fields: Optional[str], sources: Dict[str, Tuple[str, ...]], required: Tuple[str, ...] = ()) -> FieldSelection:
+    """Parses a `fields=a,b,c` value for the given response shape; unknown names are a 400."""
+    if fields is None or not fields.strip():
+        return FieldSelection(sources, required)
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = requested - sources.keys()
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown fields: {', '.join(sorted(unknown))}. Allowed: {', '.join(sources)}."
+        )
+    return FieldSelection(sources, required, requested)
+
+
+def sparse_fields(sources: Dict[str, Tuple[str, ...]], required: Tuple[str, ...] = ()):
+    """Builds a dependency that reads the `?fields=` query parameter into a FieldSelection."""
+
+    def dependency(fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION)) -> FieldSelection:
+        return select_fields(fields, sources, required)
+
+    return dependency
@@ -0,0 +1,134 @@
+import asyncio
+import base64
+import json
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+
+from bson import ObjectId
+from bson.errors import InvalidId
+from fastapi import HTTPException
+from pymongo import UpdateOne
+
+logger = logging.getLogger(__name__)
+
+# Collections clients can mirror, and the timestamp a backfill derives a missing `updatedAt` from
+SYNC_COLLECTIONS = {
+    "posts": "createdAt",
+    "hopes": "created_at",
+    "schools": "created_at",
+    "donors": "created_at",
+}
+TOMBSTONES_COLLECTION = "sync_tombstones"
+TOKEN_VERSION = 1
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+# Position after every document stamped with the same millisecond
+END_OF_MILLISECOND = ObjectId("f" * 24)
+
+Position = Tuple[datetime, ObjectId]
+
+_backfill_task: Optional[asyncio.Task] = None
+
+
+async def write_tombstone(db, collection: str, doc_id) -> None:
+    """Records a deletion so clients that already hold the document learn to drop it."""
+    await db[TOMBSTONES_COLLECTION].insert_one({
+        "collection": collection,
+        "docId": str(doc_id),
+        "updatedAt": datetime.now(timezone.utc),
+    })
+
+
+def _to_millis(at: datetime) -> int:
+    # MongoDB stores milliseconds and returns naive UTC datetimes
+    if at.tzinfo is None:
+        at = at.replace(tzinfo=timezone.utc)
+    return (at - _EPOCH) // timedelta(milliseconds=1)
+
+
+def encode_sync_token(positions: Dict[str, Position]) -> str:
+    """Opaque, URL-safe token holding the last (updatedAt, _id) position of every stream."""
+    raw = {
+        "v": TOKEN_VERSION,
+        "p": {stream: [_to_millis(at), str(doc_id)] for stream, (at, doc_id) in positions.items()},
+    }
+    return base64.urlsafe_b64encode(json.dumps(raw, separators=(",", ":")).encode("ascii")).decode("ascii").rstrip("=")
+
+
+def decode_sync_token(token: Optional[str]) -> Dict[str, Position]:
+    """Decodes a token from encode_sync_token; no token means "from the beginning". Raises 400 on tampered input."""
+    if not token:
+        return {}
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        raw = json.loads(base64.urlsafe_b64decode(padded))
+        if raw.get("v") != TOKEN_VERSION:
+            raise ValueError("unsupported token version")
+        return {
+            stream: (_EPOCH + timedelta(milliseconds=int(millis)), ObjectId(doc_id))
+            for stream, (millis, doc_id) in raw["p"].items()
+        }
+    except (ValueError, TypeError, KeyError, InvalidId, UnicodeDecodeError, AttributeError):
+        raise HTTPException(status_code=400, detail="Invalid sync token.")
+
+
+def changes_filter(position: Optional[Position], until: datetime) -> dict:
+    """Documents changed after `position` in (updatedAt, _id) order, up to the settle horizon `until`."""
+    if position is None:
+        return {"updatedAt": {"$lte": until}}
+    at, doc_id = position
+    return {
+        "updatedAt": {"$lte": until},
+        "$or": [
+            {"updatedAt": {"$gt": at}},
+            {"updatedAt": at, "_id": {"$gt": doc_id}},
+        ],
+    }
+
+
+async def read_changes(db, collection: str, position: Optional[Position], until: datetime, limit: int, projection: dict) -> List[dict]:
+    """One page (plus one look-ahead row) of a stream, oldest change first, served by the (updatedAt, _id) index."""
+    return await db[collection].find(
+        changes_filter(position, until), {**projection, "updatedAt": 1}
+    ).sort([("updatedAt", 1), ("_id", 1)]).limit(limit + 1).to_list(length=limit + 1)
+
+
+def tombstone_horizon(retention_days: int) -> datetime:
+    return datetime.now(timezone.utc) - timedelta(days=retention_days)
+
+
+async def backfill_updated_at(db, batch_size: int = 500) -> None:
+    """Stamps `updatedAt` on documents written before delta sync existed, in small batches."""
+    for collection, created_field in SYNC_COLLECTIONS.items():
+        try:
+            while True:
+                docs = await db[collection].find(
+                    {"updatedAt": {"$exists": False}}, {created_field: 1}
+                ).limit(batch_size).to_list(length=batch_size)
+                if not docs:
+                    break
+                await db[collection].bulk_write([
+                    UpdateOne(
+                        {"_id": doc["_id"], "updatedAt": {"$exists": False}},
+                        {"$set": {"updatedAt": doc.get(created_field) or doc["_id"].generation_time}}
+                    )
+                    for doc in docs
+                ], ordered=False)
+                await asyncio.sleep(0)
+        except Exception as e:
+            logger.error(f"updatedAt backfill for {collection} failed: {e}")
+
+
+def start_sync_backfill(db) -> None:
+    global _backfill_task
+    if _backfill_task is None or _backfill_task.done():
+        _backfill_task = asyncio.create_task(backfill_updated_at(db))
+
+
+async def stop_sync_backfill() -> None:
+    global _backfill_task
+    if _backfill_task is not None:
+        _backfill_task.cancel()
+        await asyncio.gather(_backfill_task, return_exceptions=True)
+        _backfill_task = None
@@ -0,0 +1,106 @@
+import asyncio
+import logging
+import re
+import unicodedata
+from typing import List, Optional
+
+from pymongo import UpdateOne
+
+logger = logging.getLogger(__name__)
+
+_backfill_task: Optional[asyncio.Task] = None
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_REPEATED_LETTERS_RE = re.compile(r"([a-z])\1+")
+
+# Common English and Roman Urdu filler words that carry no search meaning
+STOP_WORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "in", "is", "it",
+    "of", "on", "or", "that", "the", "this", "to", "was", "were", "with",
+    "aur", "bhi", "hai", "hain", "ho", "ka", "ke", "ki", "ko", "mein", "ne",
+    "se", "tha", "thi", "ye", "yeh", "wo", "woh",
+}
+
+# Roman Urdu has no standard spelling; map frequent variants to one canonical form.
+# Keys and values are written after repeated letters have been collapsed.
+ROMAN_URDU_VARIANTS = {
+    "bahut": "bohat", "bohot": "bohat", "bht": "bohat",
+    "nahi": "nahin", "nai": "nahin", "nhi": "nahin", "nahe": "nahin",
+    "kiya": "kia", "kya": "kia",
+    "shukriya": "shukria", "shukrya": "shukria",
+    "talba": "talaba", "talem": "talim",
+    "imdad": "madad",
+    "skol": "schol", "iskol": "schol",
+}
+
+
+def _stem(token: str) -> str:
+    """Very light English suffix stripping so "donations" matches "donation"."""
+    if len(token) > 5 and token.endswith("ing"):
+        return token[:-3]
+    if len(token) > 4 and token.endswith("ies"):
+        return token[:-3] + "y"
+    if len(token) > 4 and token.endswith("ed"):
+        return token[:-2]
+    if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+        return token[:-1]
+    return token
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Normalizes English and Latin-script Urdu text into search tokens:
+    lowercase, accents stripped, repeated letters collapsed ("bohattt" -> "bohat"),
+    spelling variants unified, stop words removed and light stemming applied.
+    """
+    if not text:
+        return []
+    text = unicodedata.normalize("NFKD", text.lower())
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+
+    tokens = []
+    for token in _TOKEN_RE.findall(text):
+        token = _REPEATED_LETTERS_RE.sub(r"\1", token)
+        token = ROMAN_URDU_VARIANTS.get(token, token)
+        if token in STOP_WORDS:
+            continue
+        tokens.append(_stem(token))
+    return tokens
+
+
+def search_text(text: str) -> str:
+    """Value stored in the text-indexed `searchText` field of posts and comments."""
+    return " ".join(tokenize(text))
+
+
+async def backfill_search_text(db, batch_size: int = 500) -> None:
+    """Fills `searchText` on posts and comments written before search existed, in small batches."""
+    for collection, source_field in (("posts", "content"), ("post_comments", "text")):
+        try:
+            while True:
+                docs = await db[collection].find(
+                    {"searchText": {"$exists": False}}, {source_field: 1}
+                ).limit(batch_size).to_list(length=batch_size)
+                if not docs:
+                    break
+                await db[collection].bulk_write([
+                    UpdateOne({"_id": doc["_id"]}, {"$set": {"searchText": search_text(doc.get(source_field, ""))}})
+                    for doc in docs
+                ], ordered=False)
+                await asyncio.sleep(0)
+        except Exception as e:
+            logger.error(f"Search text backfill for {collection} failed: {e}")
+
+
+def start_search_backfill(db) -> None:
+    global _backfill_task
+    if _backfill_task is None or _backfill_task.done():
+        _backfill_task = asyncio.create_task(backfill_search_text(db))
+
+
+async def stop_search_backfill() -> None:
+    global _backfill_task
+    if _backfill_task is not None:
+        _backfill_task.cancel()
+        await asyncio.gather(_backfill_task, return_exceptions=True)
+        _backfill_task = None
@@ -0,0 +1,85 @@
+import asyncio
+import logging
+from typing import List, Set
+
+from pymongo.errors import BulkWriteError
+
+from app.core.config import settings
+from app.core.database import db_instance
+from app.core.query_stats import create_untracked_task
+
+logger = logging.getLogger(__name__)
+
+# Strong references to in-flight fan-out tasks so they are not garbage collected
+_fan_out_tasks: Set[asyncio.Task] = set()
+
+
+def timeline_entry(owner_id: str, post: dict) -> dict:
+    return {
+        "ownerId": owner_id,
+        "postId": post["_id"],
+        "authorId": post["schoolId"],
+        "createdAt": post["createdAt"],
+    }
+
+
+async def insert_timeline_entries(db, entries: List[dict]) -> None:
+    """Inserts timeline entries, ignoring ones that already exist (unique ownerId/postId)."""
+    if not entries:
+        return
+    try:
+        await db["timelines"].insert_many(entries, ordered=False)
+    except BulkWriteError as e:
+        if any(err.get("code") != 11000 for err in e.details.get("writeErrors", [])):
+            raise
+
+
+async def fan_out_post(db, post: dict) -> None:
+    """Copies a new post into the home timeline of every follower of its author, in batches."""
+    cursor = db["follows"].find(
+        {"followeeId": post["schoolId"], "followeeType": "school"},
+        {"_id": 0, "followerId": 1},
+    ).batch_size(settings.FANOUT_BATCH_SIZE).stream()
+
+    batch = []
+    async for follow in cursor:
+        batch.append(timeline_entry(follow["followerId"], post))
+        if len(batch) >= settings.FANOUT_BATCH_SIZE:
+            await insert_timeline_entries(db, batch)
+            batch = []
+    await insert_timeline_entries(db, batch)
+
+
+def schedule_fan_out(post: dict, author: dict) -> None:
+    """
+    Materializes the post into follower timelines in the background.
+    Authors with huge audiences are skipped: their posts are merged in at read time instead.
+    """
+    if author.get("fanoutOnRead"):
+        return
+
+    async def _run():
+        try:
+            await fan_out_post(db_instance.db, post)
+        except Exception as e:
+            logger.error(f"Timeline fan-out for post {post['_id']} failed: {e}")
+
+    task = create_untracked_task(_run())
+    _fan_out_tasks.add(task)
+    task.add_done_callback(_fan_out_tasks.discard)
+
+
+async def cancel_fan_out_tasks() -> None:
+    tasks = list(_fan_out_tasks)
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def backfill_timeline(db, owner_id: str, author_id: str) -> None:
+    """Seeds a new follower's timeline with the author's most recent posts."""
+    cursor = db["posts"].find(
+        {"schoolId": author_id},
+        {"_id": 1, "schoolId": 1, "createdAt": 1},
+    ).sort([("createdAt", -1), ("_id", -1)]).limit(settings.HOME_TIMELINE_BACKFILL_POSTS)
+    await insert_timeline_entries(db, [timeline_entry(owner_id, post) async for post in cursor])
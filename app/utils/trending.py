@@ -0,0 +1,77 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from app.core.config import settings
+from app.core.database import db_instance
+
+logger = logging.getLogger(__name__)
+
+_refresher_task: Optional[asyncio.Task] = None
+
+
+def trending_score_expression() -> dict:
+    """
+    Aggregation expression for a post's trending score:
+    weighted engagement / (age in hours + 2) ^ gravity, evaluated against $$NOW.
+    """
+    engagement = {
+        "$add": [
+            1,
+            {"$multiply": [{"$ifNull": ["$likesCount", 0]}, settings.TRENDING_LIKE_WEIGHT]},
+            {"$multiply": [{"$ifNull": ["$commentsCount", 0]}, settings.TRENDING_COMMENT_WEIGHT]},
+            {"$multiply": [{"$ifNull": ["$sharesCount", 0]}, settings.TRENDING_SHARE_WEIGHT]},
+            {"$multiply": [{"$ifNull": ["$viewsCount", 0]}, settings.TRENDING_VIEW_WEIGHT]},
+        ]
+    }
+    age_hours = {"$divide": [{"$subtract": ["$$NOW", "$createdAt"]}, 3_600_000]}
+    return {
+        "$divide": [
+            engagement,
+            {"$pow": [{"$add": [{"$max": [age_hours, 0]}, 2]}, settings.TRENDING_GRAVITY]},
+        ]
+    }
+
+
+async def refresh_trending_scores(db) -> int:
+    """
+    Recomputes trendingScore for every post inside the trending window in a single
+    server-side pipeline update, and zeroes posts that have aged out of the window.
+    Idempotent, so overlapping passes from several workers are harmless.
+    """
+    cutoff = datetime.now(timezone.utc) - timedelta(hours=settings.TRENDING_WINDOW_HOURS)
+
+    result = await db["posts"].update_many(
+        {"createdAt": {"$gte": cutoff}},
+        [{"$set": {"trendingScore": trending_score_expression()}}],
+    )
+    await db["posts"].update_many(
+        {"createdAt": {"$lt": cutoff}, "trendingScore": {"$gt": 0}},
+        {"$set": {"trendingScore": 0}},
+    )
+    return result.modified_count
+
+
+async def _refresh_loop() -> None:
+    while True:
+        try:
+            updated = await refresh_trending_scores(db_instance.db)
+            logger.info("Trending scores refreshed for %d posts.", updated)
+        except Exception as e:
+            logger.error(f"Trending score refresh failed: {e}")
+        await asyncio.sleep(settings.TRENDING_REFRESH_SECONDS)
+
+
+def start_trending_refresher() -> None:
+    global _refresher_task
+    if _refresher_task is None or _refresher_task.done():
+        _refresher_task = asyncio.create_task(_refresh_loop())
+
+
+async def stop_trending_refresher() -> None:
+    global _refresher_task
+    if _refresher_task is not None:
+        _refresher_task.cancel()
+        await asyncio.gather(_refresher_task, return_exceptions=True)
+        _refresher_task = None
@@ -0,0 +1,110 @@
+"""
+Cold-start time of the API, from process launch to "ready to serve".
+
+Each run starts a fresh interpreter that imports `main` and runs the lifespan
+startup (MongoDB connect, index checks, background task start-up) against a local
+mongod, or against an in-process stand-in with --stand-in (needs the
+`mongomock-motor` package). As soon as startup finishes, the child prints its startup
+phase report and shuts down. The parent reports the median, min and max launch-to-ready
+wall time and the median of every phase as JSON. It exits non-zero when the median is
+over --target-ms, so the target can be tracked across commits.
+
+    python -m benchmarks.cold_start --stand-in --runs 10 --target-ms 1500
+    python -m benchmarks.cold_start --mongo-url mongodb://localhost:27017
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+async def child_startup(args) -> dict:
+    import main as app_main
+    from app.core import database
+    from app.core.resilience import ResilientDatabase
+    from app.core.startup import startup_timer
+
+    if args.stand_in:
+        from mongomock_motor import AsyncMongoMockClient
+
+        async def connect_stand_in():
+            database.db_instance.client = AsyncMongoMockClient()
+            database.db_instance.db = ResilientDatabase(database.db_instance.client[args.db_name])
+
+        app_main.connect_to_mongo = connect_stand_in
+
+    app = app_main.app
+    async with app.router.lifespan_context(app):
+        report = startup_timer.snapshot()
+        # The parent stops its clock on this line; shutdown is not part of the cold start
+        print(json.dumps(report), flush=True)
+    return report
+
+
+def run_child(args) -> dict:
+    """One cold start in a fresh interpreter; returns its phase report plus the wall time to ready."""
+    env = {**os.environ, "MONGO_URL": args.mongo_url, "DB_NAME": args.db_name}
+    env.setdefault("JWT_SECRET_KEY", "cold-start-benchmark-secret-key-with-enough-bytes")
+    env.setdefault("ADMIN_SECRET_CODE", "cold-start-benchmark")
+    command = [sys.executable, "-m", "benchmarks.cold_start", "--child", "--db-name", args.db_name]
+    if args.stand_in:
+        command.append("--stand-in")
+
+    start = time.perf_counter()
+    child = subprocess.Popen(command, cwd=ROOT, env=env, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+    line = child.stdout.readline()
+    ready_ms = (time.perf_counter() - start) * 1000
+    child.communicate()
+    if child.returncode != 0 or not line:
+        raise RuntimeError(f"Cold start run failed (exit code {child.returncode})")
+    report = json.loads(line)
+    report["launchToReadyMs"] = ready_ms
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mongo-url", default="mongodb://localhost:27017")
+    parser.add_argument("--db-name", default="itve_cold_start")
+    parser.add_argument("--stand-in", action="store_true", help="Use an in-process MongoDB stand-in (mongomock-motor)")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--target-ms", type=float, default=1500.0, help="Budget for the median launch-to-ready time")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        asyncio.run(child_startup(args))
+        return
+
+    runs = [run_child(args) for _ in range(args.runs)]
+    ready = [run["launchToReadyMs"] for run in runs]
+    phases = {}
+    for run in runs:
+        for name, ms in run["phasesMs"].items():
+            phases.setdefault(name, []).append(ms)
+
+    median_ms = statistics.median(ready)
+    report = {
+        "runs": args.runs,
+        "standIn": args.stand_in,
+        "targetMs": args.target_ms,
+        "launchToReadyMs": {
+            "median": round(median_ms, 1),
+            "min": round(min(ready), 1),
+            "max": round(max(ready), 1),
+        },
+        "phaseMedianMs": {name: round(statistics.median(values), 1) for name, values in phases.items()},
+        "withinTarget": median_ms <= args.target_ms,
+    }
+    print(json.dumps(report, indent=2))
+    sys.exit(0 if report["withinTarget"] else 1)
+
+
+if __name__ == "__main__":
+    main()
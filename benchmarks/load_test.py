@@ -0,0 +1,309 @@
+"""
+End-to-end load test of the FastAPI app.
+
+Boots `main.app` in-process (lifespan included) against a scratch database on a local
+mongod, or on an in-process stand-in with --stand-in (needs the `mongomock-motor`
+package; good for smoke runs, not for absolute numbers). It seeds donors, schools,
+posts, likes and views, then drives each workload through an ASGI transport and
+reports throughput and p50/p95/p99 latency per route as JSON, so runs can be diffed
+across commits.
+
+    python -m benchmarks.load_test --mongo-url mongodb://localhost:27017 --posts 1000000
+    python -m benchmarks.load_test --stand-in --posts 5000 --requests 500
+
+Workloads: feed (feed scroll), likes (like storm on hot posts), auth (signup / login
+burst), uploads (image posts) and mixed (weighted blend of all of them).
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+WORKLOADS = ("feed", "likes", "auth", "uploads", "mixed")
+PASSWORD = "Passw0rd!"
+
+# 1x1 transparent PNG
+PNG_BYTES = bytes.fromhex(
+    "89504e470d0a1a0a0000000d4948445200000001000000010806000000"
+    "1f15c4890000000d49444154789c6360000002000154a24f5d0000000049454e44ae426082"
+)
+
+
+def percentile(values: list, pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def school_signup_body(username: str) -> dict:
+    return {
+        "instituteName": "Benchmark Institute", "name": "Principal", "phone": "+923001234567",
+        "cnic": "1234512345671", "gender": "Male", "username": username, "email": f"{username}@example.com",
+        "password": PASSWORD, "confirmPassword": PASSWORD, "locationName": "Lahore",
+        "dateOfBirth": "01/01/1990", "instituteAge": "01/01/2000", "experience": "5 years",
+        "ratings": {k: 3 for k in ("technology", "leadership", "communication", "management", "motivation", "teaching")},
+    }
+
+
+async def seed(db, args, rng: random.Random) -> dict:
+    """Inserts the data set directly (bypassing the API) and returns ids the workloads need."""
+    from bson import ObjectId
+
+    from app.core.security import hash_password
+    from app.utils.text_search import search_text
+
+    now = datetime.now(timezone.utc)
+    password_hash = hash_password(PASSWORD)  # One bcrypt round for the whole data set
+
+    schools = [
+        {
+            "_id": ObjectId(), "username": f"school{i}", "email": f"school{i}@example.com", "password": password_hash,
+            "instituteName": f"Institute {i}", "name": f"Principal {i}", "bio": "", "profilePicture": "",
+            "badge": i % 10 == 0, "stats": {"followers": 0, "students": 0, "followings": 0, "posts": 0},
+            "version": 1, "created_at": now,
+        }
+        for i in range(args.schools)
+    ]
+    await db["schools"].insert_many(schools)
+
+    donors = [
+        {
+            "username": f"donor{i}", "email": f"donor{i}@example.com", "password": password_hash, "name": f"Donor {i}",
+            "phone": "+923001234567", "followers_count": 0, "following_count": 0, "achievements": [],
+            "is_active": True, "is_deleted": False, "version": 1, "created_at": now,
+        }
+        for i in range(args.donors)
+    ]
+    if donors:
+        await db["donors"].insert_many(donors)
+
+    words = "school students donation scholarship books uniform library science teacher exam merit madad".split()
+    post_ids = []
+    batch = []
+    for i in range(args.posts):
+        author = schools[i % len(schools)]
+        content = " ".join(rng.choices(words, k=rng.randint(5, 30)))
+        created = now - timedelta(seconds=i * 30)
+        doc = {
+            "_id": ObjectId(), "schoolId": str(author["_id"]), "authorName": author["name"],
+            "authorUsername": author["username"], "authorProfilePic": "", "isVerified": author["badge"],
+            "content": content, "searchText": search_text(content), "imageUrl": "",
+            "likesCount": 0, "commentsCount": 0, "sharesCount": 0, "viewsCount": 0, "isEdited": False,
+            "version": 1, "commentsVersion": 1, "createdAt": created, "updatedAt": created,
+        }
+        post_ids.append(str(doc["_id"]))
+        batch.append(doc)
+        if len(batch) == 5000:
+            await db["posts"].insert_many(batch)
+            batch = []
+    if batch:
+        await db["posts"].insert_many(batch)
+
+    # Likes and views concentrated on the newest posts, like real traffic
+    school_ids = [str(s["_id"]) for s in schools]
+    recent = post_ids[: max(1, len(post_ids) // 100)]
+    for collection, count, owner_field in (("post_likes", args.likes, "schoolId"), ("post_views", args.views, "userId")):
+        pairs = {(rng.choice(recent), rng.choice(school_ids)) for _ in range(count)}
+        docs = [{"postId": p, owner_field: u, "createdAt": now} for p, u in pairs]
+        for start in range(0, len(docs), 5000):
+            await db[collection].insert_many(docs[start:start + 5000])
+
+    return {"schoolIds": school_ids, "postIds": post_ids, "hotPostIds": recent[:20]}
+
+
+class Recorder:
+    def __init__(self):
+        self.timings = {}
+        self.errors = {}
+
+    def record(self, route: str, elapsed: float, ok: bool) -> None:
+        self.timings.setdefault(route, []).append(elapsed * 1000)
+        if not ok:
+            self.errors[route] = self.errors.get(route, 0) + 1
+
+    def report(self, duration: float) -> dict:
+        total = sum(len(t) for t in self.timings.values())
+        return {
+            "requests": total,
+            "errors": sum(self.errors.values()),
+            "durationS": round(duration, 3),
+            "throughputRps": round(total / duration, 1) if duration else 0,
+            "routes": {
+                route: {
+                    "count": len(timings),
+                    "errors": self.errors.get(route, 0),
+                    "meanMs": round(statistics.mean(timings), 3),
+                    "p50Ms": round(percentile(timings, 50), 3),
+                    "p95Ms": round(percentile(timings, 95), 3),
+                    "p99Ms": round(percentile(timings, 99), 3),
+                }
+                for route, timings in sorted(self.timings.items())
+            },
+        }
+
+
+class Workloads:
+    """Request generators; each call performs one user action (one or more requests)."""
+
+    def __init__(self, client, data: dict, tokens: dict, recorder: Recorder, rng: random.Random):
+        self.client = client
+        self.data = data
+        self.tokens = tokens
+        self.recorder = recorder
+        self.rng = rng
+        self.counter = 0
+
+    def headers(self, school_id: str = None) -> dict:
+        school_id = school_id or self.rng.choice(self.data["schoolIds"])
+        return {"Authorization": f"Bearer {self.tokens[school_id]}"}
+
+    async def call(self, route: str, method: str, url: str, expected=(200, 201), **kwargs):
+        start = time.perf_counter()
+        response = await self.client.request(method, url, **kwargs)
+        self.recorder.record(route, time.perf_counter() - start, response.status_code in expected)
+        return response
+
+    async def feed(self) -> None:
+        headers = self.headers()
+        page = self.rng.randint(1, 5)
+        await self.call("GET /api/posts/", "GET", f"/api/posts/?page={page}&limit=10", headers=headers)
+        response = await self.call("GET /api/posts/home", "GET", "/api/posts/home?limit=10", headers=headers)
+        cursor = response.json().get("pagination", {}).get("nextCursor") if response.status_code == 200 else None
+        if cursor:
+            await self.call("GET /api/posts/home", "GET", f"/api/posts/home?limit=10&cursor={cursor}", headers=headers)
+        school_id = self.rng.choice(self.data["schoolIds"])
+        await self.call("GET /api/schools/{schoolId}/posts", "GET", f"/api/schools/{school_id}/posts?limit=10", headers=headers)
+
+    async def likes(self) -> None:
+        headers = self.headers()
+        post_id = self.rng.choice(self.data["hotPostIds"])
+        await self.call("POST /api/posts/{postId}/like", "POST", f"/api/posts/{post_id}/like", headers=headers)
+        await self.call("POST /api/posts/{postId}/view", "POST", f"/api/posts/{post_id}/view", headers=headers)
+
+    async def auth(self) -> None:
+        self.counter += 1
+        username = f"burst{os.getpid()}x{self.counter}x{self.rng.getrandbits(24)}"
+        await self.call("POST /api/schools/signup", "POST", "/api/schools/signup", json=school_signup_body(username))
+        await self.call(
+            "POST /api/schools/login", "POST", "/api/schools/login",
+            json={"identifier": username, "password": PASSWORD},
+        )
+
+    async def uploads(self) -> None:
+        await self.call(
+            "POST /api/posts/", "POST", "/api/posts/", headers=self.headers(),
+            data={"content": "Benchmark upload"}, files={"image": ("bench.png", PNG_BYTES, "image/png")},
+        )
+
+    async def mixed(self) -> None:
+        action = self.rng.choices(
+            (self.feed, self.likes, self.auth, self.uploads), weights=(70, 20, 5, 5)
+        )[0]
+        await action()
+
+
+async def run_workload(client, data, tokens, name: str, args, rng: random.Random) -> dict:
+    recorder = Recorder()
+    workloads = Workloads(client, data, tokens, recorder, rng)
+    action = getattr(workloads, name)
+    remaining = [args.requests]
+
+    async def worker():
+        while remaining[0] > 0:
+            remaining[0] -= 1
+            await action()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+    return recorder.report(time.perf_counter() - start)
+
+
+async def main_async(args) -> dict:
+    import httpx
+
+    import main as app_main
+    from app.core import database
+    from app.core.resilience import ResilientDatabase
+    from app.core.security import create_access_token
+
+    if args.stand_in:
+        from mongomock_motor import AsyncMongoMockClient
+
+        async def connect_stand_in():
+            database.db_instance.client = AsyncMongoMockClient()
+            database.db_instance.db = ResilientDatabase(database.db_instance.client[args.db_name])
+
+        app_main.connect_to_mongo = connect_stand_in
+
+    rng = random.Random(args.seed)
+    app = app_main.app
+    report = {"config": {k: v for k, v in vars(args).items() if k != "mongo_url"}, "workloads": {}}
+
+    async with app.router.lifespan_context(app):
+        db = database.db_instance.db
+        seed_start = time.perf_counter()
+        data = await seed(db, args, rng)
+        report["seedSeconds"] = round(time.perf_counter() - seed_start, 3)
+        tokens = {sid: create_access_token({"sub": sid, "role": "school"}) for sid in data["schoolIds"]}
+
+        transport = httpx.ASGITransport(app=app)
+        try:
+            async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+                for name in args.workloads:
+                    report["workloads"][name] = await run_workload(client, data, tokens, name, args, rng)
+        finally:
+            if not args.stand_in and not args.keep_data:
+                await database.db_instance.client.drop_database(args.db_name)
+
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mongo-url", default="mongodb://localhost:27017")
+    parser.add_argument("--db-name", default="itve_load_test")
+    parser.add_argument("--stand-in", action="store_true", help="Use an in-process MongoDB stand-in (mongomock-motor)")
+    parser.add_argument("--schools", type=int, default=200)
+    parser.add_argument("--donors", type=int, default=1000)
+    parser.add_argument("--posts", type=int, default=100_000)
+    parser.add_argument("--likes", type=int, default=50_000)
+    parser.add_argument("--views", type=int, default=100_000)
+    parser.add_argument("--workloads", nargs="+", choices=WORKLOADS, default=list(WORKLOADS))
+    parser.add_argument("--requests", type=int, default=2000, help="User actions per workload")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--keep-data", action="store_true", help="Do not drop the scratch database afterwards")
+    args = parser.parse_args()
+
+    # The app reads its settings at import time and writes uploads relative to the working
+    # directory, so point it at the scratch database and run from a throwaway directory
+    os.environ["MONGO_URL"] = args.mongo_url
+    os.environ["DB_NAME"] = args.db_name
+    os.environ.setdefault("JWT_SECRET_KEY", "load-test-secret-key-with-enough-bytes")
+    os.environ.setdefault("ADMIN_SECRET_CODE", "load-test")
+    # A few synthetic users generate all the traffic; per-user write limits would turn it into 429s
+    os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+    # The auth burst runs more concurrent bcrypt requests than the "expensive" admission class admits
+    os.environ.setdefault("ADMISSION_ENABLED", "false")
+    sys.path.insert(0, os.getcwd())
+    with tempfile.TemporaryDirectory(prefix="itve-load-") as workdir:
+        os.chdir(workdir)
+        os.makedirs("uploads", exist_ok=True)
+        report = asyncio.run(main_async(args))
+
+    print(json.dumps(report, indent=2))
+
+    # A workload whose every request failed measured nothing but the error path
+    failed = [name for name, result in report["workloads"].items() if result["requests"] and result["errors"] == result["requests"]]
+    if failed:
+        print(f"Every request failed in workload(s): {', '.join(failed)}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
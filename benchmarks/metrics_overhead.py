@@ -0,0 +1,95 @@
+"""
+Per-request cost of the metrics middleware.
+
+Drives a minimal ASGI app directly (no server, no network) with and without
+MetricsMiddleware / QueryStatsMiddleware and reports the added time per request
+in microseconds as JSON. Needs no database.
+
+    python -m benchmarks.metrics_overhead --requests 50000
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import time
+
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark")
+os.environ.setdefault("ADMIN_SECRET_CODE", "benchmark")
+
+from app.core.metrics import MetricsMiddleware  # noqa: E402
+from app.core.query_stats import QueryStatsMiddleware  # noqa: E402
+
+
+class _Route:
+    path = "/api/posts/{postId}"
+
+    @staticmethod
+    async def endpoint():
+        pass
+
+
+class _App:
+    """Stand-in for the routed FastAPI app: marks the endpoint and sends an empty 200."""
+
+    routes = [_Route]
+
+    async def __call__(self, scope, receive, send):
+        scope["endpoint"] = _Route.endpoint
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+
+async def _noop_send(message):
+    pass
+
+
+async def _noop_receive():
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+
+async def run(app, requests: int) -> float:
+    """Seconds per request."""
+    inner = _App()
+    start = time.perf_counter()
+    for i in range(requests):
+        scope = {"type": "http", "method": "GET", "path": f"/api/posts/{i}", "app": inner}
+        await app(scope, _noop_receive, _noop_send)
+    return (time.perf_counter() - start) / requests
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=50_000)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    variants = {
+        "bare": _App(),
+        "metrics": MetricsMiddleware(_App()),
+        "queryStats": QueryStatsMiddleware(_App()),
+        "metrics+queryStats": MetricsMiddleware(QueryStatsMiddleware(_App())),
+    }
+    results = {name: [] for name in variants}
+    for _ in range(args.rounds):
+        for name, app in variants.items():
+            results[name].append(asyncio.run(run(app, args.requests)))
+
+    bare = statistics.median(results["bare"])
+    report = {
+        "requestsPerRound": args.requests,
+        "rounds": args.rounds,
+        "variants": {
+            name: {
+                "usPerRequest": round(statistics.median(timings) * 1e6, 3),
+                "overheadUs": round((statistics.median(timings) - bare) * 1e6, 3),
+            }
+            for name, timings in results.items()
+        },
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+"""
+Validation and serialization micro-benchmarks for the Pydantic models in app/models.
+
+For every request model: validation of a representative payload. For every response
+model: construction, and JSON encoding through FastAPI's default path
+(jsonable_encoder + json.dumps) vs. pydantic-core (model_dump_json). For the list
+endpoints (donors, hopes): the previous path (one model per row, then FastAPI's
+response_model re-validation and encoding) vs. app.utils.fast_response.
+
+Reports microseconds per operation as JSON. Needs no database.
+
+    python -m benchmarks.model_benchmark --rows 500
+"""
+import argparse
+import asyncio
+import json
+import os
+import timeit
+from datetime import datetime, timezone
+from typing import List
+
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark")
+os.environ.setdefault("ADMIN_SECRET_CODE", "benchmark")
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from fastapi.routing import serialize_response  # noqa: E402
+from fastapi.utils import create_response_field  # noqa: E402
+
+from app.models import diagnostics, donor, hope, post, school  # noqa: E402
+from app.utils.fast_response import json_list_response  # noqa: E402
+
+NOW = datetime.now(timezone.utc)
+RATINGS = {k: 3 for k in ("technology", "leadership", "communication", "management", "motivation", "teaching")}
+ACHIEVEMENT = {"id": "a1b2c3", "title": "First donation", "description": "Donated books", "icon_url": "", "date_earned": NOW}
+
+REQUEST_PAYLOADS = {
+    school.SchoolSignup: {
+        "instituteName": "Government High School", "name": "Principal", "phone": "+923001234567",
+        "cnic": "12345-1234567-1", "gender": "Male", "username": "ghs_lahore", "email": "GHS@Example.com",
+        "password": "Passw0rd!", "confirmPassword": "Passw0rd!", "locationName": "Lahore",
+        "dateOfBirth": "01/01/1980", "instituteAge": "01/01/1990", "experience": "16 years", "ratings": RATINGS,
+    },
+    school.SchoolProfileUpdate: {
+        "name": "Principal", "instituteName": "Government High School", "bio": "<b>Welcome</b> to our school",
+        "gender": "Male", "dateOfBirth": "01/01/1980", "username": "ghs_lahore", "locationName": "Lahore",
+    },
+    school.SchoolLogin: {"identifier": "ghs_lahore", "password": "Passw0rd!"},
+    donor.DonorSignup: {
+        "email": "Donor@Example.com", "password": "Passw0rd!", "phone": "+92 3001234567",
+        "name": "Generous Donor", "username": "Donor.One",
+    },
+    donor.DonorUpdateProfile: {"name": "Generous Donor", "about": "Supporting schools", "profile_image_url": ""},
+    donor.AchievementCreate: {"title": "First donation", "description": "Donated books"},
+    donor.AchievementUpdate: {"title": "First donation"},
+    donor.AchievementPatch: {"achievements": [ACHIEVEMENT] * 5},
+    donor.DeactivateAccountRequest: {"reason": "Taking a break"},
+    donor.DeleteAccountRequest: {"reason": "No longer needed"},
+    hope.HopeCreate: {
+        "name": "Books for grade 5", "details": "Text books", "type_of_donation": "Books",
+        "fields": "Education", "amount": 25000, "students": ["Ali", "Sara"],
+    },
+    post.CommentCreate: {"text": "Great work!"},
+    diagnostics.ProfilerToggle: {"enabled": True, "sampleRate": 0.05},
+}
+
+COMMENT = {
+    "commentId": "c1", "userId": "s1", "username": "ghs_lahore", "userProfilePic": "", "text": "Great work!",
+    "parentId": None, "depth": 0, "repliesCount": 2, "createdAtDate": "19 Oct 2026", "createdAtTime": "10:15 AM",
+}
+DONOR_ROW = {
+    "id": "d1", "username": "donor.one", "name": "Generous Donor", "about": "", "followers_count": 12,
+    "following_count": 3, "beneficiaries_count": 4, "total_amount_donated": 125000.0, "donor_class": "Gold",
+    "donor_rank": 7, "achievements": [ACHIEVEMENT] * 3, "profile_image_url": "",
+}
+HOPE_ROW = {
+    "id": "h1", "name": "Books for grade 5", "details": "Text books", "type_of_donation": "Books",
+    "support_field": "Education", "amount": 25000.0, "grade_requirement": None, "students": ["Ali", "Sara"],
+    "created_at": NOW,
+}
+
+RESPONSE_PAYLOADS = {
+    donor.DonorProfileResponse: DONOR_ROW,
+    donor.AchievementPageResponse: {"achievements": [ACHIEVEMENT] * 10, "total": 10, "page": 1, "limit": 10},
+    hope.HopeResponse: HOPE_ROW,
+    school.SchoolProfileResponse: {
+        "schoolId": "s1", "username": "ghs_lahore", "instituteName": "Government High School", "name": "Principal",
+        "email": "ghs@example.com", "phone": "+923001234567", "cnic": "1234512345671", "gender": "Male",
+        "stats": {"followers": 10, "students": 500, "followings": 2, "posts": 40},
+        "details": {"rank": 3, "principal": "Principal", "totalStudentsEnrolled": 500, "alumni": 1200},
+        "facilities": ["Library", "Lab"], "labs": ["Physics"], "location": "Lahore",
+    },
+    post.CommentResponse: COMMENT,
+    post.PostResponse: {
+        "postId": "p1", "schoolId": "s1", "authorName": "Principal", "authorUsername": "ghs_lahore",
+        "authorProfilePic": "", "content": "Annual function photos", "likesCount": 1200, "commentsCount": 45,
+        "formattedViews": "12.5K", "formattedLikes": "1.2K", "previewComments": [COMMENT] * 3,
+        "createdAtDate": "19 Oct 2026", "createdAtTime": "10:15 AM",
+    },
+}
+
+
+def per_op_us(fn, repeat: int) -> float:
+    """Best of `repeat` runs, each long enough for timeit's autorange (about 0.2 s)."""
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    return round(min(timer.repeat(repeat=repeat, number=number)) / number * 1e6, 3)
+
+
+def fastapi_encode(value) -> bytes:
+    """What FastAPI does for a route without response_model: jsonable_encoder then json.dumps."""
+    return json.dumps(jsonable_encoder(value), ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode()
+
+
+_loop = asyncio.new_event_loop()
+
+
+def legacy_list(model, rows: list, field) -> bytes:
+    """Previous list path: one model per row, then response_model re-validation and encoding."""
+    instances = [model(**row) for row in rows]
+    content = _loop.run_until_complete(serialize_response(field=field, response_content=instances, is_coroutine=True))
+    return fastapi_encode(content)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=500, help="Rows per list endpoint")
+    parser.add_argument("--repeat", type=int, default=3, help="Timing runs per measurement (best is reported)")
+    args = parser.parse_args()
+
+    report = {"validation": {}, "responses": {}, "lists": {}}
+
+    for model, payload in REQUEST_PAYLOADS.items():
+        model.model_validate(payload)
+        report["validation"][model.__name__] = {"validateUs": per_op_us(lambda: model.model_validate(payload), args.repeat)}
+
+    for model, payload in RESPONSE_PAYLOADS.items():
+        instance = model(**payload)
+        report["responses"][model.__name__] = {
+            "constructUs": per_op_us(lambda: model(**payload), args.repeat),
+            "modelConstructUs": per_op_us(lambda: model.model_construct(**payload), args.repeat),
+            "fastapiEncodeUs": per_op_us(lambda: fastapi_encode(instance), args.repeat),
+            "dumpJsonUs": per_op_us(lambda: instance.model_dump_json(by_alias=True), args.repeat),
+        }
+
+    for model, row in ((donor.DonorProfileResponse, DONOR_ROW), (hope.HopeResponse, HOPE_ROW)):
+        rows = [dict(row, id=str(i)) for i in range(args.rows)]
+        field = create_response_field(name="Response", type_=List[model])
+        assert json.loads(legacy_list(model, rows, field)) == json.loads(json_list_response(model, rows).body)
+        legacy = per_op_us(lambda: legacy_list(model, rows, field), args.repeat)
+        fast = per_op_us(lambda: json_list_response(model, rows), args.repeat)
+        report["lists"][model.__name__] = {
+            "rows": args.rows,
+            "legacyUs": legacy,
+            "fastPathUs": fast,
+            "speedup": round(legacy / fast, 2),
+        }
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Per-request cost of the per-user rate limiter.
+
+Times LocalBucketStore.take (the in-process hot path) and RateLimiter.retry_after
+(what the route dependency awaits) over a population of users, against a budget in
+microseconds, and reports the results as JSON. Exits non-zero when the in-process
+path is over budget. Needs no database.
+
+    python -m benchmarks.rate_limit --users 10000 --budget-us 1.0
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark")
+os.environ.setdefault("ADMIN_SECRET_CODE", "benchmark")
+
+from app.core.rate_limit import LocalBucketStore, RateLimiter, parse_limit  # noqa: E402
+
+
+def time_take(store: LocalBucketStore, keys: list, rate: float, burst: float, rounds: int) -> float:
+    """Best microseconds per take() over `rounds` passes across all keys."""
+    take = store.take
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for key in keys:
+            take(key, rate, burst)
+        best = min(best, (time.perf_counter() - start) / len(keys))
+    return best * 1e6
+
+
+async def time_retry_after(limiter: RateLimiter, users: list, rounds: int) -> float:
+    retry_after = limiter.retry_after
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for user in users:
+            await retry_after("toggle_like", user)
+        best = min(best, (time.perf_counter() - start) / len(users))
+    return best * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=10_000, help="Distinct users (bucket keys)")
+    parser.add_argument("--rounds", type=int, default=20, help="Passes over all users (best is reported)")
+    parser.add_argument("--limit", default="60/60", help="Limit under test, '<burst>/<seconds>'")
+    parser.add_argument("--budget-us", type=float, default=1.0, help="Budget for the in-process take()")
+    args = parser.parse_args()
+
+    rate, burst = parse_limit(args.limit)
+    users = [f"{i:024x}" for i in range(args.users)]
+    keys = [("toggle_like", user) for user in users]
+
+    # Allowed path: plenty of tokens left in every bucket
+    allowed_store = LocalBucketStore(max_keys=args.users * 2)
+    allowed_us = time_take(allowed_store, keys, rate * 1e6, burst * 1e6, args.rounds)
+
+    # Rejected path: every bucket is drained
+    rejected_store = LocalBucketStore(max_keys=args.users * 2)
+    time_take(rejected_store, keys, 1e-9, 1.0, 1)
+    rejected_us = time_take(rejected_store, keys, 1e-9, 1.0, args.rounds)
+
+    # Bucket creation (first request of each user)
+    create_store = LocalBucketStore(max_keys=args.users * 2)
+    start = time.perf_counter()
+    time_take(create_store, keys, rate, burst, 1)
+    create_us = (time.perf_counter() - start) / len(keys) * 1e6
+
+    limiter = RateLimiter()
+    limiter.limits["toggle_like"] = (rate * 1e6, burst * 1e6)
+    retry_after_us = asyncio.run(time_retry_after(limiter, users, args.rounds))
+
+    report = {
+        "users": args.users,
+        "budgetUs": args.budget_us,
+        "takeAllowedUs": round(allowed_us, 3),
+        "takeRejectedUs": round(rejected_us, 3),
+        "takeNewBucketUs": round(create_us, 3),
+        "retryAfterAwaitUs": round(retry_after_us, 3),
+        "withinBudget": max(allowed_us, rejected_us) <= args.budget_us,
+    }
+    print(json.dumps(report, indent=2))
+    sys.exit(0 if report["withinBudget"] else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Search latency vs. corpus size.
+
+Seeds a scratch database with synthetic posts, builds the same text index the API
+uses, and reports query latency percentiles for each corpus size as JSON.
+
+    python -m benchmarks.search_benchmark --mongo-url mongodb://localhost:27017 --sizes 1000 10000 100000
+"""
+import argparse
+import json
+import random
+import statistics
+import time
+from datetime import datetime, timedelta, timezone
+
+from pymongo import MongoClient
+
+from app.utils.text_search import search_text, tokenize
+
+VOCABULARY = (
+    "school students donation scholarship books uniform fees library science lab teacher "
+    "classroom exam results merit talaba taleem bohat shukriya madad computer sports annual "
+    "function parents community fund support education girls boys primary secondary college"
+).split()
+
+QUERIES = ["scholarship", "science lab", "bohot shukriya", "annual function", "computer classroom", "taleem madad"]
+
+
+def seed(collection, size: int, rng: random.Random) -> None:
+    now = datetime.now(timezone.utc)
+    batch = []
+    for i in range(size):
+        content = " ".join(rng.choices(VOCABULARY, k=rng.randint(8, 40)))
+        batch.append({
+            "schoolId": f"school-{i % 500}",
+            "content": content,
+            "searchText": search_text(content),
+            "createdAt": now - timedelta(minutes=i),
+        })
+        if len(batch) == 5000:
+            collection.insert_many(batch)
+            batch = []
+    if batch:
+        collection.insert_many(batch)
+    collection.create_index([("searchText", "text")], default_language="none", name="posts_search")
+
+
+def run_queries(collection, repeats: int, limit: int) -> list:
+    timings = []
+    for _ in range(repeats):
+        for query in QUERIES:
+            start = time.perf_counter()
+            list(
+                collection.find(
+                    {"$text": {"$search": " ".join(tokenize(query))}},
+                    {"score": {"$meta": "textScore"}},
+                ).sort([("score", {"$meta": "textScore"}), ("createdAt", -1)]).limit(limit)
+            )
+            timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def percentile(values: list, pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mongo-url", default="mongodb://localhost:27017")
+    parser.add_argument("--db-name", default="itve_search_benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--repeats", type=int, default=20)
+    parser.add_argument("--limit", type=int, default=10)
+    args = parser.parse_args()
+
+    client = MongoClient(args.mongo_url)
+    db = client[args.db_name]
+    rng = random.Random(42)
+    report = []
+
+    try:
+        for size in args.sizes:
+            db.drop_collection("posts")
+            seed(db["posts"], size, rng)
+            timings = run_queries(db["posts"], args.repeats, args.limit)
+            report.append({
+                "corpusSize": size,
+                "queries": len(timings),
+                "meanMs": round(statistics.mean(timings), 3),
+                "p50Ms": round(percentile(timings, 50), 3),
+                "p95Ms": round(percentile(timings, 95), 3),
+                "p99Ms": round(percentile(timings, 99), 3),
+            })
+    finally:
+        client.drop_database(args.db_name)
+        client.close()
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+"""
+Throughput scaling of the pre-fork launcher (serve.py) with the number of workers.
+
+For each worker count it starts `python serve.py --workers N` against the given
+database, waits for it to answer, and then drives it over real HTTP from several
+client processes at a fixed concurrency for a fixed duration. It reports requests per
+second, p50/p99 latency, the speedup over one worker, and the efficiency (speedup /
+workers) as JSON. Finally it stops the server with SIGTERM and records how long the
+drain took.
+
+    python -m benchmarks.server_scaling --mongo-url mongodb://localhost:27017 --path /api/hopes/
+    python -m benchmarks.server_scaling --workers 1 2 4 8 --clients 4 --duration 20
+
+The load generators share the machine with the server, so leave cores for them
+(--clients). Scaling flattens once workers + clients exceed the core count. The
+default path "/" measures the framework alone; pass a database-backed route to
+include MongoDB round trips.
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import signal
+import subprocess
+import sys
+import time
+
+import httpx
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def percentile(values: list, pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+async def drive(url: str, concurrency: int, warmup: float, duration: float) -> dict:
+    """One client process: `concurrency` keep-alive connections looping on `url`."""
+    latencies = []
+    errors = 0
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(limits=limits, timeout=30) as client:
+        start = time.perf_counter()
+        measure_from = start + warmup
+        stop_at = measure_from + duration
+
+        async def worker():
+            nonlocal errors
+            while True:
+                sent = time.perf_counter()
+                if sent >= stop_at:
+                    return
+                try:
+                    response = await client.get(url)
+                    ok = response.status_code < 400
+                except httpx.HTTPError:
+                    ok = False
+                if sent >= measure_from:
+                    if ok:
+                        latencies.append(time.perf_counter() - sent)
+                    else:
+                        errors += 1
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return {"latencies": latencies, "errors": errors}
+
+
+def client_process(args: tuple) -> dict:
+    return asyncio.run(drive(*args))
+
+
+def wait_until_ready(url: str, timeout: float) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(url, timeout=1).status_code < 500:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"Server did not become ready within {timeout}s")
+
+
+def run_step(args, workers: int) -> dict:
+    env = {
+        **os.environ,
+        "MONGO_URL": args.mongo_url,
+        "DB_NAME": args.db_name,
+        # Load shedding and per-user limits would turn the saturation point into 503s / 429s
+        "ADMISSION_ENABLED": "false",
+        "RATE_LIMIT_ENABLED": "false",
+    }
+    env.setdefault("JWT_SECRET_KEY", "scaling-benchmark-secret-key-with-enough-bytes")
+    env.setdefault("ADMIN_SECRET_CODE", "scaling-benchmark")
+    server = subprocess.Popen(
+        [sys.executable, "serve.py", "--workers", str(workers), "--host", "127.0.0.1", "--port", str(args.port)],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    base = f"http://127.0.0.1:{args.port}"
+    try:
+        wait_until_ready(base + "/", args.startup_timeout)
+        jobs = [(base + args.path, args.concurrency, args.warmup, args.duration)] * args.clients
+        with multiprocessing.get_context("spawn").Pool(args.clients) as pool:
+            results = pool.map(client_process, jobs)
+    finally:
+        stop_started = time.perf_counter()
+        server.send_signal(signal.SIGTERM)
+        try:
+            server.wait(timeout=60)
+        except subprocess.TimeoutExpired:
+            server.kill()
+            server.wait()
+        drain_seconds = time.perf_counter() - stop_started
+
+    latencies = [value for result in results for value in result["latencies"]]
+    return {
+        "workers": workers,
+        "requests": len(latencies),
+        "errors": sum(result["errors"] for result in results),
+        "rps": round(len(latencies) / args.duration, 1),
+        "p50Ms": round(percentile(latencies, 50) * 1000, 2) if latencies else None,
+        "p99Ms": round(percentile(latencies, 99) * 1000, 2) if latencies else None,
+        "drainSeconds": round(drain_seconds, 2),
+    }
+
+
+def main() -> None:
+    cores = os.cpu_count() or 1
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mongo-url", default="mongodb://localhost:27017")
+    parser.add_argument("--db-name", default="itve_scaling_benchmark")
+    parser.add_argument("--path", default="/", help="Route to drive (GET)")
+    parser.add_argument("--workers", type=int, nargs="+", default=None,
+                        help="Worker counts to measure (default: powers of two up to the core count)")
+    parser.add_argument("--clients", type=int, default=max(1, cores // 2), help="Load generator processes")
+    parser.add_argument("--concurrency", type=int, default=32, help="Connections per load generator")
+    parser.add_argument("--warmup", type=float, default=3.0, help="Seconds of load before measuring")
+    parser.add_argument("--duration", type=float, default=10.0, help="Measured seconds per step")
+    parser.add_argument("--port", type=int, default=8199)
+    parser.add_argument("--startup-timeout", type=float, default=60.0)
+    args = parser.parse_args()
+
+    worker_counts = args.workers or [n for n in (1, 2, 4, 8, 16, 32, 64) if n <= cores] or [1]
+    steps = [run_step(args, workers) for workers in worker_counts]
+    # Speedup relative to one worker (the first step, scaled if it ran more than one)
+    baseline = steps[0]["rps"] / steps[0]["workers"]
+    for step in steps:
+        speedup = step["rps"] / baseline if baseline else None
+        step["speedup"] = round(speedup, 2) if speedup is not None else None
+        step["efficiency"] = round(speedup / step["workers"], 2) if speedup is not None else None
+
+    report = {
+        "cores": cores,
+        "path": args.path,
+        "clients": args.clients,
+        "concurrencyPerClient": args.concurrency,
+        "durationSeconds": args.duration,
+        "steps": steps,
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,31 +1,108 @@
+import time
+_imports_started = time.perf_counter()
+
 from fastapi import FastAPI
 from fastapi.staticfiles import StaticFiles
 from contextlib import asynccontextmanager
-from app.core.database import connect_to_mongo, close_mongo_connection
+from app.core.startup import startup_timer
+from app.core.database import connect_to_mongo, close_mongo_connection, create_indexes, db_instance
+from app.utils.availability import start_availability_warm_up, stop_availability_warm_up
+from app.utils.author_sync import cancel_author_sync_jobs
+from app.utils.timeline import cancel_fan_out_tasks
+from app.utils.comment_threads import start_subtree_delete_sweeper, cancel_subtree_deletes
+from app.utils.trending import start_trending_refresher, stop_trending_refresher
+from app.utils.text_search import start_search_backfill, stop_search_backfill
+from app.utils.sync import start_sync_backfill, stop_sync_backfill
+from app.utils.achievements import start_achievement_backfill, stop_achievement_backfill
+from app.core.events import event_hub
+from app.core.query_stats import QueryStatsMiddleware
+from app.core.query_plans import QueryPlanMiddleware
+from app.core.metrics import MetricsMiddleware
+from app.core.profiler import ProfilerMiddleware
+from app.core.rate_limit import rate_limiter
+from app.core.admission import AdmissionMiddleware
+from app.core.lazy_routes import LazyRouters
+from app.core.resilience import database_unavailable_handler
+from pymongo.errors import ConnectionFailure, ExecutionTimeout
 import logging
+import os
 
 from app.routers import donors
 from app.routers import hopes
 from app.routers import schools
 from app.routers import posts
+from app.routers import follows
+from app.routers import search
+from app.routers import events
+from app.routers import metrics
+from app.routers import health
 
 logging.basicConfig(level=logging.INFO)
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    await connect_to_mongo()
+    with startup_timer.phase("mongo connect"):
+        await connect_to_mongo()
+    with startup_timer.phase("index checks"):
+        await create_indexes()
+    with startup_timer.phase("background tasks"):
+        start_availability_warm_up(db_instance.db)
+        rate_limiter.start(db_instance.db)
+        start_trending_refresher()
+        start_search_backfill(db_instance.db)
+        start_sync_backfill(db_instance.db)
+        start_achievement_backfill(db_instance.db)
+        start_subtree_delete_sweeper()
+        await event_hub.start(db_instance.db)
+    startup_timer.ready()
     yield
+    await event_hub.stop()
+    await stop_sync_backfill()
+    await stop_achievement_backfill()
+    await stop_search_backfill()
+    await stop_trending_refresher()
+    await stop_availability_warm_up()
+    await cancel_author_sync_jobs()
+    await cancel_fan_out_tasks()
+    await cancel_subtree_deletes()
     await close_mongo_connection()
 
 app = FastAPI(title="ITVE Backend API", lifespan=lifespan)
+# Added first so it runs inside QueryStatsMiddleware
+app.add_middleware(QueryPlanMiddleware)
+app.add_middleware(QueryStatsMiddleware)
+# Sheds load before any route work; outside it, MetricsMiddleware still counts the 503s
+app.add_middleware(AdmissionMiddleware)
+app.add_middleware(MetricsMiddleware)
+app.add_middleware(ProfilerMiddleware)
+
+# Database outages (unreachable, timed out, circuit breaker open) answer 503 with Retry-After
+app.add_exception_handler(ConnectionFailure, database_unavailable_handler)
+app.add_exception_handler(ExecutionTimeout, database_unavailable_handler)
 
+# StaticFiles requires the directory to exist; it is untracked, so create it on a fresh checkout
+# (its profiles/ subdirectory is created on the first upload)
+os.makedirs("uploads", exist_ok=True)
 app.mount("/uploads", StaticFiles(directory="uploads"), name="uploads")
 
 app.include_router(donors.router, prefix="/api")
 app.include_router(hopes.router, prefix="/api/hopes", tags=["Hopes / Donations"])
 app.include_router(schools.router)
 app.include_router(posts.router)
+app.include_router(follows.router)
+app.include_router(search.router)
+app.include_router(events.router)
+app.include_router(metrics.router)
+app.include_router(health.router)
+
+# Rarely used routers are imported on their first request
+lazy_routers = LazyRouters(app)
+lazy_routers.add("/api/availability", "app.routers.availability")
+lazy_routers.add("/api/diagnostics", "app.routers.diagnostics")
+lazy_routers.add("/api/sync", "app.routers.sync")
 
 @app.get("/")
 async def root():
-    return {"message": "Donor API is up and running!"}
\ No newline at end of file
+    return {"message": "Donor API is up and running!"}
+
+startup_timer.record("imports", time.perf_counter() - _imports_started - startup_timer.seconds("settings"))
@@ -0,0 +1,192 @@
+"""
+Production launcher: pre-forked uvicorn workers sharing one listening socket.
+
+The parent imports the app once and binds the socket, then forks the workers, so
+every worker starts with the modules already loaded. Each worker runs its own event
+loop and, through the lifespan, its own Motor pool (MONGO_MAX_POOL_SIZE /
+MONGO_MIN_POOL_SIZE and the MONGO_*_TIMEOUT_MS settings). The parent replaces workers
+that die, and stops when workers keep failing to boot (e.g. the lifespan startup cannot
+reach MongoDB) instead of respawning them forever. On SIGTERM or SIGINT the workers stop accepting connections and get
+SERVER_GRACEFUL_TIMEOUT_SECONDS to finish in-flight requests and run the lifespan
+shutdown. Workers still running after that are killed.
+
+    python serve.py
+    python serve.py --workers 4 --port 8000
+
+In-process state is per worker: metrics, admission control, and the "local"
+backends of rate limiting and live events. Use EVENTS_BROKER=mongo and
+RATE_LIMIT_BACKEND=mongo when running more than one worker.
+"""
+import argparse
+import logging
+import os
+import signal
+import sys
+import time
+from typing import Dict
+
+import uvicorn
+
+from app.core.config import settings
+
+logger = logging.getLogger("serve")
+
+# A worker that dies sooner than this after starting is respawned with a delay, not in a tight loop
+MIN_WORKER_UPTIME_SECONDS = 5.0
+# Time allowed for the lifespan shutdown after the graceful timeout, before workers are killed
+SHUTDOWN_MARGIN_SECONDS = 10.0
+# Exit status of a worker whose startup failed (same value as gunicorn's WORKER_BOOT_ERROR)
+WORKER_BOOT_ERROR = 3
+# Consecutive boot failures after which the supervisor gives up and exits with WORKER_BOOT_ERROR
+MAX_BOOT_FAILURES = 5
+
+
+def usable_cores() -> int:
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:  # Not available on macOS
+        return os.cpu_count() or 1
+
+
+def run_worker(config: uvicorn.Config, sock) -> None:
+    """Body of a forked worker; never returns."""
+    # Drop the parent's handlers; uvicorn installs its own (first SIGTERM/SIGINT = graceful exit)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    server = uvicorn.Server(config)
+    status = 0
+    try:
+        server.run(sockets=[sock])
+        # A failed lifespan startup makes run() return normally, without ever serving
+        if not server.started:
+            logger.error("Worker %d failed to boot", os.getpid())
+            status = WORKER_BOOT_ERROR
+    except BaseException:
+        logger.exception("Worker %d crashed", os.getpid())
+        status = 1 if server.started else WORKER_BOOT_ERROR
+    finally:
+        # Skip the parent's atexit handlers and buffered state inherited through fork
+        os._exit(status)
+
+
+class Supervisor:
+    def __init__(self, config: uvicorn.Config, workers: int):
+        self.config = config
+        self.workers = workers
+        self.sock = None
+        self.children: Dict[int, float] = {}  # pid -> start time
+        self.stopping = False
+        self.boot_failures = 0
+
+    def spawn(self) -> None:
+        pid = os.fork()
+        if pid == 0:
+            run_worker(self.config, self.sock)
+        self.children[pid] = time.monotonic()
+        logger.info("Started worker %d", pid)
+
+    def handle_stop(self, signum, frame) -> None:
+        if not self.stopping:
+            logger.info("Received %s, draining workers", signal.Signals(signum).name)
+        self.stopping = True
+
+    def reap(self) -> list:
+        """Collects exited workers; returns (uptime, exit code) for each of them."""
+        exited = []
+        while self.children:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                break
+            if pid == 0:
+                break
+            started = self.children.pop(pid, None)
+            if started is not None:
+                code = os.waitstatus_to_exitcode(status)
+                exited.append((time.monotonic() - started, code))
+                if not self.stopping:
+                    logger.warning("Worker %d exited with status %d", pid, code)
+        return exited
+
+    def run(self) -> int:
+        """Serves until SIGTERM/SIGINT (returns 0) or until workers keep failing to boot."""
+        self.sock = self.config.bind_socket()
+        signal.signal(signal.SIGTERM, self.handle_stop)
+        signal.signal(signal.SIGINT, self.handle_stop)
+        for _ in range(self.workers):
+            self.spawn()
+
+        while not self.stopping:
+            time.sleep(0.2)
+            for uptime, code in self.reap():
+                if self.stopping:
+                    break
+                self.boot_failures = self.boot_failures + 1 if code == WORKER_BOOT_ERROR else 0
+                if self.boot_failures >= MAX_BOOT_FAILURES:
+                    logger.error("Workers failed to boot %d times in a row, shutting down", self.boot_failures)
+                    self.stopping = True
+                    break
+                if uptime < MIN_WORKER_UPTIME_SECONDS:
+                    time.sleep(1.0)
+                self.spawn()
+
+        self.drain()
+        return WORKER_BOOT_ERROR if self.boot_failures >= MAX_BOOT_FAILURES else 0
+
+    def drain(self) -> None:
+        # Workers keep their own copy of the socket; the parent's is no longer needed
+        self.sock.close()
+        for pid in self.children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+        deadline = time.monotonic() + settings.SERVER_GRACEFUL_TIMEOUT_SECONDS + SHUTDOWN_MARGIN_SECONDS
+        while self.children and time.monotonic() < deadline:
+            self.reap()
+            time.sleep(0.1)
+        for pid in list(self.children):
+            logger.warning("Worker %d did not drain in time, killing it", pid)
+            try:
+                os.kill(pid, signal.SIGKILL)
+                os.waitpid(pid, 0)
+            except (ProcessLookupError, ChildProcessError):
+                pass
+        self.children.clear()
+        logger.info("All workers stopped")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=settings.WEB_CONCURRENCY, help="0 = one per usable core")
+    parser.add_argument("--host", default=settings.SERVER_HOST)
+    parser.add_argument("--port", type=int, default=settings.SERVER_PORT)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    workers = args.workers if args.workers > 0 else usable_cores()
+
+    # Preload: everything the workers need is imported once, before the fork
+    from main import app
+
+    config = uvicorn.Config(
+        app,
+        host=args.host,
+        port=args.port,
+        backlog=settings.SERVER_BACKLOG,
+        timeout_keep_alive=settings.SERVER_KEEPALIVE_SECONDS,
+        timeout_graceful_shutdown=settings.SERVER_GRACEFUL_TIMEOUT_SECONDS,
+        lifespan="on",
+        proxy_headers=True,
+    )
+    logger.info(
+        "Starting %d workers, up to %d MongoDB connections each (%d in total)",
+        workers, settings.MONGO_MAX_POOL_SIZE, workers * settings.MONGO_MAX_POOL_SIZE,
+    )
+    if workers > 1 and settings.EVENTS_BROKER == "local":
+        logger.warning("EVENTS_BROKER=local with %d workers: live events only reach clients of the same worker", workers)
+    return Supervisor(config, workers).run()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
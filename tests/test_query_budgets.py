@@ -0,0 +1,40 @@
+"""
+Per-route database command budgets. A change that adds round trips to these hot
+paths fails here; raise a budget only together with the change that needs it.
+"""
+from app.core.query_stats import query_budget
+
+LIKE_ROUTE = "POST /api/posts/{postId}/like"
+VIEW_ROUTE = "POST /api/posts/{postId}/view"
+COMMENT_ROUTE = "POST /api/posts/{postId}/comments"
+
+
+def test_toggle_like_budget(client, auth_headers, post_id):
+    # post lookup, like lookup, like insert / delete, counter update
+    with query_budget(4, route=LIKE_ROUTE):
+        response = client.post(f"/api/posts/{post_id}/like", headers=auth_headers)
+    assert response.json()["data"]["isLikedByMe"] is True
+
+    with query_budget(4, route=LIKE_ROUTE):
+        response = client.post(f"/api/posts/{post_id}/like", headers=auth_headers)
+    assert response.json()["data"]["isLikedByMe"] is False
+
+
+def test_track_view_budget(client, auth_headers, post_id):
+    # view lookup, view insert, counter update, counter read
+    with query_budget(4, route=VIEW_ROUTE):
+        response = client.post(f"/api/posts/{post_id}/view", headers=auth_headers)
+    assert response.json()["data"]["viewsCount"] == 1
+
+    # A repeated view is only the lookup
+    with query_budget(1, route=VIEW_ROUTE):
+        response = client.post(f"/api/posts/{post_id}/view", headers=auth_headers)
+    assert response.json()["message"] == "Already viewed."
+
+
+def test_add_comment_budget(client, auth_headers, post_id):
+    # post lookup, author lookup, comment insert, counter and preview update
+    with query_budget(4, route=COMMENT_ROUTE):
+        response = client.post(f"/api/posts/{post_id}/comments", json={"text": "Nice"}, headers=auth_headers)
+    assert response.status_code == 201
+    assert response.json()["data"]["commentsCount"] == 1